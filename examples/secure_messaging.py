@@ -1,6 +1,7 @@
 from src.hash_signatures import HashBasedSignature
 from src.lattice_crypto import LatticeEncryption
 from src.quantum_keygen import QuantumKeyDistribution
+from src.session import SecureSession
 
 
 def secure_messaging_demo():
@@ -62,6 +63,16 @@ def secure_messaging_demo():
     print("✓ Tampering detected successfully")
     print()
 
+    # Step 6: Session reusing the established keys across many messages
+    print("Step 6: Sending Messages over a Secure Session...")
+    session = SecureSession("bob", lattice=LatticeEncryption(n=64, q=1009), qkd=qkd, max_messages=5)
+    for i in range(12):
+        envelope = session.send(f"Message {i}".encode())
+        session.receive(envelope)
+    stats = session.stats()
+    print(f"✓ {stats['messages_sent']} messages sent with {stats['rekeys']} key establishments")
+    print()
+
     print("=" * 80)
     print("DEMO COMPLETED")
     print("=" * 80)
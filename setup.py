@@ -21,6 +21,18 @@ setup(
             "black>=24.0.0",
             "isort>=5.12.0",
         ],
+        "plot": [
+            "matplotlib>=3.7",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "qct-bench=src.utils.bench_suite:main",
+            "qct-scaling=src.utils.scaling:main",
+            "qct-load=src.utils.load_generator:main",
+            "qct-importtime=src.utils.import_time:main",
+            "qct-service=src.service:main",
+        ],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
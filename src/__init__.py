@@ -3,11 +3,47 @@ Quantum-Resistant Cryptography Toolkit
 Post-quantum secure encryption and signatures
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Garrv Sipani"
 
-from .hash_signatures import HashBasedSignature
-from .lattice_crypto import LatticeEncryption
-from .quantum_keygen import QuantumKeyDistribution
+# Public names are imported on first access, so `import src` stays cheap
+_LAZY_IMPORTS = {
+    "QuantumKeyDistribution": ".quantum_keygen",
+    "LatticeEncryption": ".lattice_crypto",
+    "SeededMatrix": ".lattice_crypto",
+    "HashBasedSignature": ".hash_signatures",
+    "PackedKey": ".packed_key",
+    "QKDKeyPool": ".key_pool",
+    "BB84Simulator": ".qkd_simulation",
+    "CascadeReconciler": ".reconciliation",
+    "PrivacyAmplifier": ".privacy_amplification",
+    "MultiSessionRunner": ".session_runner",
+    "EntropySource": ".entropy",
+    "SystemEntropy": ".entropy",
+    "DeterministicEntropy": ".entropy",
+    "InMemorySink": ".instrumentation",
+    "LoggingSink": ".instrumentation",
+    "PrometheusSink": ".instrumentation",
+    "KeyStore": ".keystore",
+    "CryptoService": ".service",
+    "SecureSession": ".session",
+    "SessionCache": ".session",
+    "CryptoBenchmark": ".utils.benchmark",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["QuantumKeyDistribution", "LatticeEncryption", "HashBasedSignature"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
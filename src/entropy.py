@@ -0,0 +1,181 @@
+import hashlib
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+Shape = Union[int, Tuple[int, ...]]
+
+
+class EntropySource(ABC):
+    """
+    Buffered bulk randomness shared by the toolkit's primitives.
+    Raw bytes are produced in large blocks into a refillable buffer and
+    served as bits, bytes, uniform integers mod q, or Gaussian noise.
+    """
+
+    def __init__(self, buffer_size: int = 1 << 16):
+        """
+        Initialize entropy source.
+
+        Args:
+            buffer_size: Bytes fetched from the generator per refill
+        """
+        self.buffer_size = buffer_size
+        self._buffer = b""
+        self._offset = 0
+        self._lock = threading.Lock()
+        self.bytes_served = 0
+        self.refills = 0
+
+    @abstractmethod
+    def _generate(self, n: int) -> bytes:
+        """Produce n fresh random bytes."""
+
+    def random_bytes(self, n: int) -> bytes:
+        """Return n random bytes."""
+        with self._lock:
+            self.bytes_served += n
+            available = len(self._buffer) - self._offset
+            if n <= available:
+                chunk = self._buffer[self._offset : self._offset + n]
+                self._offset += n
+                return chunk
+
+            # Always generate whole blocks so the stream does not depend on request sizes
+            parts = [self._buffer[self._offset :]]
+            needed = n - available
+            self._buffer, self._offset = b"", 0
+            while needed:
+                block = self._generate(self.buffer_size)
+                self.refills += 1
+                if needed >= self.buffer_size:
+                    parts.append(block)
+                    needed -= self.buffer_size
+                else:
+                    parts.append(block[:needed])
+                    self._buffer, self._offset = block, needed
+                    needed = 0
+
+            return b"".join(parts)
+
+    def bits(self, n: int) -> np.ndarray:
+        """Return n uniform bits as a uint8 array."""
+        raw = np.frombuffer(self.random_bytes((n + 7) // 8), dtype=np.uint8)
+        return np.unpackbits(raw, count=n)
+
+    def _words(self, count: int) -> np.ndarray:
+        """Return count uniform 64-bit words."""
+        return np.frombuffer(self.random_bytes(8 * count), dtype=np.uint64)
+
+    def uniform_mod(self, q: int, size: Shape) -> np.ndarray:
+        """
+        Uniform integers in [0, q) by rejection sampling.
+
+        Args:
+            q: Modulus
+            size: Output shape
+
+        Returns:
+            int64 array of the requested shape
+        """
+        total = int(np.prod(size))
+        width = max(1, (q - 1).bit_length())
+        n_bytes = (width + 7) // 8
+        dtype = {1: np.uint8, 2: np.uint16}.get(n_bytes, np.uint32 if n_bytes <= 4 else np.uint64)
+        item = np.dtype(dtype).itemsize
+        mask = (1 << width) - 1
+
+        out = np.empty(total, dtype=np.int64)
+        filled = 0
+        while filled < total:
+            # Acceptance is at least one half, so oversample accordingly
+            draw = max(16, int((total - filled) * (mask + 1) / q * 1.1))
+            raw = np.frombuffer(self.random_bytes(draw * item), dtype=dtype) & mask
+            accepted = raw[raw < q][: total - filled]
+            out[filled : filled + accepted.size] = accepted
+            filled += accepted.size
+
+        return out.reshape(size)
+
+    def uniform(self, size: Shape) -> np.ndarray:
+        """Uniform floats in [0, 1) with 53 bits of precision."""
+        total = int(np.prod(size))
+        return ((self._words(total) >> np.uint64(11)) * (1.0 / (1 << 53))).reshape(size)
+
+    def gaussian(self, sigma: float, size: Shape) -> np.ndarray:
+        """Normal samples with mean 0 and standard deviation sigma (Box-Muller)."""
+        total = int(np.prod(size))
+        half = (total + 1) // 2
+        u1 = 1.0 - self.uniform(half)
+        u2 = self.uniform(half)
+        radius = np.sqrt(-2.0 * np.log(u1))
+        angle = 2.0 * math.pi * u2
+        samples = np.concatenate([radius * np.cos(angle), radius * np.sin(angle)])[:total]
+        return (sigma * samples).reshape(size)
+
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in [0, n)."""
+        return int(self.uniform_mod(n, 1)[0])
+
+
+class SystemEntropy(EntropySource):
+    """Operating-system CSPRNG (os.urandom)."""
+
+    def __init__(self, buffer_size: int = 1 << 16):
+        super().__init__(buffer_size)
+        self._pid = os.getpid()
+
+    def random_bytes(self, n: int) -> bytes:
+        if self._pid != os.getpid():
+            # Forked child: never reuse bytes buffered by the parent
+            with self._lock:
+                self._buffer, self._offset, self._pid = b"", 0, os.getpid()
+        return super().random_bytes(n)
+
+    def _generate(self, n: int) -> bytes:
+        return os.urandom(n)
+
+
+class DeterministicEntropy(EntropySource):
+    """
+    Seeded deterministic random bit generator for tests and replays.
+    Output blocks are SHAKE-256(seed || counter).
+    """
+
+    def __init__(self, seed: Union[int, bytes], buffer_size: int = 1 << 16):
+        """
+        Initialize DRBG.
+
+        Args:
+            seed: Integer or byte-string seed
+            buffer_size: Bytes generated per refill
+        """
+        super().__init__(buffer_size)
+        if isinstance(seed, int):
+            if seed < 0:
+                raise ValueError("Integer seed must be non-negative")
+            seed = seed.to_bytes(max(1, (seed.bit_length() + 7) // 8), "big")
+        self._seed = hashlib.sha256(seed).digest()
+        self._counter = 0
+
+    def _generate(self, n: int) -> bytes:
+        block = hashlib.shake_256(self._seed + self._counter.to_bytes(8, "big")).digest(n)
+        self._counter += 1
+        return block
+
+
+_default_source: Optional[EntropySource] = None
+_default_lock = threading.Lock()
+
+
+def default_entropy() -> EntropySource:
+    """Process-wide SystemEntropy instance used when none is injected."""
+    global _default_source
+    with _default_lock:
+        if _default_source is None:
+            _default_source = SystemEntropy()
+        return _default_source
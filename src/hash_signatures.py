@@ -1,7 +1,10 @@
 import hashlib
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import numpy as np
+from .instrumentation import count, span
+
+if TYPE_CHECKING:
+    from .entropy import EntropySource
 
 
 class HashBasedSignature:
@@ -10,16 +13,32 @@ class HashBasedSignature:
     Quantum-resistant digital signatures using hash functions.
     """
 
-    def __init__(self, security_level: int = 256):
+    def __init__(self, security_level: int = 256, entropy: Optional["EntropySource"] = None):
         """
         Initialize signature scheme.
 
         Args:
             security_level: Security parameter in bits (128, 192, 256)
+            entropy: Randomness source (shared system CSPRNG by default)
         """
         self.security_level = security_level
+        # The default is created on first use: the entropy module pulls in NumPy
+        self._entropy = entropy
         self.hash_func = hashlib.sha256 if security_level <= 256 else hashlib.sha512
 
+    @property
+    def entropy(self) -> "EntropySource":
+        """Randomness source for key seeds."""
+        if self._entropy is None:
+            from .entropy import default_entropy
+
+            self._entropy = default_entropy()
+        return self._entropy
+
+    @entropy.setter
+    def entropy(self, entropy: "EntropySource"):
+        self._entropy = entropy
+
     def generate_keypair(self) -> Tuple[bytes, bytes]:
         """
         Generate signing key pair.
@@ -28,10 +47,11 @@ class HashBasedSignature:
             (public_key, private_key)
         """
         # Private key: random seed
-        private_key = np.random.bytes(self.security_level // 8)
+        private_key = self.entropy.random_bytes(self.security_level // 8)
 
         # Public key: hash of private key
         public_key = self.hash_func(private_key).digest()
+        count("signature.hash_calls")
 
         return public_key, private_key
 
@@ -53,12 +73,14 @@ class HashBasedSignature:
 
         # Generate public key elements (hash chain)
         pk_elements = []
-        for sk in sk_elements:
-            pk = sk
-            for _ in range(256):  # Hash chain length
-                pk = self._hash(pk)
-            pk_elements.append(pk)
-
+        with span("signature.chain_walk"):
+            for sk in sk_elements:
+                pk = sk
+                for _ in range(256):  # Hash chain length
+                    pk = self._hash(pk)
+                pk_elements.append(pk)
+
+        count("signature.hash_calls", w * 257)
         return sk_elements, pk_elements
 
     def sign(self, message: bytes, private_key: bytes) -> dict:
@@ -81,16 +103,19 @@ class HashBasedSignature:
 
         # Create signature components
         signature_elements = []
-        for i, byte in enumerate(msg_hash[:16]):  # Use first 16 bytes
-            # Sign by revealing part of hash chain
-            chain_pos = byte
-            sig_elem = sk_elements[i]
+        with span("signature.chain_walk"):
+            for i, byte in enumerate(msg_hash[:16]):  # Use first 16 bytes
+                # Sign by revealing part of hash chain
+                chain_pos = byte
+                sig_elem = sk_elements[i]
 
-            # Compute forward in hash chain
-            for _ in range(chain_pos):
-                sig_elem = self._hash(sig_elem)
+                # Compute forward in hash chain
+                for _ in range(chain_pos):
+                    sig_elem = self._hash(sig_elem)
 
-            signature_elements.append(sig_elem)
+                signature_elements.append(sig_elem)
+
+        count("signature.hash_calls", 1 + sum(msg_hash[:16]))
 
         signature = {
             "signature_elements": signature_elements,
@@ -117,22 +142,29 @@ class HashBasedSignature:
         msg_hash = self._hash(message)
 
         if msg_hash != signature["message_hash"]:
+            count("signature.hash_calls")
             return False
 
         # Verify each signature element
         sig_elements = signature["signature_elements"]
         pk_elements = signature["public_key_elements"]
 
-        for i, (sig_elem, pk_elem) in enumerate(zip(sig_elements, pk_elements)):
-            # Compute forward to public key
-            byte_val = msg_hash[i]
-            remaining = 256 - byte_val
-
-            computed = sig_elem
-            for _ in range(remaining):
-                computed = self._hash(computed)
-
-            if computed != pk_elem:
-                return False
-
-        return True
+        valid = True
+        hashes = 1
+        with span("signature.chain_walk"):
+            for i, (sig_elem, pk_elem) in enumerate(zip(sig_elements, pk_elements)):
+                # Compute forward to public key
+                byte_val = msg_hash[i]
+                remaining = 256 - byte_val
+
+                computed = sig_elem
+                for _ in range(remaining):
+                    computed = self._hash(computed)
+                hashes += remaining
+
+                if computed != pk_elem:
+                    valid = False
+                    break
+
+        count("signature.hash_calls", hashes)
+        return valid
@@ -0,0 +1,228 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+if TYPE_CHECKING:
+    import logging
+
+
+class MetricsSink(ABC):
+    """Destination for span timings and counter increments."""
+
+    @abstractmethod
+    def record_span(self, name: str, seconds: float):
+        """Record one completed span."""
+
+    @abstractmethod
+    def increment(self, name: str, value: int = 1):
+        """Add value to a counter."""
+
+
+class InMemorySink(MetricsSink):
+    """Aggregates span timings (count, total, min, max) and counters in memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: Dict[str, dict] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record_span(self, name: str, seconds: float):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = {
+                    "count": 1,
+                    "total_s": seconds,
+                    "min_s": seconds,
+                    "max_s": seconds,
+                }
+            else:
+                stats["count"] += 1
+                stats["total_s"] += seconds
+                stats["min_s"] = min(stats["min_s"], seconds)
+                stats["max_s"] = max(stats["max_s"], seconds)
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """
+        Copy of the collected metrics.
+
+        Returns:
+            Dictionary with "spans" (per-span stats incl. mean_s) and "counters"
+        """
+        with self._lock:
+            spans = {
+                name: dict(stats, mean_s=stats["total_s"] / stats["count"])
+                for name, stats in self.spans.items()
+            }
+            return {"spans": spans, "counters": dict(self.counters)}
+
+    def reset(self):
+        """Discard everything collected so far."""
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+
+
+class LoggingSink(MetricsSink):
+    """Writes every span and counter increment to a logger."""
+
+    def __init__(self, logger: Optional["logging.Logger"] = None, level: Optional[int] = None):
+        """
+        Initialize logging sink.
+
+        Args:
+            logger: Target logger (the module logger by default)
+            level: Log level of the emitted records (DEBUG by default)
+        """
+        # Imported here: logging is slow to import and only this sink needs it
+        import logging
+
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.level = level if level is not None else logging.DEBUG
+
+    def record_span(self, name: str, seconds: float):
+        self.logger.log(self.level, "span %s %.6f s", name, seconds)
+
+    def increment(self, name: str, value: int = 1):
+        self.logger.log(self.level, "counter %s +%d", name, value)
+
+
+class PrometheusSink(InMemorySink):
+    """In-memory aggregation rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "qct"):
+        """
+        Initialize exporter.
+
+        Args:
+            prefix: Metric name prefix
+        """
+        super().__init__()
+        self.prefix = prefix
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in name)
+
+    def render(self) -> str:
+        """Current metrics as Prometheus text."""
+        snapshot = self.snapshot()
+        span_metric = f"{self.prefix}_span_seconds"
+        lines = [
+            f"# HELP {span_metric} Time spent in instrumented stages.",
+            f"# TYPE {span_metric} summary",
+        ]
+        for name, stats in sorted(snapshot["spans"].items()):
+            lines.append(f'{span_metric}_sum{{span="{name}"}} {stats["total_s"]:.9f}')
+            lines.append(f'{span_metric}_count{{span="{name}"}} {stats["count"]}')
+
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{self.prefix}_{self._metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class _Span:
+    """Times a block and reports it to a sink."""
+
+    __slots__ = ("name", "sink", "start")
+
+    def __init__(self, name: str, sink: MetricsSink):
+        self.name = name
+        self.sink = sink
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sink.record_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    """Shared span used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_sink: Optional[MetricsSink] = None
+
+
+def enable(sink: MetricsSink) -> MetricsSink:
+    """Route spans and counters to sink (process-wide)."""
+    global _sink
+    _sink = sink
+    return sink
+
+
+def disable():
+    """Turn instrumentation off; spans and counters become no-ops."""
+    global _sink
+    _sink = None
+
+
+def enabled() -> bool:
+    """Whether a sink is installed."""
+    return _sink is not None
+
+
+def span(name: str):
+    """
+    Context manager timing a named stage.
+
+    Args:
+        name: Stage name, dotted by component (e.g. "qkd.sift")
+    """
+    sink = _sink
+    if sink is None:
+        return _NOOP_SPAN
+    return _Span(name, sink)
+
+
+def count(name: str, value: int = 1):
+    """
+    Increment a named counter.
+
+    Args:
+        name: Counter name (e.g. "signature.hash_calls")
+        value: Amount to add; callers count in bulk rather than per operation
+    """
+    sink = _sink
+    if sink is not None:
+        sink.increment(name, value)
+
+
+@contextmanager
+def instrumented(sink: Optional[MetricsSink] = None) -> Iterator[MetricsSink]:
+    """
+    Enable instrumentation for the duration of a block.
+
+    Args:
+        sink: Sink to install (a fresh InMemorySink by default)
+
+    Yields:
+        The installed sink
+    """
+    global _sink
+    previous = _sink
+    _sink = sink if sink is not None else InMemorySink()
+    try:
+        yield _sink
+    finally:
+        _sink = previous
@@ -0,0 +1,308 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from .packed_key import PackedKey
+from .quantum_keygen import QuantumKeyDistribution, SecurityError
+
+
+class QKDKeyPool:
+    """
+    Buffered pool of QKD key material.
+    A background thread runs the BB84 protocol between a low and a high
+    watermark so consumers take bits without paying protocol latency.
+    """
+
+    def __init__(
+        self,
+        qkd: Optional[QuantumKeyDistribution] = None,
+        capacity_bits: int = 65536,
+        low_watermark: float = 0.25,
+        high_watermark: float = 0.9,
+    ):
+        """
+        Initialize key pool.
+
+        Args:
+            qkd: Protocol instance used to generate key blocks
+            capacity_bits: Buffer bound (may be exceeded by less than one block)
+            low_watermark: Fill ratio below which generation resumes
+            high_watermark: Fill ratio at which generation pauses
+        """
+        if not 0 <= low_watermark < high_watermark <= 1:
+            raise ValueError("Watermarks must satisfy 0 <= low < high <= 1")
+
+        self.qkd = qkd if qkd is not None else QuantumKeyDistribution()
+        if self.qkd.key_length > capacity_bits:
+            raise ValueError("Pool capacity is smaller than one key block")
+
+        self.capacity_bits = capacity_bits
+        self.low_bits = int(capacity_bits * low_watermark)
+        self.high_bits = int(capacity_bits * high_watermark)
+
+        self._blocks = deque()
+        self._fill = 0
+        self._demand = 0
+        self._generating = True
+        self._running = False
+        self._error = None
+        self._thread = None
+        self._cond = threading.Condition()
+        # (loop, future) pairs of take_async() callers waiting for bits
+        self._async_waiters = []
+
+        self._stats = {
+            "blocks_generated": 0,
+            "bits_generated": 0,
+            "aborted_runs": 0,
+            "generation_time_s": 0.0,
+            "takes": 0,
+            "bits_taken": 0,
+            "waits": 0,
+            "total_wait_s": 0.0,
+            "max_wait_s": 0.0,
+        }
+
+    def start(self) -> "QKDKeyPool":
+        """Start the background generator thread."""
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            self._error = None
+
+        self._thread = threading.Thread(
+            target=self._generate_loop, name="qkd-key-pool", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop generation and wait for the background thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            self._wake_async()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "QKDKeyPool":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def fill(self) -> int:
+        """Number of buffered bits."""
+        return self._fill
+
+    def _should_generate(self) -> bool:
+        """Watermark hysteresis plus pending consumer demand."""
+        if self._fill >= self.capacity_bits:
+            return False
+        if self._fill >= self.high_bits:
+            self._generating = False
+        elif self._fill < self.low_bits:
+            self._generating = True
+        return self._generating or self._demand > self._fill
+
+    def _generate_loop(self):
+        """Background producer."""
+        while True:
+            with self._cond:
+                while self._running and not self._should_generate():
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+            start = time.perf_counter()
+            try:
+                block, _ = self.qkd.generate_shared_key(packed=True)
+            except SecurityError:
+                with self._cond:
+                    self._stats["aborted_runs"] += 1
+                continue
+            except Exception as exc:
+                with self._cond:
+                    self._error = exc
+                    self._running = False
+                    self._cond.notify_all()
+                    self._wake_async()
+                return
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self._blocks.append(block)
+                self._fill += len(block)
+                self._stats["blocks_generated"] += 1
+                self._stats["bits_generated"] += len(block)
+                self._stats["generation_time_s"] += elapsed
+                self._cond.notify_all()
+                self._wake_async()
+
+    def _wake_async(self):
+        """Wake every take_async() waiter on its own loop. Caller holds the lock."""
+        for loop, waiter in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                pass
+        self._async_waiters.clear()
+
+    def _pop_bits(self, n_bits: int) -> PackedKey:
+        """Remove n_bits from the head of the ring. Caller holds the lock."""
+        pieces = []
+        needed = n_bits
+        while needed:
+            head = self._blocks[0]
+            if len(head) <= needed:
+                pieces.append(self._blocks.popleft())
+                needed -= len(head)
+            else:
+                pieces.append(head[:needed])
+                self._blocks[0] = head[needed:]
+                needed = 0
+
+        self._fill -= n_bits
+        self._stats["takes"] += 1
+        self._stats["bits_taken"] += n_bits
+        self._cond.notify_all()
+        return PackedKey.concat(pieces)
+
+    def _check_request(self, n_bits: int):
+        if n_bits <= 0 or n_bits > self.capacity_bits:
+            raise ValueError(f"Can only take between 1 and {self.capacity_bits} bits")
+        if self._error is not None:
+            raise RuntimeError("Key generation failed") from self._error
+
+    def _record_wait(self, start: float):
+        """Add one wait that began at start to the statistics. Caller holds the lock."""
+        waited = time.perf_counter() - start
+        self._stats["waits"] += 1
+        self._stats["total_wait_s"] += waited
+        self._stats["max_wait_s"] = max(self._stats["max_wait_s"], waited)
+
+    def try_take(self, n_bits: int) -> Optional[PackedKey]:
+        """
+        Take key bits without blocking.
+
+        Returns:
+            PackedKey of n_bits, or None if the pool holds too few bits
+        """
+        with self._cond:
+            self._check_request(n_bits)
+            if self._fill < n_bits:
+                return None
+            return self._pop_bits(n_bits)
+
+    def take(self, n_bits: int, timeout: Optional[float] = None) -> PackedKey:
+        """
+        Take key bits, waiting for generation if necessary.
+
+        Args:
+            n_bits: Number of key bits
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            PackedKey of n_bits
+        """
+        start = time.perf_counter()
+        with self._cond:
+            self._check_request(n_bits)
+            if self._fill < n_bits:
+                if not self._running:
+                    raise RuntimeError("Key pool is not running")
+
+                self._demand += n_bits
+                self._cond.notify_all()
+                try:
+                    ready = self._cond.wait_for(
+                        lambda: self._fill >= n_bits
+                        or self._error is not None
+                        or not self._running,
+                        timeout,
+                    )
+                finally:
+                    self._demand -= n_bits
+
+                self._record_wait(start)
+                self._check_request(n_bits)
+                if self._fill < n_bits:
+                    if not ready:
+                        raise TimeoutError(f"Timed out waiting for {n_bits} key bits")
+                    raise RuntimeError("Key pool stopped")
+
+            return self._pop_bits(n_bits)
+
+    async def take_async(self, n_bits: int, timeout: Optional[float] = None) -> PackedKey:
+        """
+        Asyncio variant of take().
+
+        Waits on a future that the generator thread resolves through the
+        event loop, and removes the bits on the loop thread itself, so a
+        cancelled or timed-out caller never discards key material and no
+        executor thread is blocked.
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        deadline = None if timeout is None else loop.time() + timeout
+        waiting = False
+        waiter = None
+        try:
+            while True:
+                with self._cond:
+                    self._check_request(n_bits)
+                    if self._fill >= n_bits:
+                        if waiting:
+                            self._record_wait(start)
+                        return self._pop_bits(n_bits)
+                    if not self._running:
+                        raise RuntimeError(
+                            "Key pool stopped" if waiting else "Key pool is not running"
+                        )
+
+                    if not waiting:
+                        waiting = True
+                        self._demand += n_bits
+                        self._cond.notify_all()
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for {n_bits} key bits")
+                try:
+                    await asyncio.wait_for(waiter, remaining)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Timed out waiting for {n_bits} key bits") from None
+        finally:
+            with self._cond:
+                if waiting:
+                    self._demand -= n_bits
+                if waiter is not None and (loop, waiter) in self._async_waiters:
+                    self._async_waiters.remove((loop, waiter))
+
+    def stats(self) -> dict:
+        """Snapshot of pool statistics."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["fill_bits"] = self._fill
+            stats["fill_ratio"] = self._fill / self.capacity_bits
+
+        gen_time = stats["generation_time_s"]
+        stats["generation_rate_bps"] = stats["bits_generated"] / gen_time if gen_time else 0.0
+        stats["mean_wait_ms"] = (
+            stats["total_wait_s"] / stats["waits"] * 1000 if stats["waits"] else 0.0
+        )
+        return stats
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
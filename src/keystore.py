@@ -0,0 +1,320 @@
+import os
+import re
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .lattice_crypto import LatticeEncryption, SeededMatrix
+
+MAGIC = b"QCTK"
+FORMAT_VERSION = 1
+
+# magic, version, kind, dtype code, n, q, sigma, payload length; padded to 64 bytes
+# so the array payload of a memory-mapped file starts aligned
+_HEADER = struct.Struct("<4sHBBIQdQ")
+HEADER_SIZE = 64
+
+_KINDS = {
+    "lattice-public": 1,
+    "lattice-private": 2,
+    "signature-public": 3,
+    "signature-private": 4,
+}
+_KIND_NAMES = {code: name for name, code in _KINDS.items()}
+
+# A lattice public key whose A is a SeededMatrix: the payload is the seed
+# followed by b, and A is re-expanded on load instead of being stored
+_SEEDED_PUBLIC = 5
+_KIND_NAMES[_SEEDED_PUBLIC] = "lattice-public"
+_SEED_BYTES = 32
+
+# Dtype code -> little-endian storage dtype (0 stores raw bytes)
+_DTYPES = {0: None, 1: np.dtype("<u2"), 2: np.dtype("<u4"), 3: np.dtype("<i8")}
+
+_KEY_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
+
+
+def _narrow(values: np.ndarray, q: int, dtype: np.dtype) -> np.ndarray:
+    """Cast residues mod q to the storage dtype, refusing values it would corrupt."""
+    values = np.asarray(values)
+    if values.size and (values.min() < 0 or values.max() >= q):
+        raise ValueError(f"Key values must be reduced mod q={q} before storing")
+    return values.astype(dtype)
+
+
+def storage_dtype(q: int) -> int:
+    """Code of the narrowest dtype holding residues mod q."""
+    if q <= 1 << 16:
+        return 1
+    if q <= 1 << 32:
+        return 2
+    return 3
+
+
+class KeyStore:
+    """
+    Pickle-free on-disk store for lattice and signature keys.
+
+    Each key part is one file: a fixed 64-byte header followed by the values
+    in the narrowest little-endian dtype for the modulus (uint16 for the default
+    q = 4093). A public matrix generated from a seed (see SeededMatrix) is
+    stored as that seed and never expanded. Lattice keys are loaded with
+    np.memmap, so worker processes share one copy through the page cache. Loaded keys are kept in a bounded
+    LRU cache keyed by key ID.
+    """
+
+    def __init__(self, root: str, cache_size: int = 32, mmap: bool = True):
+        """
+        Initialize keystore.
+
+        Args:
+            root: Directory holding the key files (created if missing)
+            cache_size: Loaded key parts kept in memory
+            mmap: Memory-map lattice arrays instead of reading them into memory
+        """
+        if cache_size < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self.root = root
+        self.cache_size = cache_size
+        self.mmap = mmap
+        os.makedirs(root, exist_ok=True)
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _path(self, key_id: str, kind: str) -> str:
+        if not _KEY_ID.match(key_id):
+            raise ValueError(f"Invalid key ID: {key_id!r}")
+        return os.path.join(self.root, f"{key_id}.{kind}.qks")
+
+    def _write(self, key_id: str, kind: str, header: bytes, payload: bytes):
+        """Atomically write one key file (private keys readable by the owner only)."""
+        path = self._path(key_id, kind)
+        mode = 0o600 if kind.endswith("private") else 0o644
+
+        # A unique temporary name per writer, so concurrent saves of one key never collide
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{key_id}.{kind}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(HEADER_SIZE, b"\0"))
+                f.write(payload)
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        with self._lock:
+            self._cache.pop((key_id, kind), None)
+
+    def _read_header(self, path: str) -> dict:
+        with open(path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise ValueError(f"Truncated key file: {path}")
+
+        magic, version, kind, dtype, n, q, sigma, length = _HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError(f"Not a keystore file: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported keystore format version {version}: {path}")
+        if kind not in _KIND_NAMES or dtype not in _DTYPES:
+            raise ValueError(f"Corrupt key file header: {path}")
+
+        return {
+            "kind": _KIND_NAMES[kind],
+            "seeded": kind == _SEEDED_PUBLIC,
+            "dtype": _DTYPES[dtype],
+            "n": n,
+            "q": q,
+            "sigma": sigma,
+            "length": length,
+            "version": version,
+        }
+
+    def _load(self, key_id: str, kind: str):
+        """Load one key part, through the LRU cache."""
+        cache_key = (key_id, kind)
+        with self._lock:
+            if cache_key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+            self._misses += 1
+
+        path = self._path(key_id, kind)
+        if not os.path.exists(path):
+            raise KeyError(f"No {kind} key stored under {key_id!r}")
+
+        header = self._read_header(path)
+        if header["kind"] != kind:
+            raise ValueError(f"Key file holds a {header['kind']} key, expected {kind}: {path}")
+
+        offset = HEADER_SIZE
+        if header["seeded"]:
+            with open(path, "rb") as f:
+                f.seek(HEADER_SIZE)
+                seed = f.read(_SEED_BYTES)
+            if len(seed) < _SEED_BYTES:
+                raise ValueError(f"Truncated key file: {path}")
+            offset += _SEED_BYTES
+
+        if header["dtype"] is None:
+            with open(path, "rb") as f:
+                f.seek(HEADER_SIZE)
+                value = f.read(header["length"])
+        elif self.mmap:
+            value = np.memmap(
+                path, dtype=header["dtype"], mode="r", offset=offset, shape=(header["length"],)
+            )
+        else:
+            value = np.fromfile(path, dtype=header["dtype"], count=header["length"], offset=offset)
+
+        if header["seeded"]:
+            value = (SeededMatrix(seed, header["n"], header["q"]), value)
+        elif kind == "lattice-public":
+            n = header["n"]
+            value = (value[: n * n].reshape(n, n), value[n * n :])
+
+        with self._lock:
+            self._cache[cache_key] = value
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return value
+
+    def save_lattice_keys(
+        self,
+        key_id: str,
+        lattice: LatticeEncryption,
+        public_key: Tuple[np.ndarray, np.ndarray],
+        private_key: Optional[np.ndarray] = None,
+    ):
+        """
+        Store a lattice key pair.
+
+        Args:
+            key_id: Key identifier (letters, digits, '_' and '-')
+            lattice: Scheme instance the keys belong to (provides n, q, sigma)
+            public_key: (A, b) from key generation; a seeded A (memory-budgeted
+                key generation) is stored as its seed and expanded on load
+            private_key: Secret vector s (omit to store the public part only)
+        """
+        code = storage_dtype(lattice.q)
+        dtype = _DTYPES[code]
+        A, b = public_key
+
+        if isinstance(A, SeededMatrix):
+            if len(A.seed) != _SEED_BYTES:
+                raise ValueError(f"Seeded matrices are stored with {_SEED_BYTES}-byte seeds")
+            if (A.n, A.q) != (lattice.n, lattice.q):
+                raise ValueError("Seeded matrix parameters do not match the scheme")
+            kind = _SEEDED_PUBLIC
+            values = _narrow(np.ravel(b), lattice.q, dtype)
+            payload = A.seed + values.tobytes()
+        else:
+            kind = _KINDS["lattice-public"]
+            values = _narrow(np.concatenate([np.ravel(A), np.ravel(b)]), lattice.q, dtype)
+            payload = values.tobytes()
+
+        header = _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            kind,
+            code,
+            lattice.n,
+            lattice.q,
+            lattice.sigma,
+            values.size,
+        )
+        self._write(key_id, "lattice-public", header, payload)
+
+        if private_key is not None:
+            payload = _narrow(np.ravel(private_key), lattice.q, dtype)
+            header = _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                _KINDS["lattice-private"],
+                code,
+                lattice.n,
+                lattice.q,
+                lattice.sigma,
+                payload.size,
+            )
+            self._write(key_id, "lattice-private", header, payload.tobytes())
+
+    def load_lattice_public(self, key_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Public key (A, b) as read-only views in the stored dtype (A may be a SeededMatrix)."""
+        return self._load(key_id, "lattice-public")
+
+    def load_lattice_private(self, key_id: str) -> np.ndarray:
+        """Secret vector s in the stored dtype."""
+        return self._load(key_id, "lattice-private")
+
+    def load_lattice(self, key_id: str) -> LatticeEncryption:
+        """Scheme instance with the parameters the key was generated for."""
+        header = self._read_header(self._path(key_id, "lattice-public"))
+        return LatticeEncryption(n=header["n"], q=header["q"], sigma=header["sigma"])
+
+    def save_signature_keys(
+        self, key_id: str, public_key: bytes, private_key: Optional[bytes] = None
+    ):
+        """
+        Store a signature key pair.
+
+        Args:
+            key_id: Key identifier
+            public_key: Verification key
+            private_key: Signing key (omit to store the public part only)
+        """
+        parts = [("signature-public", public_key)]
+        if private_key is not None:
+            parts.append(("signature-private", private_key))
+
+        for kind, value in parts:
+            header = _HEADER.pack(MAGIC, FORMAT_VERSION, _KINDS[kind], 0, 0, 0, 0.0, len(value))
+            self._write(key_id, kind, header, bytes(value))
+
+    def load_signature_public(self, key_id: str) -> bytes:
+        """Verification key."""
+        return self._load(key_id, "signature-public")
+
+    def load_signature_private(self, key_id: str) -> bytes:
+        """Signing key."""
+        return self._load(key_id, "signature-private")
+
+    def list_keys(self) -> List[str]:
+        """IDs of all stored keys."""
+        ids = {name.split(".")[0] for name in os.listdir(self.root) if name.endswith(".qks")}
+        return sorted(ids)
+
+    def __contains__(self, key_id: str) -> bool:
+        return any(os.path.exists(self._path(key_id, kind)) for kind in _KINDS)
+
+    def delete(self, key_id: str):
+        """Remove every stored part of a key."""
+        for kind in _KINDS:
+            path = self._path(key_id, kind)
+            if os.path.exists(path):
+                os.remove(path)
+            with self._lock:
+                self._cache.pop((key_id, kind), None)
+
+    def cache_info(self) -> dict:
+        """Cache hits, misses and occupancy."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._cache),
+                "capacity": self.cache_size,
+            }
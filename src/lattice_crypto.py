@@ -1,7 +1,104 @@
-from typing import List, Tuple
+import hashlib
+import math
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 
+from .entropy import EntropySource, default_entropy
+from .instrumentation import count, span
+
+# Bits encrypted per vectorized block in encrypt_bytes
+_BATCH_BITS = 4096
+
+# Peak bytes per sample of EntropySource.gaussian (Box-Muller keeps about four
+# float64 temporaries alive, including the result); measured with tracemalloc
+_GAUSSIAN_PEAK_BYTES = 4 * np.dtype(np.float64).itemsize
+
+# Smallest tile height the planner will accept
+_MIN_TILE_ROWS = 8
+
+
+def _word_dtype(q: int) -> np.dtype:
+    """Narrowest unsigned little-endian word holding the bits of q - 1."""
+    width = max(1, (q - 1).bit_length())
+    for dtype in ("<u1", "<u2", "<u4", "<u8"):
+        if np.dtype(dtype).itemsize * 8 >= width:
+            return np.dtype(dtype)
+
+
+def _row_candidates(n: int, q: int) -> int:
+    """Words drawn per seeded row: the expected need plus six standard deviations."""
+    accept = q / (1 << max(1, (q - 1).bit_length()))
+    return math.ceil((n + 6 * math.sqrt(n * (1 - accept))) / accept) + 8
+
+
+class SeededMatrix:
+    """
+    Uniform n x n matrix mod q stored as a 32-byte seed.
+
+    Row i is read from the SHAKE-256(seed || i) stream by rejection sampling,
+    so any tile of rows can be regenerated independently (and identically,
+    whatever the tile height) and the full matrix is never held in memory.
+    np.asarray() materializes it for the dense path.
+    """
+
+    def __init__(self, seed: bytes, n: int, q: int):
+        """
+        Initialize matrix.
+
+        Args:
+            seed: Expansion seed
+            n: Dimension
+            q: Modulus
+        """
+        self.seed = bytes(seed)
+        self.n = n
+        self.q = q
+        self.shape = (n, n)
+
+        self._dtype = _word_dtype(q)
+        self._mask = (1 << max(1, (q - 1).bit_length())) - 1
+        self._candidates = _row_candidates(n, q)
+
+    def _stream(self, row: int, words: int) -> bytes:
+        xof = hashlib.shake_256(self.seed + row.to_bytes(8, "big"))
+        return xof.digest(words * self._dtype.itemsize)
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """Rows start..stop-1 as an int64 array."""
+        n, m = self.n, self._candidates
+        raw = b"".join(self._stream(i, m) for i in range(start, stop))
+        words = np.frombuffer(raw, dtype=self._dtype).reshape(stop - start, m) & self._mask
+
+        # Keep each row's first n candidates below q, all rows at once
+        accepted = words < self.q
+        taken = accepted & (np.cumsum(accepted, axis=1, dtype=np.int32) <= n)
+        short = np.flatnonzero(taken.sum(axis=1) < n)
+        if short.size == 0:
+            return words[taken].astype(np.int64).reshape(stop - start, n)
+
+        # Rare: a row needs more candidates; the XOF stream just continues
+        out = np.empty((stop - start, n), dtype=np.int64)
+        full = np.setdiff1d(np.arange(stop - start), short)
+        out[full] = words[full][taken[full]].reshape(full.size, n)
+        for r in short:
+            extra = 2 * m
+            while True:
+                row = (
+                    np.frombuffer(self._stream(start + int(r), extra), dtype=self._dtype)
+                    & self._mask
+                )
+                row = row[row < self.q]
+                if row.size >= n:
+                    out[r] = row[:n]
+                    break
+                extra *= 2
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        matrix = self.rows(0, self.n)
+        return matrix if dtype is None else matrix.astype(dtype)
+
 
 class LatticeEncryption:
     """
@@ -9,7 +106,15 @@ class LatticeEncryption:
     Post-quantum secure encryption scheme.
     """
 
-    def __init__(self, n: int = 256, q: int = 4093, sigma: float = 3.2):
+    def __init__(
+        self,
+        n: int = 256,
+        q: int = 4093,
+        sigma: float = 3.2,
+        entropy: Optional[EntropySource] = None,
+        memory_budget: Optional[int] = None,
+        batch_bits: int = _BATCH_BITS,
+    ):
         """
         Initialize LWE parameters.
 
@@ -17,10 +122,142 @@ class LatticeEncryption:
             n: Dimension of lattice
             q: Modulus (prime number)
             sigma: Standard deviation for error distribution
+            entropy: Randomness source (shared system CSPRNG by default)
+            memory_budget: Approximate peak working bytes for key generation and
+                encryption (see plan()). When set, A is generated from a seed
+                and consumed in row tiles instead of as a dense n x n array.
+            batch_bits: Bits encrypted per vectorized block in encrypt_bytes
+                (the memory budget may lower it)
         """
         self.n = n
         self.q = q
         self.sigma = sigma
+        self.entropy = entropy if entropy is not None else default_entropy()
+        self.memory_budget = memory_budget
+        self.batch_bits = batch_bits
+
+    def _tile_dtypes(self, rows: int) -> Tuple[type, type]:
+        """
+        Compute and accumulator dtypes for tiles of the given height.
+
+        A tile product is at most rows * (q - 1), so it is exact in float32
+        below 2**24 (half the memory of float64) and in float64 below 2**53.
+        The accumulator is uint32 whenever one tile on top of a reduced value
+        fits, so mod-q reductions only happen between tiles.
+        """
+        tile_bound = rows * (self.q - 1)
+        if tile_bound < 2**24:
+            compute = np.float32
+        elif tile_bound < 2**53:
+            compute = np.float64
+        else:
+            compute = np.int64
+        accumulator = np.uint32 if self.q - 1 + tile_bound < 2**32 else np.int64
+        return compute, accumulator
+
+    def _working_bytes(self, width: int, rows: int) -> int:
+        """Estimated peak bytes of one block of width bits with tiles of the given height."""
+        n = self.n
+        compute, accumulator = (np.dtype(t).itemsize for t in self._tile_dtypes(rows))
+        word = _word_dtype(self.q).itemsize
+        candidates = _row_candidates(n, self.q)
+
+        # Noise: r bits (uint8) are held while e1 is sampled, then the matmul
+        # phase holds r, e1 (int64), the accumulator and a product tile
+        noise = 1 + max(_GAUSSIAN_PEAK_BYTES, 8 + accumulator + compute)
+        # Tile: XOF words, acceptance mask and counts, int64 rows, compute copy,
+        # plus the compute copy of the matching columns of r
+        expand = candidates * (2 * word + 1 + 4) + n * (8 + compute)
+        vectors = 8 * n * 8  # s, e, b and their temporaries
+        return width * n * noise + rows * (expand + width * compute) + vectors
+
+    def plan(self) -> dict:
+        """
+        Tile height and block width for the tiled path.
+
+        The largest block (up to batch_bits) that leaves room for at least a
+        few rows of A is chosen, then the tallest tile that fits the rest of
+        the budget. Without a budget the whole matrix is one tile. The budget
+        is an estimate built from the dtypes used (with a measured allowance
+        for Gaussian sampling), not a hard cap: NumPy temporaries may exceed it
+        slightly.
+
+        Returns:
+            Dictionary with tile_rows, batch_bits and estimated_bytes
+        """
+        n = self.n
+        width, rows = self.batch_bits, n
+        if self.memory_budget is not None:
+            smallest = min(n, _MIN_TILE_ROWS)
+            while self._working_bytes(width, smallest) > self.memory_budget and width > 1:
+                width //= 2
+            if self._working_bytes(width, smallest) > self.memory_budget:
+                raise ValueError(
+                    f"Memory budget of {self.memory_budget} bytes is too small for n={n}"
+                )
+            # Tallest tile that fits (the estimate grows with the tile height)
+            low, high = smallest, n
+            while low < high:
+                mid = (low + high + 1) // 2
+                if self._working_bytes(width, mid) <= self.memory_budget:
+                    low = mid
+                else:
+                    high = mid - 1
+            rows = low
+
+        return {
+            "tile_rows": rows,
+            "batch_bits": width,
+            "estimated_bytes": self._working_bytes(width, rows),
+        }
+
+    def _tiled(self, A) -> bool:
+        return self.memory_budget is not None or isinstance(A, SeededMatrix)
+
+    @staticmethod
+    def _row_tiles(A, rows: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """(start, tile) pairs covering A, expanding seeded matrices tile by tile."""
+        n = A.shape[0]
+        for start in range(0, n, rows):
+            stop = min(start + rows, n)
+            if isinstance(A, SeededMatrix):
+                yield start, A.rows(start, stop)
+            else:
+                yield start, np.asarray(A[start:stop])
+
+    def _tiled_dot(
+        self, R: np.ndarray, A, b: np.ndarray, rows: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact R @ A and R @ b for 0/1 rows R, consuming A in row tiles.
+
+        Products are computed and accumulated in the narrow dtypes of
+        _tile_dtypes, and reduced mod q only when the next tile could overflow
+        the accumulator.
+
+        Returns:
+            (R @ A congruent mod q, R @ b) as (uint32 or int64, int64) arrays
+        """
+        q = self.q
+        tile_bound = rows * (q - 1)
+        compute, accumulator = self._tile_dtypes(rows)
+        limit = np.iinfo(accumulator).max
+
+        U = np.zeros((R.shape[0], A.shape[1]), dtype=accumulator)
+        V = np.zeros(R.shape[0], dtype=np.int64)
+        bound = 0
+        for start, tile in self._row_tiles(A, rows):
+            stop = start + tile.shape[0]
+            Rt = R[:, start:stop].astype(compute)
+            if bound + tile_bound > limit:
+                np.remainder(U, q, out=U)
+                bound = q - 1
+            np.add(U, Rt.dot(tile.astype(compute)), out=U, casting="unsafe")
+            bound += tile_bound
+            V += Rt.dot(np.asarray(b[start:stop]).astype(compute)).astype(np.int64)
+            count("lattice.tiles")
+
+        return U, V
 
     def generate_keypair(self) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """
@@ -29,13 +266,33 @@ class LatticeEncryption:
         Returns:
             (public_key, private_key)
         """
-        # Private key: small secret vector s (sampled from error distribution)
-        s = np.random.normal(0, self.sigma, size=self.n).astype(int) % self.q
+        tiled = self.memory_budget is not None
+
+        with span("lattice.keygen"):
+            with span("lattice.noise"):
+                # Private key: small secret vector s (sampled from error distribution)
+                s = self.entropy.gaussian(self.sigma, self.n).astype(np.int64) % self.q
+
+            # Public key: (A, b = As + e); under a memory budget A is only a seed
+            with span("lattice.matrix"):
+                if tiled:
+                    A = SeededMatrix(self.entropy.random_bytes(32), self.n, self.q)
+                else:
+                    A = self.entropy.uniform_mod(self.q, (self.n, self.n))
+
+            with span("lattice.noise"):
+                e = self.entropy.gaussian(self.sigma, self.n).astype(np.int64)
 
-        # Public key: (A, b = As + e)
-        A = np.random.randint(0, self.q, size=(self.n, self.n))
-        e = np.random.normal(0, self.sigma, size=self.n).astype(int)
-        b = (A.dot(s) + e) % self.q
+            with span("lattice.matmul"):
+                if tiled:
+                    b = np.empty(self.n, dtype=np.int64)
+                    for start, tile in self._row_tiles(A, self.plan()["tile_rows"]):
+                        stop = start + tile.shape[0]
+                        b[start:stop] = (tile.dot(s) + e[start:stop]) % self.q
+                        count("lattice.tiles")
+                else:
+                    b = (A.dot(s) + e) % self.q
+            count("lattice.matmuls")
 
         public_key = (A, b)
         private_key = s
@@ -58,18 +315,30 @@ class LatticeEncryption:
         A, b = public_key
 
         # Random vector r
-        r = np.random.randint(0, 2, size=self.n)
+        r = self.entropy.bits(self.n)
 
         # Error terms
-        e1 = np.random.normal(0, self.sigma, size=self.n).astype(int)
-        e2 = int(np.random.normal(0, self.sigma))
+        e1 = self.entropy.gaussian(self.sigma, self.n).astype(np.int64)
+        e2 = int(self.entropy.gaussian(self.sigma, 1)[0])
 
         # Ciphertext
-        u = (A.T.dot(r) + e1) % self.q
-        v = (b.dot(r) + e2 + message * (self.q // 2)) % self.q
+        if self._tiled(A):
+            U, V = self._tiled_dot(r[np.newaxis], A, b, self.plan()["tile_rows"])
+            u = (U[0] + e1) % self.q
+            v = (V[0] + e2 + message * (self.q // 2)) % self.q
+        else:
+            r = r.astype(np.int64)
+            u = (A.T.dot(r) + e1) % self.q
+            v = (b.dot(r) + e2 + message * (self.q // 2)) % self.q
 
         return u, v
 
+    def _binary_dot(self, R: np.ndarray, A: np.ndarray) -> np.ndarray:
+        """Exact R @ A for 0/1 rows R, via float BLAS when sums fit in 53 bits."""
+        if self.n * self.q < 2**53:
+            return R.astype(np.float64).dot(A.astype(np.float64)).astype(np.int64)
+        return R.dot(A)
+
     def decrypt(self, ciphertext: Tuple[np.ndarray, int], private_key: np.ndarray) -> int:
         """
         Decrypt ciphertext to recover message.
@@ -83,8 +352,12 @@ class LatticeEncryption:
         """
         u, v = ciphertext
 
+        # Keys may be stored in a narrow dtype (see KeyStore); products need int64
+        s = np.asarray(private_key, dtype=np.int64)
+        u = np.asarray(u, dtype=np.int64)
+
         # Compute v - s·u
-        result = (v - private_key.dot(u)) % self.q
+        result = (int(v) - s.dot(u)) % self.q
 
         # Round to nearest multiple of q/2
         if result < self.q // 4 or result > 3 * self.q // 4:
@@ -93,30 +366,68 @@ class LatticeEncryption:
             return 1
 
     def encrypt_bytes(self, data: bytes, public_key: Tuple[np.ndarray, np.ndarray]) -> List[Tuple]:
-        """Encrypt arbitrary byte data."""
+        """
+        Encrypt arbitrary byte data.
+
+        Under a memory budget (or with a seeded A) the products are computed
+        tile by tile; with the same entropy stream and block width the
+        ciphertexts are identical to the dense path.
+        """
+        A, b = public_key
+        tiled = self._tiled(A)
+        if tiled:
+            plan = self.plan()
+            width = plan["batch_bits"]
+            if isinstance(A, SeededMatrix) and plan["tile_rows"] >= self.n:
+                # The whole matrix fits the budget: expand it once, not once per block
+                A = A.rows(0, self.n)
+        else:
+            width = self.batch_bits
+
+        # Bits of each byte, least significant first
+        with span("lattice.pack"):
+            message = np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8), bitorder="little")
         ciphertexts = []
 
-        for byte in data:
-            # Encrypt each bit
-            for i in range(8):
-                bit = (byte >> i) & 1
-                ct = self.encrypt(bit, public_key)
-                ciphertexts.append(ct)
+        for start in range(0, message.size, width):
+            bits = message[start : start + width].astype(np.int64)
+            n_bits = bits.size
+
+            # One bulk draw of r, e1 and e2 for every bit in the block
+            with span("lattice.noise"):
+                R = self.entropy.bits(n_bits * self.n).reshape(n_bits, self.n)
+                E1 = self.entropy.gaussian(self.sigma, (n_bits, self.n)).astype(np.int64)
+                E2 = self.entropy.gaussian(self.sigma, n_bits).astype(np.int64)
+
+            with span("lattice.matmul"):
+                if tiled:
+                    RA, RB = self._tiled_dot(R, A, b, plan["tile_rows"])
+                else:
+                    R = R.astype(np.int64)
+                    RA, RB = self._binary_dot(R, A), R.dot(b)
+                # U = (R @ A + E1) mod q, reusing the noise buffer
+                U = np.add(E1, RA, out=E1)
+                np.remainder(U, self.q, out=U)
+                V = (RB + E2 + bits * (self.q // 2)) % self.q
+            with span("lattice.pack"):
+                ciphertexts.extend(zip(U, V))
+            count("lattice.matmuls", 2)
+            count("lattice.bits_encrypted", n_bits)
 
         return ciphertexts
 
     def decrypt_bytes(self, ciphertexts: List[Tuple], private_key: np.ndarray) -> bytes:
         """Decrypt to recover original bytes."""
-        result = []
-
-        for i in range(0, len(ciphertexts), 8):
-            byte_cts = ciphertexts[i : i + 8]
-            byte_val = 0
+        if not ciphertexts:
+            return b""
 
-            for j, ct in enumerate(byte_cts):
-                bit = self.decrypt(ct, private_key)
-                byte_val |= bit << j
+        # All ciphertexts at once: one matrix-vector product instead of one dot per bit
+        s = np.asarray(private_key, dtype=np.int64)
+        U = np.array([u for u, _ in ciphertexts], dtype=np.int64)
+        V = np.array([v for _, v in ciphertexts], dtype=np.int64)
+        result = (V - U.dot(s)) % self.q
 
-            result.append(byte_val)
+        # Same rounding as decrypt: 1 iff q/4 <= result <= 3q/4
+        bits = (result >= self.q // 4) & (result <= 3 * self.q // 4)
 
-        return bytes(result)
+        return np.packbits(bits.astype(np.uint8), bitorder="little").tobytes()
@@ -0,0 +1,153 @@
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+# Number of set bits for every possible byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class PackedKey:
+    """
+    Bit string stored eight bits per byte (MSB first, as ``np.packbits``).
+    Supports bit-level slicing, XOR and Hamming distance on the packed words.
+    """
+
+    __slots__ = ("_data", "_length")
+
+    def __init__(
+        self, data: Union[bytes, bytearray, np.ndarray] = b"", length: Optional[int] = None
+    ):
+        """
+        Initialize packed key.
+
+        Args:
+            data: Packed bytes (MSB-first bit order)
+            length: Number of valid bits (defaults to ``8 * len(data)``)
+        """
+        words = np.frombuffer(bytes(data), dtype=np.uint8).copy()
+        if length is None:
+            length = words.size * 8
+        if length < 0 or length > words.size * 8:
+            raise ValueError(f"Bit length {length} does not fit in {words.size} bytes")
+
+        self._data = words[: (length + 7) // 8]
+        self._length = length
+        self._clear_padding()
+
+    @classmethod
+    def from_bits(cls, bits: Union[Iterable[int], np.ndarray]) -> "PackedKey":
+        """Pack a sequence of 0/1 values."""
+        bits = np.asarray(bits if isinstance(bits, np.ndarray) else list(bits), dtype=np.uint8)
+        key = cls.__new__(cls)
+        key._data = np.packbits(bits)
+        key._length = int(bits.size)
+        return key
+
+    @classmethod
+    def from_bytes(cls, data: bytes, length: Optional[int] = None) -> "PackedKey":
+        """Wrap existing packed bytes."""
+        return cls(data, length)
+
+    @classmethod
+    def concat(cls, keys: Iterable["PackedKey"]) -> "PackedKey":
+        """Join keys end to end."""
+        keys = list(keys)
+        if all(len(k) % 8 == 0 for k in keys[:-1]):
+            data = np.concatenate([k._data for k in keys]) if keys else np.zeros(0, np.uint8)
+        else:
+            data = np.packbits(np.concatenate([k.to_numpy() for k in keys]))
+
+        key = cls.__new__(cls)
+        key._data = data
+        key._length = sum(len(k) for k in keys)
+        return key
+
+    def _clear_padding(self):
+        """Zero the unused low bits of the last byte."""
+        spare = (-self._length) % 8
+        if spare and self._data.size:
+            self._data[-1] &= (0xFF << spare) & 0xFF
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        """Storage used by the packed words."""
+        return int(self._data.size)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, "PackedKey"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return PackedKey.from_bits(self.to_numpy()[start:stop:step])
+            return self._slice(start, max(stop, start))
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PackedKey index out of range")
+        return int((self._data[index >> 3] >> (7 - (index & 7))) & 1)
+
+    def _slice(self, start: int, stop: int) -> "PackedKey":
+        """Contiguous bit slice computed by shifting whole bytes."""
+        length = stop - start
+        first, shift = divmod(start, 8)
+        n_bytes = (length + 7) // 8
+        window = self._data[first : first + n_bytes + 1]
+
+        if shift == 0:
+            words = window[:n_bytes].copy()
+        else:
+            hi = window[:n_bytes].astype(np.uint16) << shift
+            lo = np.zeros(n_bytes, dtype=np.uint16)
+            tail = window[1 : n_bytes + 1]
+            lo[: tail.size] = tail >> (8 - shift)
+            words = ((hi | lo) & 0xFF).astype(np.uint8)
+
+        key = PackedKey.__new__(PackedKey)
+        key._data = words
+        key._length = length
+        key._clear_padding()
+        return key
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_list())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackedKey):
+            return NotImplemented
+        return self._length == other._length and np.array_equal(self._data, other._data)
+
+    def __xor__(self, other: "PackedKey") -> "PackedKey":
+        if not isinstance(other, PackedKey):
+            return NotImplemented
+        if self._length != other._length:
+            raise ValueError("Cannot XOR keys of different lengths")
+        key = PackedKey.__new__(PackedKey)
+        key._data = np.bitwise_xor(self._data, other._data)
+        key._length = self._length
+        return key
+
+    def hamming_distance(self, other: "PackedKey") -> int:
+        """Number of positions where the two keys differ."""
+        return (self ^ other).count()
+
+    def count(self) -> int:
+        """Number of set bits."""
+        return int(_POPCOUNT[self._data].sum(dtype=np.int64))
+
+    def to_bytes(self) -> bytes:
+        """Packed key material ready for handoff."""
+        return self._data.tobytes()
+
+    def to_numpy(self) -> np.ndarray:
+        """Unpacked uint8 array of 0/1 values."""
+        return np.unpackbits(self._data, count=self._length)
+
+    def to_list(self) -> List[int]:
+        """Unpacked list of bits."""
+        return self.to_numpy().tolist()
+
+    def __repr__(self) -> str:
+        return f"PackedKey(length={self._length}, hex={self.to_bytes().hex()!r})"
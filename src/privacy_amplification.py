@@ -0,0 +1,95 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from .packed_key import PackedKey
+from .reconciliation import binary_entropy
+
+
+def toeplitz_hash(key: PackedKey, seed_bits: np.ndarray, output_length: int) -> PackedKey:
+    """
+    Multiply a key by a random binary Toeplitz matrix over GF(2).
+
+    The m x n matrix T[i, j] = seed_bits[i - j + n - 1] is never formed; the
+    product is read off the linear convolution of the seed with the key,
+    computed by FFT in O((n + m) log(n + m)).
+
+    Args:
+        key: Input key of n bits
+        seed_bits: n + m - 1 random bits defining the matrix
+        output_length: Output length m
+
+    Returns:
+        Compressed key of m bits
+    """
+    n = len(key)
+    m = output_length
+    if m == 0:
+        return PackedKey()
+    if seed_bits.size != n + m - 1:
+        raise ValueError(f"Toeplitz seed must have {n + m - 1} bits, got {seed_bits.size}")
+
+    # Circular wrap-around only lands below index n - 1, so n + m - 1 points suffice
+    size = 1 << (seed_bits.size - 1).bit_length()
+    spectrum = np.fft.rfft(seed_bits.astype(np.float64), size) * np.fft.rfft(
+        key.to_numpy().astype(np.float64), size
+    )
+    convolution = np.fft.irfft(spectrum, size)[n - 1 : n - 1 + m]
+    bits = np.rint(convolution).astype(np.int64) & 1
+
+    return PackedKey.from_bits(bits.astype(np.uint8))
+
+
+class PrivacyAmplifier:
+    """
+    Privacy amplification by 2-universal Toeplitz hashing.
+    Compresses the reconciled key to the length that remains secret
+    given the measured error rate and the bits leaked during reconciliation.
+    """
+
+    def __init__(self, epsilon: float = 1e-10):
+        """
+        Initialize privacy amplification.
+
+        Args:
+            epsilon: Target distance from a perfectly secret key
+        """
+        self.epsilon = epsilon
+        self.security_bits = math.ceil(2 * math.log2(1 / epsilon))
+
+    def secure_length(self, n: int, error_rate: float, leaked_bits: int = 0) -> int:
+        """
+        Number of extractable secret bits.
+
+        Args:
+            n: Reconciled key length
+            error_rate: Measured quantum bit error rate
+            leaked_bits: Bits disclosed during error reconciliation
+
+        Returns:
+            Maximum secure output length (0 if nothing can be extracted)
+        """
+        length = n * (1 - binary_entropy(error_rate)) - leaked_bits - self.security_bits
+        return max(0, math.floor(length))
+
+    def amplify(self, key: PackedKey, output_length: int, seed: Optional[int] = None) -> PackedKey:
+        """
+        Compress a key with a freshly drawn Toeplitz matrix.
+
+        Args:
+            key: Reconciled key
+            output_length: Number of output bits
+            seed: Seed for the (public) Toeplitz matrix
+
+        Returns:
+            Amplified key
+        """
+        if output_length > len(key):
+            raise ValueError("Privacy amplification cannot expand the key")
+        if output_length == 0:
+            return PackedKey()
+
+        rng = np.random.default_rng(seed)
+        seed_bits = rng.integers(0, 2, size=len(key) + output_length - 1, dtype=np.uint8)
+        return toeplitz_hash(key, seed_bits, output_length)
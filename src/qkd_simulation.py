@@ -0,0 +1,229 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+NOISE_MODELS = ("bit_flip", "depolarizing")
+
+
+class BB84Simulator:
+    """
+    Batched Monte Carlo simulation of the BB84 protocol.
+    Runs many protocol instances at once as rows of 2-D arrays, with
+    channel noise, photon loss and an intercept-resend eavesdropper.
+    """
+
+    def __init__(
+        self,
+        n_qubits: int = 1024,
+        noise_model: str = "bit_flip",
+        noise_prob: float = 0.0,
+        loss_prob: float = 0.0,
+        eve_prob: float = 0.0,
+        sample_size: int = 50,
+        error_threshold: float = 0.11,
+        key_length: Optional[int] = None,
+    ):
+        """
+        Initialize simulator.
+
+        Args:
+            n_qubits: Qubits sent per protocol run
+            noise_model: "bit_flip" or "depolarizing"
+            noise_prob: Per-qubit noise probability
+            loss_prob: Probability that a photon never reaches Bob
+            eve_prob: Fraction of qubits Eve intercepts and resends
+            sample_size: Sifted bits revealed for error estimation
+            error_threshold: Abort threshold on the estimated error rate
+            key_length: Target key length (counts runs left too short)
+        """
+        if noise_model not in NOISE_MODELS:
+            raise ValueError(f"Unknown noise model {noise_model!r}, expected one of {NOISE_MODELS}")
+        for name, value in (
+            ("noise_prob", noise_prob),
+            ("loss_prob", loss_prob),
+            ("eve_prob", eve_prob),
+        ):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+        self.n_qubits = n_qubits
+        self.noise_model = noise_model
+        self.noise_prob = noise_prob
+        self.loss_prob = loss_prob
+        self.eve_prob = eve_prob
+        self.sample_size = sample_size
+        self.error_threshold = error_threshold
+        self.key_length = key_length
+
+    def simulate_batch(self, runs: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        Simulate protocol runs in a single vectorized pass.
+
+        Args:
+            runs: Number of independent protocol instances (rows)
+            rng: NumPy random generator
+
+        Returns:
+            Per-run arrays: sifted_length, errors, error_rate,
+            estimated_error_rate, aborted
+        """
+        shape = (runs, self.n_qubits)
+
+        # Alice's bits and bases, Bob's bases
+        alice_bits = rng.integers(0, 2, size=shape, dtype=np.uint8)
+        alice_bases = rng.integers(0, 2, size=shape, dtype=np.uint8)
+        bob_bases = rng.integers(0, 2, size=shape, dtype=np.uint8)
+
+        # Intercept-resend: Eve measures in a random basis and resends her result
+        sent_bits, sent_bases = alice_bits, alice_bases
+        if self.eve_prob:
+            intercepted = rng.random(shape) < self.eve_prob
+            eve_bases = rng.integers(0, 2, size=shape, dtype=np.uint8)
+            eve_bits = np.where(
+                eve_bases == alice_bases, alice_bits, rng.integers(0, 2, size=shape, dtype=np.uint8)
+            )
+            sent_bits = np.where(intercepted, eve_bits, alice_bits)
+            sent_bases = np.where(intercepted, eve_bases, alice_bases)
+
+        # Bob's measurement: deterministic in the matching basis, random otherwise
+        bob_bits = np.where(
+            bob_bases == sent_bases, sent_bits, rng.integers(0, 2, size=shape, dtype=np.uint8)
+        )
+
+        # Channel noise
+        if self.noise_prob:
+            hit = rng.random(shape) < self.noise_prob
+            if self.noise_model == "bit_flip":
+                bob_bits = bob_bits ^ hit.astype(np.uint8)
+            else:
+                # Depolarized qubits yield a uniformly random outcome
+                random_bits = rng.integers(0, 2, size=shape, dtype=np.uint8)
+                bob_bits = np.where(hit, random_bits, bob_bits)
+
+        # Photon loss removes positions before sifting
+        sifted = alice_bases == bob_bases
+        if self.loss_prob:
+            sifted &= rng.random(shape) >= self.loss_prob
+
+        errors = (alice_bits != bob_bits) & sifted
+        sifted_length = sifted.sum(axis=1)
+        error_count = errors.sum(axis=1)
+        error_rate = error_count / np.maximum(sifted_length, 1)
+
+        # Error estimation on a random sample of sifted positions per run
+        sample_cap = min(self.sample_size, self.n_qubits)
+        effective = np.minimum(self.sample_size, sifted_length // 2)
+        estimated = np.zeros(runs)
+        if sample_cap:
+            priority = rng.random(shape)
+            priority[~sifted] = 2.0
+            candidates = np.argpartition(priority, sample_cap - 1, axis=1)[:, :sample_cap]
+            order = np.argsort(np.take_along_axis(priority, candidates, axis=1), axis=1)
+            sample = np.take_along_axis(candidates, order, axis=1)
+            in_sample = np.arange(sample_cap) < effective[:, None]
+            sample_errors = (np.take_along_axis(errors, sample, axis=1) & in_sample).sum(axis=1)
+            estimated = sample_errors / np.maximum(effective, 1)
+
+        aborted = (effective == 0) | (estimated >= self.error_threshold)
+
+        result = {
+            "sifted_length": sifted_length,
+            "errors": error_count,
+            "error_rate": error_rate,
+            "estimated_error_rate": estimated,
+            "aborted": aborted,
+        }
+        if self.key_length is not None:
+            result["insufficient"] = ~aborted & (sifted_length - effective < self.key_length)
+
+        return result
+
+    def _simulate_chunk(self, runs: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        return self.simulate_batch(runs, np.random.default_rng(seed))
+
+    def run(
+        self,
+        runs: int,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> dict:
+        """
+        Run a Monte Carlo study.
+
+        Args:
+            runs: Total number of protocol instances
+            seed: Master seed for reproducible results
+            workers: Process pool size (None or 1 runs in-process)
+            chunk_size: Runs per vectorized batch (bounds peak memory)
+
+        Returns:
+            Dictionary with per-run distributions and summary statistics
+        """
+        if runs <= 0:
+            raise ValueError("runs must be positive")
+
+        sizes = [chunk_size] * (runs // chunk_size)
+        if runs % chunk_size:
+            sizes.append(runs % chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        if workers is not None and workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(self._simulate_chunk, sizes, seeds))
+        else:
+            chunks = [self._simulate_chunk(size, s) for size, s in zip(sizes, seeds)]
+
+        result = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+        result.update(self.summarize(result))
+        return result
+
+    @staticmethod
+    def summarize(result: Dict[str, np.ndarray]) -> dict:
+        """Summary statistics of per-run distributions."""
+        summary = {
+            "runs": int(result["aborted"].size),
+            "abort_probability": float(np.mean(result["aborted"])),
+            "mean_sifted_length": float(np.mean(result["sifted_length"])),
+            "std_sifted_length": float(np.std(result["sifted_length"])),
+            "mean_error_rate": float(np.mean(result["error_rate"])),
+            "std_error_rate": float(np.std(result["error_rate"])),
+            "error_rate_percentiles": dict(
+                zip((5, 50, 95), np.percentile(result["error_rate"], [5, 50, 95]).tolist())
+            ),
+        }
+        if "insufficient" in result:
+            summary["insufficient_probability"] = float(np.mean(result["insufficient"]))
+        return summary
+
+    def sweep(
+        self,
+        parameter: str,
+        values: Iterable[float],
+        runs: int,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Summaries over a range of one channel parameter (e.g. eve_prob).
+
+        Returns:
+            List of summary dictionaries, one per value
+        """
+        if parameter not in ("noise_prob", "loss_prob", "eve_prob"):
+            raise ValueError(f"Cannot sweep {parameter!r}")
+
+        original = getattr(self, parameter)
+        summaries = []
+        try:
+            for value in values:
+                setattr(self, parameter, value)
+                result = self.run(runs, seed=seed, workers=workers)
+                summary = self.summarize(result)
+                summary[parameter] = value
+                summaries.append(summary)
+        finally:
+            setattr(self, parameter, original)
+
+        return summaries
@@ -1,5 +1,26 @@
+import math
 import random
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+from .instrumentation import count, span
+from .utils.lazy import LazyModule
+
+# NumPy and the post-processing stages are imported on first use, so importing
+# this module or constructing the protocol (e.g. for a CLI or a cold-started
+# handler) stays cheap
+np = LazyModule("numpy")
+
+if TYPE_CHECKING:
+    from .entropy import EntropySource
+    from .packed_key import PackedKey
+    from .privacy_amplification import PrivacyAmplifier
+    from .reconciliation import CascadeReconciler
+
+# Smallest adaptive round; tiny top-ups leak more to reconciliation than they add
+_MIN_ROUND_QUBITS = 256
+
+# BB84 abort threshold on the estimated error rate
+_ABORT_ERROR_RATE = 0.11
 
 
 class QuantumKeyDistribution:
@@ -8,23 +29,88 @@ class QuantumKeyDistribution:
     Simulates quantum key exchange resistant to eavesdropping.
     """
 
-    def __init__(self, key_length: int = 256):
+    def __init__(
+        self,
+        key_length: int = 256,
+        channel_error_rate: float = 0.0,
+        reconciler: Optional["CascadeReconciler"] = None,
+        amplifier: Optional["PrivacyAmplifier"] = None,
+        sample_size: int = 50,
+        rng: Optional[random.Random] = None,
+        entropy: Optional["EntropySource"] = None,
+        adaptive: bool = False,
+        max_rounds: int = 8,
+    ):
         """
         Initialize QKD system.
 
         Args:
             key_length: Desired length of the quantum key
+            channel_error_rate: Probability that the channel flips a measured bit
+            reconciler: Error reconciliation stage applied after sifting
+            amplifier: Privacy amplification stage (Toeplitz hashing by default)
+            sample_size: Sifted bits disclosed for eavesdropping detection
+            rng: Random generator for this session (a fresh one by default)
+            entropy: Bulk source for bits and bases (system CSPRNG unless rng is given)
+            adaptive: Size rounds from running estimates until key_length is reached
+            max_rounds: Round limit in adaptive mode
         """
+        if sample_size < 1:
+            raise ValueError("Sample size must be at least 1")
+
         self.key_length = key_length
+        self.channel_error_rate = channel_error_rate
+        self.reconciler = reconciler
+        self.sample_size = sample_size
+        self.rng = rng if rng is not None else random.Random()
+        # Defaults are created on first use (see the amplifier and entropy properties)
+        self._amplifier = amplifier
+        self._entropy = entropy
+        self._default_entropy = entropy is None and rng is None
+        self.adaptive = adaptive
+        self.max_rounds = max_rounds
         self.bases = {0: "rectilinear", 1: "diagonal"}
 
+    @property
+    def amplifier(self) -> "PrivacyAmplifier":
+        """Privacy amplification stage (Toeplitz hashing unless one was given)."""
+        if self._amplifier is None:
+            from .privacy_amplification import PrivacyAmplifier
+
+            self._amplifier = PrivacyAmplifier()
+        return self._amplifier
+
+    @amplifier.setter
+    def amplifier(self, amplifier: "PrivacyAmplifier"):
+        self._amplifier = amplifier
+
+    @property
+    def entropy(self) -> Optional["EntropySource"]:
+        """Bulk randomness source, or None when bits come from the session rng."""
+        if self._entropy is None and self._default_entropy:
+            from .entropy import default_entropy
+
+            self._entropy = default_entropy()
+        return self._entropy
+
+    @entropy.setter
+    def entropy(self, entropy: Optional["EntropySource"]):
+        self._entropy = entropy
+        self._default_entropy = False
+
+    def _random_bits(self, n: int) -> List[int]:
+        """Draw n bits in bulk from the entropy source or the session rng."""
+        if self.entropy is not None:
+            return self.entropy.bits(n).tolist()
+        return [int(b) for b in format(self.rng.getrandbits(n), f"0{n}b")] if n else []
+
     def generate_random_bits(self, n: int) -> List[int]:
         """Generate random bits for Alice."""
-        return [random.randint(0, 1) for _ in range(n)]
+        return self._random_bits(n)
 
     def generate_random_bases(self, n: int) -> List[int]:
         """Generate random measurement bases."""
-        return [random.randint(0, 1) for _ in range(n)]
+        return self._random_bits(n)
 
     def encode_qubits(self, bits: List[int], bases: List[int]) -> List[dict]:
         """
@@ -58,7 +144,8 @@ class QuantumKeyDistribution:
             Measured bit values
         """
         measurements = []
-        for qubit, basis in zip(qubits, bases):
+        coins = self._random_bits(len(qubits))
+        for qubit, basis, coin in zip(qubits, bases, coins):
             alice_basis = qubit["basis"]
 
             if basis == alice_basis:
@@ -69,7 +156,14 @@ class QuantumKeyDistribution:
                     measurements.append(1)
             else:
                 # Different basis: random result (50/50)
-                measurements.append(random.randint(0, 1))
+                measurements.append(coin)
+
+        if self.channel_error_rate:
+            # Channel noise flips measured bits independently
+            measurements = [
+                bit ^ 1 if self.rng.random() < self.channel_error_rate else bit
+                for bit in measurements
+            ]
 
         return measurements
 
@@ -96,73 +190,363 @@ class QuantumKeyDistribution:
 
         return alice_sifted, bob_sifted
 
+    def sift_key_packed(
+        self,
+        alice_bits: List[int],
+        bob_bits: List[int],
+        alice_bases: List[int],
+        bob_bases: List[int],
+    ) -> Tuple["PackedKey", "PackedKey"]:
+        """
+        Basis reconciliation producing packed sifted keys.
+
+        Returns:
+            Tuple of (alice_sifted_key, bob_sifted_key) as PackedKey
+        """
+        from .packed_key import PackedKey
+
+        matches = np.asarray(alice_bases, dtype=np.uint8) == np.asarray(bob_bases, dtype=np.uint8)
+        alice_sifted = np.asarray(alice_bits, dtype=np.uint8)[matches]
+        bob_sifted = np.asarray(bob_bits, dtype=np.uint8)[matches]
+
+        return PackedKey.from_bits(alice_sifted), PackedKey.from_bits(bob_sifted)
+
     def detect_eavesdropping(
-        self, alice_key: List[int], bob_key: List[int], sample_size: int = 50
-    ) -> Tuple[bool, float]:
+        self,
+        alice_key: List[int],
+        bob_key: List[int],
+        sample_size: int = 50,
+        return_indices: bool = False,
+    ) -> Union[Tuple[bool, float], Tuple[bool, float, List[int]]]:
         """
         Check for eavesdropping by comparing sample bits.
 
+        Args:
+            return_indices: Also return the disclosed sample positions
+
         Returns:
-            Tuple of (is_secure, error_rate)
+            Tuple of (is_secure, error_rate), plus sample indices if requested
         """
         if len(alice_key) < sample_size:
             sample_size = len(alice_key) // 2
+        if sample_size < 1:
+            raise SecurityError(
+                f"Sifted key of {len(alice_key)} bits is too short for eavesdropping detection"
+            )
 
         # Sample random positions
-        sample_indices = random.sample(range(len(alice_key)), sample_size)
+        sample_indices = self.rng.sample(range(len(alice_key)), sample_size)
 
         errors = sum(1 for i in sample_indices if alice_key[i] != bob_key[i])
         error_rate = errors / sample_size
 
         # Threshold: typically 11% for BB84
-        is_secure = error_rate < 0.11
+        is_secure = error_rate < _ABORT_ERROR_RATE
+
+        if return_indices:
+            return is_secure, error_rate, sample_indices
 
         return is_secure, error_rate
 
-    def generate_shared_key(self) -> Tuple[List[int], dict]:
+    def _run_round(self, n_bits: int) -> Tuple["PackedKey", "PackedKey"]:
         """
-        Complete QKD protocol execution.
+        Send n_bits qubits and sift them.
 
         Returns:
-            Tuple of (shared_key, protocol_stats)
+            Tuple of (alice_sifted_key, bob_sifted_key)
+        """
+        # Alice generates random bits and bases, and encodes qubits
+        with span("qkd.generate"):
+            alice_bits = self.generate_random_bits(n_bits)
+            alice_bases = self.generate_random_bases(n_bits)
+            bob_bases = self.generate_random_bases(n_bits)
+        with span("qkd.encode"):
+            qubits = self.encode_qubits(alice_bits, alice_bases)
+
+        # Bob measures in his random bases
+        with span("qkd.measure"):
+            bob_bits = self.measure_qubits(qubits, bob_bases)
+
+        # Basis reconciliation (public channel)
+        with span("qkd.sift"):
+            alice_sifted, bob_sifted = self.sift_key_packed(
+                alice_bits, bob_bits, alice_bases, bob_bases
+            )
+
+        count("qkd.qubits", n_bits)
+        count("qkd.sifted_bits", len(alice_sifted))
+        return alice_sifted, bob_sifted
+
+    def _sample_and_discard(
+        self, alice_sifted: "PackedKey", bob_sifted: "PackedKey"
+    ) -> Tuple["PackedKey", "PackedKey", float, int]:
+        """
+        Eavesdropping detection, then removal of the disclosed sample.
+
+        Returns:
+            Tuple of (alice_key, bob_key, error_rate, sample_bits)
+        """
+        with span("qkd.detect"):
+            is_secure, error_rate, sample_indices = self.detect_eavesdropping(
+                alice_sifted, bob_sifted, self.sample_size, return_indices=True
+            )
+
+            if not is_secure:
+                count("qkd.aborts")
+                raise SecurityError(f"Eavesdropping detected! Error rate: {error_rate:.2%}")
+
+            alice_key = _discard_positions(alice_sifted, sample_indices)
+            bob_key = _discard_positions(bob_sifted, sample_indices)
+        return alice_key, bob_key, error_rate, len(sample_indices)
+
+    def _reconcile(
+        self, alice_key: "PackedKey", bob_key: "PackedKey", error_rate: float
+    ) -> Tuple["PackedKey", dict]:
+        """Error reconciliation followed by key verification."""
+        reconciliation = {"leaked_bits": 0, "rounds": 0, "corrected_bits": 0}
+        if self.reconciler is not None:
+            with span("qkd.reconcile"):
+                bob_key, reconciliation = self.reconciler.reconcile(
+                    alice_key, bob_key, error_rate, seed=self.rng.getrandbits(64)
+                )
+            count("qkd.leaked_bits", reconciliation["leaked_bits"])
+
+        if alice_key != bob_key:
+            raise SecurityError("Key verification failed: residual errors after reconciliation")
+
+        return bob_key, reconciliation
+
+    def _update_error_rate(
+        self, error_rate: float, key_bits: int, corrected_bits: int
+    ) -> Tuple[float, float]:
         """
-        # Generate enough bits (compensate for sifting)
-        n_bits = self.key_length * 4
+        Raise the error estimate to the rate reconciliation actually corrected.
+        The sample only bounds the rate statistically, so the most pessimistic
+        of the two is kept.
+
+        Returns:
+            Tuple of (error_rate, observed_error_rate)
+        """
+        observed = corrected_bits / key_bits if key_bits else 0.0
+        error_rate = max(error_rate, observed)
+        if error_rate >= _ABORT_ERROR_RATE:
+            count("qkd.aborts")
+            raise SecurityError(f"Eavesdropping detected! Error rate: {error_rate:.2%}")
+        return error_rate, observed
 
-        # Step 1: Alice generates random bits and bases
-        alice_bits = self.generate_random_bits(n_bits)
-        alice_bases = self.generate_random_bases(n_bits)
+    def _required_sifted(self, error_rate: float, leak_per_bit: float) -> int:
+        """
+        Reconciled bits needed for key_length secure bits.
 
-        # Step 2: Alice encodes qubits
-        qubits = self.encode_qubits(alice_bits, alice_bases)
+        Args:
+            error_rate: Estimated error rate
+            leak_per_bit: Estimated reconciliation leakage per key bit
+        """
+        from .reconciliation import binary_entropy
 
-        # Step 3: Bob chooses random bases and measures
-        bob_bases = self.generate_random_bases(n_bits)
-        bob_bits = self.measure_qubits(qubits, bob_bases)
+        rate = 1 - binary_entropy(error_rate) - leak_per_bit
+        if rate <= 0:
+            raise SecurityError(f"No secret key can be extracted at error rate {error_rate:.2%}")
+        return math.ceil((self.key_length + self.amplifier.security_bits) / rate)
 
-        # Step 4: Basis reconciliation (public channel)
-        alice_sifted, bob_sifted = self.sift_key(alice_bits, bob_bits, alice_bases, bob_bases)
+    def generate_shared_key(
+        self, packed: bool = False
+    ) -> Tuple[Union[List[int], "PackedKey"], dict]:
+        """
+        Complete QKD protocol execution.
 
-        # Step 5: Eavesdropping detection
-        is_secure, error_rate = self.detect_eavesdropping(alice_sifted, bob_sifted)
+        Args:
+            packed: Return the key as a PackedKey instead of a list of bits
 
-        if not is_secure:
-            raise SecurityError(f"Eavesdropping detected! Error rate: {error_rate:.2%}")
+        Returns:
+            Tuple of (shared_key, protocol_stats)
+        """
+        with span("qkd.generate_shared_key"):
+            if self.adaptive:
+                final_key, stats = self._generate_adaptive()
+            else:
+                final_key, stats = self._generate_fixed()
+
+        if not packed:
+            return final_key.to_list(), stats
+
+        return final_key, stats
 
-        # Step 6: Privacy amplification (keep remaining bits)
-        final_key = alice_sifted[50:][: self.key_length]
+    def _generate_fixed(self) -> Tuple["PackedKey", dict]:
+        """Single round with a fixed qubit budget."""
+        # Generate enough bits (compensate for sifting, sampling and amplification)
+        n_bits = (self.key_length + self.sample_size + self.amplifier.security_bits) * 4
+
+        # Steps 1-4: qubit exchange and sifting
+        alice_sifted, bob_sifted = self._run_round(n_bits)
+
+        # Step 5: Eavesdropping detection, then discard the disclosed sample
+        alice_key, bob_key, error_rate, sample_bits = self._sample_and_discard(
+            alice_sifted, bob_sifted
+        )
+
+        # Step 6: Error reconciliation (public channel)
+        bob_key, reconciliation = self._reconcile(alice_key, bob_key, error_rate)
+        error_rate, observed = self._update_error_rate(
+            error_rate, len(alice_key), reconciliation["corrected_bits"]
+        )
+
+        # Step 7: Privacy amplification (Toeplitz hashing down to the secure length)
+        secure_length = self.amplifier.secure_length(
+            len(alice_key), error_rate, reconciliation["leaked_bits"]
+        )
+        with span("qkd.amplify"):
+            final_key = self.amplifier.amplify(
+                alice_key, min(self.key_length, secure_length), seed=self.rng.getrandbits(64)
+            )
+        count("qkd.key_bits", len(final_key))
 
         stats = {
             "initial_bits": n_bits,
             "sifted_bits": len(alice_sifted),
+            "sample_bits": sample_bits,
+            "secure_length": secure_length,
             "final_key_length": len(final_key),
             "error_rate": error_rate,
             "efficiency": len(final_key) / n_bits,
+            "key_bytes": final_key.nbytes,
+            "leaked_bits": reconciliation["leaked_bits"],
+            "reconciliation_rounds": reconciliation["rounds"],
+            "corrected_bits": reconciliation["corrected_bits"],
+            "rounds": [
+                {
+                    "qubits": n_bits,
+                    "sifted_bits": len(alice_sifted),
+                    "sifting_efficiency": len(alice_sifted) / n_bits,
+                    "observed_error_rate": observed,
+                }
+            ],
+        }
+
+        return final_key, stats
+
+    def _generate_adaptive(self) -> Tuple["PackedKey", dict]:
+        """
+        Rounds sized from running estimates until key_length secure bits exist.
+        The error rate is sampled once, on the first round with enough material.
+        After every reconciliation the estimate is raised to the rate of bits
+        Cascade corrected in that round (see _update_error_rate), so errors that grow mid-session (e.g.
+        an eavesdropper starting to intercept) shrink the secure length instead
+        of being corrected silently.
+        """
+        from .packed_key import PackedKey
+        from .reconciliation import binary_entropy
+
+        efficiency = 0.5  # Prior: half of the bases match
+        leak_per_bit = None
+        error_rate = None
+        sent = sifted_total = sample_bits = 0
+
+        alice_key = bob_key = PackedKey()
+        raw_alice = raw_bob = PackedKey()
+        reconciliation = {"leaked_bits": 0, "rounds": 0, "corrected_bits": 0}
+        rounds = []
+        secure_length = 0
+
+        while True:
+            if len(rounds) == self.max_rounds:
+                raise SecurityError(
+                    f"Adaptive generation stopped after {self.max_rounds} rounds with "
+                    f"{secure_length} of {self.key_length} secure bits"
+                )
+
+            if leak_per_bit is None:
+                # Prior: typical Cascade leakage of 1.25 h(e), at least at a 1% error rate
+                prior = 1.25 * binary_entropy(max(error_rate or 0.0, 0.01))
+                leak_per_bit = prior if self.reconciler is not None else 0.0
+
+            required = self._required_sifted(error_rate or 0.0, leak_per_bit)
+            if error_rate is None:
+                required += self.sample_size
+
+            # Size the round for the deficit, with a three-sigma allowance for sifting
+            deficit = max(required - len(alice_key) - len(raw_alice), 1)
+            expected = deficit / efficiency
+            n_bits = max(math.ceil(expected + 3 * math.sqrt(expected)), _MIN_ROUND_QUBITS)
+
+            round_alice, round_bob = self._run_round(n_bits)
+            raw_alice = PackedKey.concat([raw_alice, round_alice])
+            raw_bob = PackedKey.concat([raw_bob, round_bob])
+            sent += n_bits
+            sifted_total += len(round_alice)
+            efficiency = max(sifted_total / sent, 1e-3)
+
+            breakdown = {
+                "qubits": n_bits,
+                "sifted_bits": len(round_alice),
+                "sifting_efficiency": len(round_alice) / n_bits,
+            }
+            rounds.append(breakdown)
+
+            if len(alice_key) + len(raw_alice) < required:
+                continue
+
+            if error_rate is None:
+                raw_alice, raw_bob, error_rate, sample_bits = self._sample_and_discard(
+                    raw_alice, raw_bob
+                )
+                breakdown["sample_bits"] = sample_bits
+
+            raw_bob, leaked = self._reconcile(raw_alice, raw_bob, error_rate)
+            for key in reconciliation:
+                reconciliation[key] += leaked[key]
+
+            error_rate, breakdown["observed_error_rate"] = self._update_error_rate(
+                error_rate, len(raw_alice), leaked["corrected_bits"]
+            )
+
+            alice_key = PackedKey.concat([alice_key, raw_alice])
+            bob_key = PackedKey.concat([bob_key, raw_bob])
+            raw_alice = raw_bob = PackedKey()
+
+            secure_length = self.amplifier.secure_length(
+                len(alice_key), error_rate, reconciliation["leaked_bits"]
+            )
+            breakdown["error_rate"] = error_rate
+            breakdown["leaked_bits"] = leaked["leaked_bits"]
+            breakdown["secure_length"] = secure_length
+
+            if secure_length >= self.key_length:
+                break
+
+            leak_per_bit = reconciliation["leaked_bits"] / len(alice_key)
+
+        with span("qkd.amplify"):
+            final_key = self.amplifier.amplify(
+                alice_key, self.key_length, seed=self.rng.getrandbits(64)
+            )
+        count("qkd.key_bits", len(final_key))
+
+        stats = {
+            "initial_bits": sent,
+            "sifted_bits": sifted_total,
+            "sample_bits": sample_bits,
+            "secure_length": secure_length,
+            "final_key_length": len(final_key),
+            "error_rate": error_rate,
+            "efficiency": len(final_key) / sent,
+            "key_bytes": final_key.nbytes,
+            "leaked_bits": reconciliation["leaked_bits"],
+            "reconciliation_rounds": reconciliation["rounds"],
+            "corrected_bits": reconciliation["corrected_bits"],
+            "rounds": rounds,
         }
 
         return final_key, stats
 
 
+def _discard_positions(key: "PackedKey", indices: List[int]) -> "PackedKey":
+    """Remove publicly disclosed positions from a sifted key."""
+    from .packed_key import PackedKey
+
+    return PackedKey.from_bits(np.delete(key.to_numpy(), indices))
+
+
 class SecurityError(Exception):
     """Custom exception for security violations."""
 
@@ -0,0 +1,249 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .packed_key import PackedKey
+
+
+def binary_entropy(p: float) -> float:
+    """Shannon entropy h(p) of a biased coin, in bits."""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+def _prefix_parity(bits: np.ndarray) -> np.ndarray:
+    """prefix[i] is the parity of bits[:i]."""
+    prefix = np.zeros(bits.size + 1, dtype=np.uint8)
+    np.bitwise_xor.accumulate(bits, out=prefix[1:])
+    return prefix
+
+
+class CascadeReconciler:
+    """
+    Cascade information reconciliation for QKD sifted keys.
+    Block parities and the binary searches inside mismatched blocks are
+    evaluated for all blocks of a pass at once, so each search step is a
+    single communication round regardless of how many blocks disagree.
+    Optionally starts with one-way LDPC syndrome decoding.
+    """
+
+    def __init__(
+        self,
+        passes: int = 4,
+        initial_block_size: Optional[int] = None,
+        use_ldpc: bool = False,
+        ldpc_redundancy: float = 2.0,
+        ldpc_column_weight: int = 3,
+        ldpc_iterations: int = 50,
+        min_error_rate: float = 0.01,
+    ):
+        """
+        Initialize reconciler.
+
+        Args:
+            passes: Number of Cascade passes
+            initial_block_size: First-pass block size (default 0.73 / error_rate)
+            use_ldpc: Run LDPC syndrome decoding before Cascade
+            ldpc_redundancy: Syndrome length as a multiple of n * h(error_rate)
+            ldpc_column_weight: Parity checks per key bit
+            ldpc_iterations: Maximum belief-propagation iterations
+            min_error_rate: Floor on the sampled error rate when sizing blocks
+        """
+        self.passes = passes
+        self.initial_block_size = initial_block_size
+        self.use_ldpc = use_ldpc
+        self.ldpc_redundancy = ldpc_redundancy
+        self.ldpc_column_weight = ldpc_column_weight
+        self.ldpc_iterations = ldpc_iterations
+        self.min_error_rate = min_error_rate
+
+    def block_size(self, error_rate: float, n: int) -> int:
+        """First-pass block size for the given error rate."""
+        if self.initial_block_size is not None:
+            size = self.initial_block_size
+        else:
+            size = math.ceil(0.73 / max(error_rate, self.min_error_rate))
+        return int(max(2, min(size, n)))
+
+    def reconcile(
+        self,
+        alice_key: PackedKey,
+        bob_key: PackedKey,
+        error_rate: float,
+        seed: Optional[int] = None,
+    ) -> Tuple[PackedKey, dict]:
+        """
+        Correct Bob's key towards Alice's.
+
+        Args:
+            alice_key: Alice's sifted key
+            bob_key: Bob's sifted key
+            error_rate: Estimated error rate (sets block sizes)
+            seed: Seed for the public block permutations and LDPC matrix
+
+        Returns:
+            Tuple of (corrected_bob_key, reconciliation_stats)
+        """
+        if len(alice_key) != len(bob_key):
+            raise ValueError("Keys must have equal length")
+
+        rng = np.random.default_rng(seed)
+        alice = alice_key.to_numpy()
+        bob = bob_key.to_numpy().copy()
+        stats = {"leaked_bits": 0, "rounds": 0, "corrected_bits": 0}
+
+        if alice.size == 0:
+            return PackedKey.from_bits(bob), stats
+
+        if self.use_ldpc:
+            self._ldpc_decode(alice, bob, error_rate, rng, stats)
+
+        self._cascade(alice, bob, error_rate, rng, stats)
+
+        n = alice.size
+        ideal = n * binary_entropy(error_rate)
+        stats["efficiency"] = stats["leaked_bits"] / ideal if ideal else float("inf")
+        return PackedKey.from_bits(bob), stats
+
+    def _cascade(
+        self,
+        alice: np.ndarray,
+        bob: np.ndarray,
+        error_rate: float,
+        rng: np.random.Generator,
+        stats: dict,
+    ):
+        """Run Cascade passes, correcting bob in place."""
+        n = alice.size
+        size = self.block_size(error_rate, n)
+        layouts = []
+
+        for pass_index in range(self.passes):
+            perm = np.arange(n) if pass_index == 0 else rng.permutation(n)
+            starts = np.arange(0, n, size)
+
+            # Alice announces every block parity of this pass in one message
+            alice_parity = np.bitwise_xor.reduceat(alice[perm], starts)
+            layouts.append((perm, starts, size, alice_parity))
+            stats["leaked_bits"] += int(starts.size)
+            stats["rounds"] += 1
+
+            # Cascade: a correction in one pass can expose odd blocks in earlier ones
+            dirty = True
+            while dirty:
+                dirty = False
+                for layout in reversed(layouts):
+                    flipped = self._correct_blocks(alice, bob, layout, stats)
+                    if flipped:
+                        stats["corrected_bits"] += flipped
+                        dirty = True
+
+            size = min(size * 2, max(2, n // 2))
+
+    @staticmethod
+    def _correct_blocks(alice: np.ndarray, bob: np.ndarray, layout: tuple, stats: dict) -> int:
+        """
+        Batched binary search in every block whose parities disagree.
+
+        Returns:
+            Number of bits flipped in bob
+        """
+        perm, starts, size, alice_parity = layout
+        bob_perm = bob[perm]
+        bad = np.nonzero(np.bitwise_xor.reduceat(bob_perm, starts) != alice_parity)[0]
+        if bad.size == 0:
+            return 0
+
+        alice_prefix = _prefix_parity(alice[perm])
+        bob_prefix = _prefix_parity(bob_perm)
+        lo = starts[bad]
+        hi = np.minimum(lo + size, perm.size)
+
+        while True:
+            active = hi - lo > 1
+            n_active = int(active.sum())
+            if not n_active:
+                break
+
+            # One round: Alice reveals the parity of the left half of each active block
+            mid = (lo + hi) // 2
+            left_differs = (alice_prefix[mid] ^ alice_prefix[lo]) != (
+                bob_prefix[mid] ^ bob_prefix[lo]
+            )
+            hi = np.where(active & left_differs, mid, hi)
+            lo = np.where(active & ~left_differs, mid, lo)
+            stats["leaked_bits"] += n_active
+            stats["rounds"] += 1
+
+        bob[perm[lo]] ^= 1
+        return int(lo.size)
+
+    def _ldpc_decode(
+        self,
+        alice: np.ndarray,
+        bob: np.ndarray,
+        error_rate: float,
+        rng: np.random.Generator,
+        stats: dict,
+    ):
+        """
+        One-way syndrome decoding with a random sparse parity-check matrix.
+        Uses normalized min-sum belief propagation over the edge list. Bob's
+        key is left untouched if decoding does not converge.
+        """
+        n = alice.size
+        p = min(max(error_rate, self.min_error_rate), 0.5 - 1e-3)
+        m = math.ceil(n * self.ldpc_redundancy * binary_entropy(p))
+        m = int(min(max(m, 8), n))
+
+        # Each key bit joins column_weight checks; edges are kept sorted by check
+        variables = np.tile(np.arange(n), self.ldpc_column_weight)
+        checks = np.concatenate([rng.permutation(n) % m for _ in range(self.ldpc_column_weight)])
+        order = np.argsort(checks, kind="stable")
+        variables, checks = variables[order], checks[order]
+        check_starts = np.flatnonzero(np.r_[True, checks[1:] != checks[:-1]])
+        counts = np.diff(np.r_[check_starts, checks.size])
+
+        # Alice sends her syndrome in a single message
+        alice_syndrome = np.bitwise_xor.reduceat(alice[variables], check_starts)
+        stats["leaked_bits"] += m
+        stats["rounds"] += 1
+
+        channel = (1.0 - 2.0 * bob) * math.log((1 - p) / p)
+        check_sign = 1.0 - 2.0 * alice_syndrome
+        to_check = channel[variables]
+        decoded = bob.copy()
+        converged = False
+
+        for _ in range(self.ldpc_iterations):
+            # Check update: sign product and minimum magnitude excluding each edge
+            magnitude = np.abs(to_check)
+            negative = (to_check < 0).astype(np.int64)
+            min1 = np.minimum.reduceat(magnitude, check_starts)
+            per_edge_min1 = np.repeat(min1, counts)
+            is_min = magnitude == per_edge_min1
+            min2 = np.minimum.reduceat(np.where(is_min, np.inf, magnitude), check_starts)
+            ties = np.add.reduceat(is_min.astype(np.int64), check_starts) > 1
+            per_edge_min2 = np.repeat(np.where(ties, min1, min2), counts)
+            parity = np.repeat(np.add.reduceat(negative, check_starts) & 1, counts)
+            sign = np.repeat(check_sign, counts) * (1.0 - 2.0 * (parity ^ negative))
+            to_var = 0.8 * sign * np.where(is_min, per_edge_min2, per_edge_min1)
+
+            # Variable update and tentative decision
+            total = channel + np.bincount(variables, weights=to_var, minlength=n)
+            decoded = (total < 0).astype(np.uint8)
+            if np.array_equal(
+                np.bitwise_xor.reduceat(decoded[variables], check_starts), alice_syndrome
+            ):
+                converged = True
+                break
+            to_check = total[variables] - to_var
+
+        if converged:
+            stats["corrected_bits"] += int(np.count_nonzero(decoded != bob))
+            bob[:] = decoded
+
+        stats["ldpc_syndrome_bits"] = m
+        stats["ldpc_converged"] = converged
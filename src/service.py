@@ -0,0 +1,471 @@
+import argparse
+import asyncio
+import base64
+import json
+import sys
+from collections import defaultdict
+from concurrent.futures import Executor
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .hash_signatures import HashBasedSignature
+from .lattice_crypto import LatticeEncryption
+
+OPERATIONS = ("encrypt", "decrypt", "sign", "verify")
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the request queue is full and the caller chose not to wait."""
+
+    pass
+
+
+def encode_signature(signature: dict) -> dict:
+    """JSON-safe form of a signature dictionary."""
+    return {
+        "signature_elements": [
+            base64.b64encode(e).decode() for e in signature["signature_elements"]
+        ],
+        "public_key_elements": [
+            base64.b64encode(e).decode() for e in signature["public_key_elements"]
+        ],
+        "index": signature["index"],
+        "message_hash": base64.b64encode(signature["message_hash"]).decode(),
+    }
+
+
+def decode_signature(data: dict) -> dict:
+    """Inverse of encode_signature."""
+    return {
+        "signature_elements": [base64.b64decode(e) for e in data["signature_elements"]],
+        "public_key_elements": [base64.b64decode(e) for e in data["public_key_elements"]],
+        "index": int(data["index"]),
+        "message_hash": base64.b64decode(data["message_hash"]),
+    }
+
+
+class CryptoService:
+    """
+    Local asyncio service that micro-batches encrypt, decrypt, sign and verify.
+
+    Requests wait in a bounded queue. A batcher task collects them until
+    max_batch_size requests are pending or max_batch_delay has passed since
+    the first one, runs each operation's group as one call in an executor, and
+    resolves the per-request futures. Encryptions of a batch share a single
+    bulk noise draw and matrix product; decryptions a single matrix-vector
+    product. A full queue makes submitters wait, which also stops the socket
+    readers and pushes back on clients.
+    """
+
+    def __init__(
+        self,
+        lattice: Optional[LatticeEncryption] = None,
+        lattice_keys: Optional[Tuple] = None,
+        signer: Optional[HashBasedSignature] = None,
+        signature_keys: Optional[Tuple[bytes, bytes]] = None,
+        max_batch_size: int = 64,
+        max_batch_delay: float = 0.002,
+        max_queue: int = 1024,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize service.
+
+        Args:
+            lattice: Encryption scheme (default parameters if None)
+            lattice_keys: (public_key, private_key) pair (generated if None)
+            signer: Signature scheme (default parameters if None)
+            signature_keys: (public_key, private_key) pair (generated if None)
+            max_batch_size: Most requests coalesced into one batch
+            max_batch_delay: Seconds to wait for more requests after the first
+            max_queue: Pending requests before submitters are held back
+            executor: Where batches run (the event loop's default executor if None)
+        """
+        if max_batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        self.lattice = lattice if lattice is not None else LatticeEncryption()
+        self.public_key, self.private_key = (
+            lattice_keys if lattice_keys is not None else self.lattice.generate_keypair()
+        )
+        self.signer = signer if signer is not None else HashBasedSignature()
+        self.verify_key, self.signing_key = (
+            signature_keys if signature_keys is not None else self.signer.generate_keypair()
+        )
+
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_queue = max_queue
+        self.executor = executor
+
+        self._queue = None
+        self._batcher = None
+        self._server = None
+        self._inflight = []
+        self._connections = {}
+        self._stats = {"requests": 0, "batches": 0, "rejected": 0, "errors": 0}
+
+    def _check_ciphertexts(self, ciphertexts: Any) -> Optional[Exception]:
+        """Why a decrypt payload cannot join a batch, or None if it can."""
+        if not isinstance(ciphertexts, (list, tuple)):
+            return TypeError("Ciphertexts must be a list of (u, v) pairs")
+        if len(ciphertexts) % 8:
+            return ValueError("Ciphertext count must be a multiple of 8")
+        for ciphertext in ciphertexts:
+            if not isinstance(ciphertext, (list, tuple)) or len(ciphertext) != 2:
+                return TypeError("Ciphertexts must be a list of (u, v) pairs")
+            u, v = ciphertext
+            if np.shape(u) != (self.lattice.n,):
+                return ValueError(f"Ciphertext u must have length {self.lattice.n}")
+            if not isinstance(v, (int, np.integer)):
+                return TypeError("Ciphertext v must be an integer")
+        return None
+
+    def _encrypt_batch(self, payloads: List[bytes]) -> List[Any]:
+        results = [None] * len(payloads)
+        valid = []
+        for i, payload in enumerate(payloads):
+            if isinstance(payload, (bytes, bytearray)):
+                valid.append(i)
+            else:
+                results[i] = TypeError("Encrypt payload must be bytes")
+
+        ciphertexts = self.lattice.encrypt_bytes(
+            b"".join(payloads[i] for i in valid), self.public_key
+        )
+        start = 0
+        for i in valid:
+            end = start + 8 * len(payloads[i])
+            results[i] = ciphertexts[start:end]
+            start = end
+        return results
+
+    def _decrypt_batch(self, payloads: List[list]) -> List[Any]:
+        results = [None] * len(payloads)
+        valid = []
+        for i, ciphertexts in enumerate(payloads):
+            error = self._check_ciphertexts(ciphertexts)
+            if error is None:
+                valid.append(i)
+            else:
+                results[i] = error
+
+        joined = [ct for i in valid for ct in payloads[i]]
+        plaintext = self.lattice.decrypt_bytes(joined, self.private_key)
+        start = 0
+        for i in valid:
+            end = start + len(payloads[i]) // 8
+            results[i] = plaintext[start:end]
+            start = end
+        return results
+
+    def _sign_batch(self, payloads: List[bytes]) -> List[Any]:
+        return [self._isolated(self._sign_one, message) for message in payloads]
+
+    def _verify_batch(self, payloads: List[Tuple[bytes, dict]]) -> List[Any]:
+        return [self._isolated(self._verify_one, payload) for payload in payloads]
+
+    def _sign_one(self, message: bytes) -> dict:
+        if not isinstance(message, (bytes, bytearray)):
+            raise TypeError("Sign payload must be bytes")
+        return self.signer.sign(message, self.signing_key)
+
+    def _verify_one(self, payload: Tuple[bytes, dict]) -> bool:
+        message, signature = payload
+        if not isinstance(message, (bytes, bytearray)) or not isinstance(signature, dict):
+            raise TypeError("Verify payload must be (bytes, signature dict)")
+        return self.signer.verify(message, signature, self.verify_key)
+
+    @staticmethod
+    def _isolated(func, payload: Any) -> Any:
+        """Result of func(payload), or the exception it raised."""
+        try:
+            return func(payload)
+        except Exception as exc:
+            return exc
+
+    def _run_batch(self, op: str, payloads: list) -> List[Any]:
+        """
+        Run one operation's group; if the batched call still fails, retry each
+        request on its own so one bad request only fails its own future.
+        """
+        batch = getattr(self, f"_{op}_batch")
+        try:
+            return batch(payloads)
+        except Exception as exc:
+            if len(payloads) == 1:
+                return [exc]
+        return [self._isolated(lambda payload: batch([payload])[0], p) for p in payloads]
+
+    async def start(self):
+        """Start the batcher (called by serve(); needed for in-process use)."""
+        if self._batcher is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        """Stop the server and batcher; queued requests fail."""
+        if self._server is not None:
+            # Stop accepting, then end open connections once their reader sees EOF
+            self._server.close()
+            for writer in list(self._connections.values()):
+                writer.transport.abort()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+            futures = [future for _, _, future in self._inflight]
+            while not self._queue.empty():
+                futures.append(self._queue.get_nowait()[2])
+            for future in futures:
+                if not future.done():
+                    future.set_exception(RuntimeError("Service stopped"))
+            self._inflight = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def submit(self, op: str, payload: Any, wait: bool = True) -> Any:
+        """
+        Queue one request and wait for its result.
+
+        Args:
+            op: "encrypt" (bytes), "decrypt" (ciphertext list), "sign" (bytes)
+                or "verify" ((message, signature))
+            payload: Operation input
+            wait: Wait for queue space instead of raising ServiceOverloaded
+
+        Returns:
+            Ciphertext list, plaintext bytes, signature dict or validity bool
+        """
+        future = await self._enqueue(op, payload, wait)
+        return await future
+
+    async def _enqueue(self, op: str, payload: Any, wait: bool = True) -> asyncio.Future:
+        """Queue one request; returns once it is queued, with the future of its result."""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op}")
+        if self._batcher is None:
+            raise RuntimeError("Service is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        if wait:
+            await self._queue.put((op, payload, future))
+        else:
+            try:
+                self._queue.put_nowait((op, payload, future))
+            except asyncio.QueueFull:
+                self._stats["rejected"] += 1
+                raise ServiceOverloaded("Request queue is full") from None
+
+        self._stats["requests"] += 1
+        return future
+
+    async def _collect(self) -> list:
+        """Wait for one request, then gather more until the size or time window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_batch_delay
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._inflight = await self._collect()
+
+            groups = defaultdict(list)
+            for op, payload, future in batch:
+                groups[op].append((payload, future))
+
+            for op, items in groups.items():
+                self._stats["batches"] += 1
+                payloads = [payload for payload, _ in items]
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, self._run_batch, op, payloads
+                    )
+                except Exception as exc:
+                    results = [exc] * len(items)
+
+                for (_, future), result in zip(items, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        self._stats["errors"] += 1
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+    def stats(self) -> dict:
+        """Request, batch and error counts."""
+        stats = dict(self._stats)
+        stats["mean_batch_size"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats["queued"] = self._queue.qsize() if self._queue is not None else 0
+        return stats
+
+    def _decode_request(self, request: dict) -> Tuple[str, Any]:
+        op = request.get("op")
+        if op == "encrypt" or op == "sign":
+            return op, base64.b64decode(request["data"])
+        if op == "decrypt":
+            return op, [(np.asarray(u, dtype=np.int64), int(v)) for u, v in request["ciphertexts"]]
+        if op == "verify":
+            signature = decode_signature(request["signature"])
+            return op, (base64.b64decode(request["data"]), signature)
+        raise ValueError(f"Unknown operation: {op}")
+
+    @staticmethod
+    def _encode_result(op: str, result: Any) -> dict:
+        if op == "encrypt":
+            return {"ciphertexts": [[u.tolist(), int(v)] for u, v in result]}
+        if op == "decrypt":
+            return {"data": base64.b64encode(result).decode()}
+        if op == "sign":
+            return {"signature": encode_signature(result)}
+        return {"valid": bool(result)}
+
+    async def _respond(
+        self,
+        request_id: Any,
+        op: Optional[str],
+        future: Optional[asyncio.Future],
+        error: Optional[str],
+        writer: asyncio.StreamWriter,
+        lock: asyncio.Lock,
+    ):
+        response = {"id": request_id}
+        if future is None:
+            response["error"] = error
+        else:
+            try:
+                response.update(self._encode_result(op, await future))
+            except Exception as exc:
+                response["error"] = f"{type(exc).__name__}: {exc}"
+
+        async with lock:
+            if writer.is_closing():
+                return
+            writer.write((json.dumps(response) + "\n").encode())
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        One connection. Reading waits for queue space, so a full queue stops
+        consuming the socket; responses are written as they complete, tagged by id.
+        """
+        lock = asyncio.Lock()
+        pending = set()
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                request_id = op = future = error = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    op, payload = self._decode_request(request)
+                    future = await self._enqueue(op, payload)
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+
+                task = asyncio.create_task(
+                    self._respond(request_id, op, future, error, writer, lock)
+                )
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Listen on a Unix socket (path) or localhost TCP port.
+
+        Returns:
+            The asyncio server (port 0 picks a free port; see server.sockets)
+        """
+        await self.start()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+
+async def _serve_forever(args):
+    service = CryptoService(
+        max_batch_size=args.batch_size,
+        max_batch_delay=args.batch_delay_ms / 1000,
+        max_queue=args.queue_size,
+    )
+    server = await service.serve(args.host, args.port, args.unix)
+    address = args.unix or "%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"Crypto service listening on {address}")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Micro-batching crypto service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-delay-ms", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
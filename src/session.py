@@ -0,0 +1,260 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .hash_signatures import HashBasedSignature
+from .lattice_crypto import LatticeEncryption
+from .quantum_keygen import QuantumKeyDistribution, SecurityError
+
+# Fields HashBasedSignature.verify reads; the MAC does not cover the signature
+_SIGNATURE_FIELDS = ("signature_elements", "public_key_elements", "message_hash")
+
+
+class SecureSession:
+    """
+    Secure-messaging session with one peer.
+
+    Keys are established once (a QKD shared key, a lattice key pair and a
+    signature key pair) and reused for every message until a rekey limit on
+    message count, byte volume or age is reached. Each message is lattice
+    encrypted, signed, and authenticated with an HMAC keyed by the QKD key
+    over the epoch and sequence number, which also rejects replays.
+    """
+
+    def __init__(
+        self,
+        peer_id: str,
+        lattice: Optional[LatticeEncryption] = None,
+        signer: Optional[HashBasedSignature] = None,
+        qkd: Optional[QuantumKeyDistribution] = None,
+        max_messages: int = 10000,
+        max_bytes: int = 1 << 24,
+        max_age: float = 3600.0,
+        sign_messages: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize session (keys are established on first use).
+
+        Args:
+            peer_id: Identifier of the remote party
+            lattice: Encryption scheme (default parameters if None)
+            signer: Signature scheme (default parameters if None)
+            qkd: Key exchange used for the session MAC key
+            max_messages: Messages sent before rekeying
+            max_bytes: Plaintext bytes sent before rekeying
+            max_age: Seconds before rekeying
+            sign_messages: Attach a hash-based signature to every message
+            clock: Time source for the age limit
+        """
+        self.peer_id = peer_id
+        self.lattice = lattice if lattice is not None else LatticeEncryption()
+        self.signer = signer if signer is not None else HashBasedSignature()
+        self.qkd = qkd if qkd is not None else QuantumKeyDistribution(key_length=256)
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sign_messages = sign_messages
+        self.clock = clock
+
+        self.epoch = 0
+        self._keys = None
+        self._lock = threading.Lock()
+        self._stats = {"messages_sent": 0, "messages_received": 0, "bytes_sent": 0, "rekeys": 0}
+
+    def establish(self):
+        """Run the key exchange and generate fresh key pairs (a new epoch)."""
+        shared_key, _ = self.qkd.generate_shared_key(packed=True)
+        public_key, private_key = self.lattice.generate_keypair()
+        verify_key, signing_key = self.signer.generate_keypair()
+
+        self.epoch += 1
+        self._keys = {
+            # Keyed HMAC state is computed once and copied per message
+            "mac": hmac.new(shared_key.to_bytes(), digestmod=hashlib.sha256),
+            "public_key": public_key,
+            "private_key": private_key,
+            "verify_key": verify_key,
+            "signing_key": signing_key,
+            "established_at": self.clock(),
+            "messages": 0,
+            "bytes": 0,
+            "next_send": 0,
+            "next_receive": 0,
+        }
+        self._stats["rekeys"] += 1
+
+    @property
+    def established(self) -> bool:
+        return self._keys is not None
+
+    def needs_rekey(self) -> bool:
+        """Whether the current keys have reached a rekey limit (or do not exist)."""
+        keys = self._keys
+        if keys is None:
+            return True
+        return (
+            keys["messages"] >= self.max_messages
+            or keys["bytes"] >= self.max_bytes
+            or self.clock() - keys["established_at"] >= self.max_age
+        )
+
+    def _mac(self, epoch: int, sequence: int, ciphertexts: list) -> bytes:
+        mac = self._keys["mac"].copy()
+        mac.update(epoch.to_bytes(8, "big") + sequence.to_bytes(8, "big"))
+        for u, v in ciphertexts:
+            mac.update(u.tobytes())
+            mac.update(int(v).to_bytes(8, "big"))
+        return mac.digest()
+
+    def send(self, message: bytes) -> dict:
+        """
+        Protect one message, rekeying first if a limit was reached.
+
+        Returns:
+            Envelope with epoch, sequence, ciphertexts, mac and signature
+        """
+        with self._lock:
+            if self.needs_rekey():
+                self.establish()
+            keys = self._keys
+
+            sequence = keys["next_send"]
+            keys["next_send"] += 1
+            keys["messages"] += 1
+            keys["bytes"] += len(message)
+            self._stats["messages_sent"] += 1
+            self._stats["bytes_sent"] += len(message)
+
+            ciphertexts = self.lattice.encrypt_bytes(message, keys["public_key"])
+            envelope = {
+                "peer_id": self.peer_id,
+                "epoch": self.epoch,
+                "sequence": sequence,
+                "ciphertexts": ciphertexts,
+                "mac": self._mac(self.epoch, sequence, ciphertexts),
+                "signature": None,
+            }
+            if self.sign_messages:
+                envelope["signature"] = self.signer.sign(message, keys["signing_key"])
+
+            return envelope
+
+    def receive(self, envelope: dict) -> bytes:
+        """
+        Authenticate and decrypt an envelope produced by send().
+
+        Raises:
+            SecurityError: On a stale epoch, replayed or reordered sequence,
+                bad MAC or bad signature
+
+        Returns:
+            Plaintext message
+        """
+        with self._lock:
+            keys = self._keys
+            if keys is None or envelope["epoch"] != self.epoch:
+                raise SecurityError("Message belongs to a different session epoch")
+            if envelope["sequence"] < keys["next_receive"]:
+                raise SecurityError(f"Replayed message (sequence {envelope['sequence']})")
+
+            expected = self._mac(envelope["epoch"], envelope["sequence"], envelope["ciphertexts"])
+            if not hmac.compare_digest(expected, envelope["mac"]):
+                raise SecurityError("Message authentication failed")
+
+            message = self.lattice.decrypt_bytes(envelope["ciphertexts"], keys["private_key"])
+
+            if self.sign_messages:
+                signature = envelope.get("signature")
+                if (
+                    not isinstance(signature, dict)
+                    or not all(field in signature for field in _SIGNATURE_FIELDS)
+                    or not self.signer.verify(message, signature, keys["verify_key"])
+                ):
+                    raise SecurityError("Signature verification failed")
+
+            keys["next_receive"] = envelope["sequence"] + 1
+            self._stats["messages_received"] += 1
+            return message
+
+    def close(self):
+        """Drop all key material."""
+        with self._lock:
+            self._keys = None
+
+    def stats(self) -> dict:
+        """Message, byte and rekey counts."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["epoch"] = self.epoch
+            keys = self._keys
+            stats["age_s"] = self.clock() - keys["established_at"] if keys is not None else 0.0
+            return stats
+
+
+class SessionCache:
+    """
+    Bounded cache of sessions keyed by peer, evicting the least recently used.
+    """
+
+    def __init__(self, max_sessions: int = 128, **session_kwargs):
+        """
+        Initialize cache.
+
+        Args:
+            max_sessions: Sessions kept before the least recently used is closed
+            **session_kwargs: Arguments forwarded to SecureSession
+        """
+        if max_sessions < 1:
+            raise ValueError("Cache must hold at least one session")
+
+        self.max_sessions = max_sessions
+        self.session_kwargs = session_kwargs
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, peer_id: str) -> SecureSession:
+        """Session for a peer, created on first use."""
+        evicted = []
+        with self._lock:
+            session = self._sessions.get(peer_id)
+            if session is not None:
+                self._stats["hits"] += 1
+                self._sessions.move_to_end(peer_id)
+                return session
+
+            self._stats["misses"] += 1
+            session = SecureSession(peer_id, **self.session_kwargs)
+            self._sessions[peer_id] = session
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[1])
+                self._stats["evictions"] += 1
+
+        # Closing waits for any in-flight send/receive, so it happens outside the cache lock
+        for old in evicted:
+            old.close()
+        return session
+
+    def remove(self, peer_id: str):
+        """Close and forget a peer's session."""
+        with self._lock:
+            session = self._sessions.pop(peer_id, None)
+        if session is not None:
+            session.close()
+
+    def __contains__(self, peer_id: str) -> bool:
+        return peer_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        """Hits, misses, evictions and occupancy."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sessions"] = len(self._sessions)
+            return stats
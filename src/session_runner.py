@@ -0,0 +1,126 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .quantum_keygen import QuantumKeyDistribution, SecurityError
+
+
+def _run_session(session_id: int, seed: int, qkd_kwargs: dict) -> dict:
+    """Execute one QKD session with its own seeded generator."""
+    qkd = QuantumKeyDistribution(rng=random.Random(seed), **qkd_kwargs)
+
+    start = time.perf_counter()
+    try:
+        key, stats = qkd.generate_shared_key(packed=True)
+        error = None
+    except SecurityError as exc:
+        key, stats, error = None, {}, str(exc)
+
+    return {
+        "session_id": session_id,
+        "seed": seed,
+        "key": key,
+        "stats": stats,
+        "error": error,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+class MultiSessionRunner:
+    """
+    Run many independent QKD sessions across a process pool.
+    Every session gets a generator seeded from the master seed, so any
+    session can be replayed bit-for-bit on its own.
+    """
+
+    def __init__(
+        self, master_seed: Optional[int] = None, workers: Optional[int] = None, **qkd_kwargs
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            master_seed: Seed all session seeds derive from (random if None)
+            workers: Process pool size (1 runs sessions in-process)
+            **qkd_kwargs: Arguments forwarded to QuantumKeyDistribution
+        """
+        self._seed_sequence = np.random.SeedSequence(master_seed)
+        self.master_seed = self._seed_sequence.entropy
+        self.workers = workers
+        self.qkd_kwargs = qkd_kwargs
+        self._reset_summary()
+
+    def _reset_summary(self):
+        self._summary = {
+            "sessions": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "key_bits": 0,
+            "session_time_s": 0.0,
+            "wall_time_s": 0.0,
+        }
+
+    def session_seed(self, session_id: int) -> int:
+        """Seed of a session, derived from the master seed and session id."""
+        child = np.random.SeedSequence(self.master_seed, spawn_key=(session_id,))
+        return int(child.generate_state(1, dtype=np.uint64)[0])
+
+    def run(self, sessions: Iterable[int]) -> Iterator[dict]:
+        """
+        Execute sessions, yielding each result as soon as it completes.
+
+        Args:
+            sessions: Number of sessions, or an iterable of session ids
+
+        Yields:
+            Per-session result dictionaries (completion order)
+        """
+        session_ids = range(sessions) if isinstance(sessions, int) else list(sessions)
+        self._reset_summary()
+        start = time.perf_counter()
+
+        if self.workers == 1:
+            for session_id in session_ids:
+                yield self._record(
+                    _run_session(session_id, self.session_seed(session_id), self.qkd_kwargs), start
+                )
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    _run_session, session_id, self.session_seed(session_id), self.qkd_kwargs
+                )
+                for session_id in session_ids
+            ]
+            for future in as_completed(futures):
+                yield self._record(future.result(), start)
+
+    def _record(self, result: dict, start: float) -> dict:
+        """Fold one result into the running summary."""
+        summary = self._summary
+        summary["sessions"] += 1
+        if result["error"] is None:
+            summary["succeeded"] += 1
+            summary["key_bits"] += len(result["key"])
+        else:
+            summary["failed"] += 1
+        summary["session_time_s"] += result["elapsed_s"]
+        summary["wall_time_s"] = time.perf_counter() - start
+        return result
+
+    def summary(self) -> dict:
+        """Aggregate statistics of the sessions completed so far."""
+        summary = dict(self._summary)
+        wall = summary["wall_time_s"]
+        summary["sessions_per_s"] = summary["sessions"] / wall if wall else 0.0
+        summary["key_bits_per_s"] = summary["key_bits"] / wall if wall else 0.0
+        summary["parallel_speedup"] = summary["session_time_s"] / wall if wall else 0.0
+        return summary
+
+    def replay(self, session_id: int) -> dict:
+        """Re-run a single session in-process with its original seed."""
+        return _run_session(session_id, self.session_seed(session_id), self.qkd_kwargs)
@@ -1,5 +1,26 @@
 """Utility functions for quantum cryptography."""
 
-from .benchmark import CryptoBenchmark
+import importlib
 
-__all__ = ["CryptoBenchmark"]
+# Imported on first access; the benchmark tools pull in every primitive
+_LAZY_IMPORTS = {
+    "CryptoBenchmark": ".benchmark",
+    "BenchmarkSuite": ".bench_suite",
+    "ScalingSweep": ".scaling",
+    "LoadGenerator": ".load_generator",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from ..hash_signatures import HashBasedSignature
+from ..lattice_crypto import LatticeEncryption
+from ..quantum_keygen import QuantumKeyDistribution
+from .benchmark import CryptoBenchmark
+
+DEFAULT_CONFIG = {
+    "qkd": {"key_length": 256, "sample_size": 50, "adaptive": False, "max_rounds": 8},
+    "lattice": {"dimension": 256, "modulus": 4093, "error_stddev": 3.2},
+    "signature": {"security_level": 256},
+    "benchmark": {"iterations": 10, "warmup_runs": 2},
+}
+
+
+def load_config(path: Optional[str] = None) -> dict:
+    """
+    Load benchmark settings, falling back to defaults for missing keys.
+
+    Args:
+        path: YAML file (defaults to ./config.yaml if it exists)
+    """
+    config = {section: dict(values) for section, values in DEFAULT_CONFIG.items()}
+    if path is None and os.path.exists("config.yaml"):
+        path = "config.yaml"
+    if path is not None:
+        with open(path) as f:
+            loaded = yaml.safe_load(f) or {}
+        for section, values in loaded.items():
+            config.setdefault(section, {}).update(values or {})
+    return config
+
+
+class BenchmarkSuite:
+    """Benchmark keygen, encrypt, decrypt, sign, verify and the QKD protocol."""
+
+    def __init__(
+        self, config: Optional[dict] = None, payload_size: int = 1024, memory: bool = False
+    ):
+        """
+        Initialize suite.
+
+        Args:
+            config: Settings in the config.yaml layout
+            payload_size: Bytes per encrypt/decrypt/sign/verify call
+            memory: Add a memory profile to every case
+        """
+        self.config = config if config is not None else load_config()
+        self.iterations = int(self.config["benchmark"]["iterations"])
+        self.warmup = int(self.config["benchmark"]["warmup_runs"])
+        self.payload_size = payload_size
+        self.memory = memory
+
+    def cases(self) -> Dict[str, Tuple[Callable, Optional[int], Optional[int]]]:
+        """
+        Benchmark cases keyed by name.
+
+        Returns:
+            Mapping of name to (operation, bytes_per_op, key_bits_per_op)
+        """
+        lattice_cfg = self.config["lattice"]
+        lattice = LatticeEncryption(
+            n=lattice_cfg["dimension"], q=lattice_cfg["modulus"], sigma=lattice_cfg["error_stddev"]
+        )
+        signer = HashBasedSignature(security_level=self.config["signature"]["security_level"])
+        qkd_cfg = self.config["qkd"]
+        qkd = QuantumKeyDistribution(
+            key_length=qkd_cfg["key_length"],
+            sample_size=qkd_cfg.get("sample_size", 50),
+            adaptive=qkd_cfg.get("adaptive", False),
+            max_rounds=qkd_cfg.get("max_rounds", 8),
+        )
+
+        payload = os.urandom(self.payload_size)
+        public_key, private_key = lattice.generate_keypair()
+        ciphertexts = lattice.encrypt_bytes(payload, public_key)
+        sig_public, sig_private = signer.generate_keypair()
+        signature = signer.sign(payload, sig_private)
+        key_bits = qkd.key_length
+        size = len(payload)
+
+        return {
+            "lattice.keygen": (lattice.generate_keypair, None, None),
+            "lattice.encrypt": (lambda: lattice.encrypt_bytes(payload, public_key), size, None),
+            "lattice.decrypt": (
+                lambda: lattice.decrypt_bytes(ciphertexts, private_key),
+                size,
+                None,
+            ),
+            "signature.keygen": (signer.generate_keypair, None, None),
+            "signature.sign": (lambda: signer.sign(payload, sig_private), size, None),
+            "signature.verify": (lambda: signer.verify(payload, signature, sig_public), size, None),
+            "qkd.generate_shared_key": (qkd.generate_shared_key, key_bits // 8, key_bits),
+        }
+
+    def run_case(
+        self,
+        func: Callable,
+        bytes_per_op: Optional[int] = None,
+        key_bits_per_op: Optional[int] = None,
+    ) -> dict:
+        """Time one operation with the configured warmup and iterations."""
+        times = CryptoBenchmark.repeat(func, iterations=self.iterations, warmup=self.warmup)
+        stats = CryptoBenchmark.summarize(times, bytes_per_op)
+        if self.memory:
+            stats.update(
+                CryptoBenchmark.profile_memory(
+                    func, bytes_per_op=bytes_per_op, key_bits_per_op=key_bits_per_op
+                )
+            )
+        return stats
+
+    def run(self, names: Optional[List[str]] = None) -> dict:
+        """
+        Run the selected cases (all by default).
+
+        Returns:
+            Report with metadata and per-case statistics
+        """
+        cases = self.cases()
+        unknown = set(names or []) - set(cases)
+        if unknown:
+            raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+
+        results = {}
+        for name in names or cases:
+            results[name] = self.run_case(*cases[name])
+
+        return {
+            "metadata": {
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "iterations": self.iterations,
+                "warmup": self.warmup,
+                "payload_size": self.payload_size,
+                "memory": self.memory,
+            },
+            "results": results,
+        }
+
+
+def compare(
+    report: dict, baseline: dict, threshold: float = 0.10, metric: str = "median_time_ms"
+) -> List[dict]:
+    """
+    Find cases whose metric grew by more than threshold against a baseline.
+
+    Returns:
+        List of regressions (empty if none)
+    """
+    regressions = []
+    for name, stats in report["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference or metric not in reference:
+            continue
+        change = stats[metric] / reference[metric] - 1 if reference[metric] else 0.0
+        if change > threshold:
+            regressions.append(
+                {
+                    "case": name,
+                    "metric": metric,
+                    "baseline": reference[metric],
+                    "current": stats[metric],
+                    "change": change,
+                }
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the quantum crypto toolkit")
+    parser.add_argument("--config", help="Path to config.yaml")
+    parser.add_argument("--iterations", type=int, help="Override benchmark.iterations")
+    parser.add_argument("--warmup", type=int, help="Override benchmark.warmup_runs")
+    parser.add_argument("--payload-size", type=int, default=1024, help="Bytes per operation")
+    parser.add_argument("--case", action="append", dest="cases", help="Run only this case")
+    parser.add_argument("--memory", action="store_true", help="Add tracemalloc/RSS profiles")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Baseline JSON report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed relative slowdown (default 0.10)"
+    )
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.iterations is not None:
+        config["benchmark"]["iterations"] = args.iterations
+    if args.warmup is not None:
+        config["benchmark"]["warmup_runs"] = args.warmup
+
+    suite = BenchmarkSuite(config, payload_size=args.payload_size, memory=args.memory)
+    report = suite.run(args.cases)
+
+    for name, stats in report["results"].items():
+        rate = f"{stats['mb_per_s']:.3f} MB/s" if "mb_per_s" in stats else ""
+        print(
+            f"{name:28s} median {stats['median_time_ms']:10.3f} ms  "
+            f"p95 {stats['p95_time_ms']:10.3f} ms  p99 {stats['p99_time_ms']:10.3f} ms  "
+            f"{stats['ops_per_s']:10.2f} ops/s  {rate}"
+        )
+        if "peak_bytes" in stats:
+            print(
+                f"{'':28s} peak {stats['peak_bytes'] / 1024:10.1f} KiB  "
+                f"retained {stats['retained_bytes'] / 1024:10.1f} KiB  "
+                f"blocks {stats['allocated_blocks']:10.0f}"
+            )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        report["regressions"] = regressions
+        for reg in regressions:
+            print(
+                f"REGRESSION {reg['case']}: {reg['metric']} {reg['baseline']:.3f} -> "
+                f"{reg['current']:.3f} ({reg['change']:+.1%})"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,81 @@
+import os
+import sys
+import threading
 import time
-from typing import Any, Callable, Dict, Tuple
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 
-import numpy as np
+from .lazy import LazyModule
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Imported on first use so `from src import CryptoBenchmark` does not load NumPy
+np = LazyModule("numpy")
+
+
+def read_rss() -> Optional[int]:
+    """
+    Resident set size of this process in bytes.
+
+    Reads /proc/self/statm where available; otherwise falls back to the peak
+    RSS reported by getrusage. Returns None if neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RSSSampler:
+    """Background thread recording the peak resident set size while active."""
+
+    def __init__(self, interval: float = 0.001):
+        """
+        Initialize sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.baseline_bytes = None
+        self.peak_bytes = None
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = read_rss()
+        if rss is not None:
+            self.samples += 1
+            self.peak_bytes = rss if self.peak_bytes is None else max(self.peak_bytes, rss)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.baseline_bytes = read_rss()
+        self.peak_bytes = self.baseline_bytes
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
 
 
 class CryptoBenchmark:
@@ -22,33 +96,177 @@ class CryptoBenchmark:
         return (end - start) * 1000, result
 
     @staticmethod
-    def benchmark_keygen(crypto_system) -> Dict:
-        """Benchmark key generation."""
-        times = []
+    def repeat(func: Callable, *args, iterations: int = 10, warmup: int = 0, **kwargs) -> list:
+        """
+        Time repeated calls after discarding warmup runs.
+
+        Returns:
+            List of execution times in ms
+        """
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        return [CryptoBenchmark.measure_time(func, *args, **kwargs)[0] for _ in range(iterations)]
+
+    @staticmethod
+    def summarize(times: Sequence[float], bytes_per_op: Optional[int] = None) -> Dict:
+        """
+        Summary statistics of a list of timings.
 
-        for _ in range(10):
-            exec_time, _ = CryptoBenchmark.measure_time(crypto_system.generate_keypair)
-            times.append(exec_time)
+        Args:
+            times: Execution times in ms
+            bytes_per_op: Payload processed per call (adds MB/s)
+
+        Returns:
+            Dictionary of timing statistics
+        """
+        times = np.asarray(times, dtype=float)
+        mean = float(np.mean(times))
+        half_width = (
+            1.96 * float(np.std(times, ddof=1)) / np.sqrt(times.size) if times.size > 1 else 0.0
+        )
+        median = float(np.median(times))
+
+        stats = {
+            "iterations": int(times.size),
+            "mean_time_ms": mean,
+            "std_time_ms": float(np.std(times)),
+            "min_time_ms": float(np.min(times)),
+            "max_time_ms": float(np.max(times)),
+            "median_time_ms": median,
+            "p95_time_ms": float(np.percentile(times, 95)),
+            "p99_time_ms": float(np.percentile(times, 99)),
+            "ci95_low_ms": mean - half_width,
+            "ci95_high_ms": mean + half_width,
+            "ops_per_s": 1000 / median if median else float("inf"),
+        }
+        if bytes_per_op is not None:
+            stats["mb_per_s"] = bytes_per_op / (median / 1000) / 1e6 if median else float("inf")
 
-        return {
+        return stats
+
+    @staticmethod
+    def measure_memory(func: Callable, *args, **kwargs) -> Tuple[Dict, Any]:
+        """
+        Trace the Python heap during one call.
+
+        The result is kept alive until after the final snapshot, so memory it
+        holds (e.g. a list of ciphertexts) counts as retained.
+
+        Returns:
+            (memory_stats, result) where memory_stats has peak_bytes (transient peak
+            above the starting heap), retained_bytes and allocated_blocks (blocks
+            created by the call and still alive when it returns)
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+            result = func(*args, **kwargs)
+
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        blocks = sum(max(diff.count_diff, 0) for diff in after.compare_to(before, "lineno"))
+        stats = {
+            "peak_bytes": peak - start_bytes,
+            "retained_bytes": current - start_bytes,
+            "allocated_blocks": blocks,
+        }
+        return stats, result
+
+    @staticmethod
+    def profile_memory(
+        func: Callable,
+        *args,
+        iterations: int = 3,
+        bytes_per_op: Optional[int] = None,
+        key_bits_per_op: Optional[int] = None,
+        rss: bool = True,
+        **kwargs,
+    ) -> Dict:
+        """
+        Memory profile over repeated calls.
+
+        Args:
+            func: Operation to profile
+            iterations: Traced calls
+            bytes_per_op: Plaintext bytes per call (adds peak_bytes_per_byte)
+            key_bits_per_op: Key bits per call (adds peak_bytes_per_key_bit)
+            rss: Also sample the resident set size in a background thread
+
+        Returns:
+            Dictionary of memory statistics
+        """
+        runs = [CryptoBenchmark.measure_memory(func, *args, **kwargs)[0] for _ in range(iterations)]
+        peak = max(run["peak_bytes"] for run in runs)
+
+        stats = {
+            "peak_bytes": peak,
+            "mean_peak_bytes": sum(run["peak_bytes"] for run in runs) / len(runs),
+            "retained_bytes": sum(run["retained_bytes"] for run in runs) / len(runs),
+            "allocated_blocks": sum(run["allocated_blocks"] for run in runs) / len(runs),
+        }
+        if bytes_per_op:
+            stats["peak_bytes_per_byte"] = peak / bytes_per_op
+        if key_bits_per_op:
+            stats["peak_bytes_per_key_bit"] = peak / key_bits_per_op
+
+        if rss:
+            # Untraced call: tracemalloc itself inflates the resident set
+            with RSSSampler() as sampler:
+                func(*args, **kwargs)
+            if sampler.baseline_bytes is not None:
+                stats["rss_peak_bytes"] = sampler.peak_bytes
+                stats["rss_growth_bytes"] = sampler.peak_bytes - sampler.baseline_bytes
+
+        return stats
+
+    @staticmethod
+    def benchmark_keygen(
+        crypto_system, iterations: int = 10, warmup: int = 0, memory: bool = False
+    ) -> Dict:
+        """Benchmark key generation (memory=True adds a memory profile)."""
+        times = CryptoBenchmark.repeat(
+            crypto_system.generate_keypair, iterations=iterations, warmup=warmup
+        )
+
+        stats = {
             "mean_time_ms": np.mean(times),
             "std_time_ms": np.std(times),
             "min_time_ms": np.min(times),
             "max_time_ms": np.max(times),
         }
+        if memory:
+            stats.update(CryptoBenchmark.profile_memory(crypto_system.generate_keypair))
 
-    @staticmethod
-    def benchmark_encryption(crypto_system, public_key, data) -> Dict:
-        """Benchmark encryption operation."""
-        times = []
+        return stats
 
-        for _ in range(10):
-            exec_time, _ = CryptoBenchmark.measure_time(crypto_system.encrypt, data, public_key)
-            times.append(exec_time)
+    @staticmethod
+    def benchmark_encryption(
+        crypto_system, public_key, data, iterations: int = 10, warmup: int = 0, memory: bool = False
+    ) -> Dict:
+        """Benchmark encryption operation (memory=True adds a memory profile)."""
+        encrypt = crypto_system.encrypt_bytes if isinstance(data, bytes) else crypto_system.encrypt
+        times = CryptoBenchmark.repeat(
+            encrypt, data, public_key, iterations=iterations, warmup=warmup
+        )
+        size = len(data) if hasattr(data, "__len__") else 1
 
-        return {
+        stats = {
             "mean_time_ms": np.mean(times),
-            "throughput_kb_s": (len(data) if hasattr(data, "__len__") else 1)
-            / (np.mean(times) / 1000)
-            / 1024,
+            "throughput_kb_s": size / (np.mean(times) / 1000) / 1024,
         }
+        if memory:
+            stats.update(
+                CryptoBenchmark.profile_memory(encrypt, data, public_key, bytes_per_op=size)
+            )
+
+        return stats
@@ -0,0 +1,115 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(output: str) -> List[dict]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Args:
+        output: Captured stderr
+
+    Returns:
+        One entry per imported module with self_us, cumulative_us and depth
+        (nesting level), in the order the interpreter reported them
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append(
+            {
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(indent) - 1) // 2,
+            }
+        )
+    return entries
+
+
+def measure_import(statement: str, runs: int = 5, top: int = 10) -> dict:
+    """
+    Cold-start cost of an import statement, each run in a fresh interpreter.
+
+    Args:
+        statement: Python code to time, e.g. "from src import QuantumKeyDistribution"
+        runs: Fresh interpreters to start
+        top: Heaviest modules (by cumulative time) to report from the median run
+
+    Returns:
+        Dictionary with median wall and import times, the module breakdown and
+        whether NumPy was loaded
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        entries = parse_importtime(completed.stderr)
+        import_us = sum(entry["cumulative_us"] for entry in entries if entry["depth"] == 0)
+        samples.append((import_us, wall_ms, entries))
+
+    samples.sort(key=lambda sample: sample[0])
+    _, _, entries = samples[len(samples) // 2]
+    heaviest = sorted(entries, key=lambda entry: entry["cumulative_us"], reverse=True)[:top]
+
+    return {
+        "statement": statement,
+        "runs": runs,
+        "import_ms": statistics.median(sample[0] for sample in samples) / 1000,
+        "wall_ms": statistics.median(sample[1] for sample in samples),
+        "modules_loaded": len(entries),
+        "numpy_loaded": any(entry["module"] == "numpy" for entry in entries),
+        "heaviest": heaviest,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument(
+        "statements",
+        nargs="*",
+        default=[
+            "import src",
+            "from src import QuantumKeyDistribution",
+            "from src import LatticeEncryption",
+            "from src import HashBasedSignature",
+            "from src import CryptoBenchmark",
+        ],
+        help="Import statements to time",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per statement")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest modules to list")
+    args = parser.parse_args(argv)
+
+    for statement in args.statements:
+        report = measure_import(statement, args.runs, args.top)
+        print(
+            f"{statement:45s} import {report['import_ms']:8.2f} ms  "
+            f"process {report['wall_ms']:8.2f} ms  modules {report['modules_loaded']:4d}  "
+            f"numpy {'yes' if report['numpy_loaded'] else 'no'}"
+        )
+        for entry in report["heaviest"]:
+            print(f"    {entry['cumulative_us'] / 1000:8.2f} ms  {entry['module']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Lets a module bind a heavy dependency at the top (np = LazyModule("numpy"))
+    without paying its import cost until a function actually uses it.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize proxy.
+
+        Args:
+            name: Absolute name of the module to import
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, attr: str):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
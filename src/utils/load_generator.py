@@ -0,0 +1,248 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .benchmark import CryptoBenchmark
+from .scaling import BASE_PARAMS, CASES
+
+
+def detect_global_rng(func: Callable, *args, **kwargs) -> Dict[str, bool]:
+    """
+    Check whether a call draws from the process-global generators.
+
+    Shared global state (random module, legacy np.random) is not safe to use
+    from concurrent workers and is not reproducible across processes.
+
+    Returns:
+        Dictionary mapping "random" and "numpy" to whether their state changed
+    """
+    py_state = random.getstate()
+    np_state = np.random.get_state()
+
+    func(*args, **kwargs)
+
+    np_after = np.random.get_state()
+    return {
+        "random": random.getstate() != py_state,
+        "numpy": not (np.array_equal(np_state[1], np_after[1]) and np_state[2] == np_after[2]),
+    }
+
+
+def latency_histogram(latencies: Sequence[float], bins: int = 20) -> dict:
+    """
+    Log-spaced latency histogram.
+
+    Returns:
+        Dictionary with bin edges in ms and counts per bin
+    """
+    latencies = np.asarray(latencies, dtype=float)
+    if latencies.size == 0:
+        return {"edges_ms": [], "counts": []}
+    low, high = max(latencies.min(), 1e-6), max(latencies.max(), 1e-6)
+    edges = np.geomspace(low, high * (1 + 1e-9), bins + 1) if high > low else [low, low * 2]
+    counts, edges = np.histogram(latencies, bins=edges)
+    return {"edges_ms": [float(e) for e in edges], "counts": [int(c) for c in counts]}
+
+
+def _drive(operation: Callable, requests: int, interval: Optional[float]) -> dict:
+    """
+    Issue requests against one operation.
+
+    Closed loop (interval None) sends the next request as soon as the previous
+    returns. Open loop schedules request i at start + i * interval and measures
+    latency from the scheduled time, so queueing delay is not hidden.
+    """
+    latencies = []
+    errors = 0
+    # Scheduling and latency use the monotonic clock; the wall-clock bounds are
+    # only reported so runs in different processes can be compared
+    wall_start = time.time()
+    start = time.perf_counter()
+    for i in range(requests):
+        issued = time.perf_counter()
+        if interval is not None:
+            # Latency counts from the scheduled time, even when it already passed
+            issued = start + i * interval
+            delay = issued - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        try:
+            operation()
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - issued) * 1000)
+
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "start": wall_start,
+        "end": wall_start + time.perf_counter() - start,
+    }
+
+
+def _process_worker(case: str, params: dict, requests: int, interval: Optional[float]) -> dict:
+    """Process-pool entry point: build a private operation, then drive it."""
+    return _drive(CASES[case](params), requests, interval)
+
+
+class LoadGenerator:
+    """
+    Drive a primitive from concurrent threads or processes and measure
+    throughput, latency and scaling efficiency per worker count.
+    """
+
+    def __init__(
+        self,
+        case: str,
+        mode: str = "thread",
+        requests: int = 50,
+        rate: Optional[float] = None,
+        shared: bool = True,
+        params: Optional[dict] = None,
+    ):
+        """
+        Initialize load generator.
+
+        Args:
+            case: Operation to drive (see src.utils.scaling.CASES)
+            mode: "thread" or "process"
+            requests: Requests issued by each worker
+            rate: Total open-loop request rate per second (None for closed loop)
+            shared: Threads share one primitive instance instead of one each
+            params: Overrides of the primitive parameters
+        """
+        if case not in CASES:
+            raise ValueError(f"Unknown case: {case}")
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if requests < 1:
+            raise ValueError("Each worker must issue at least one request")
+
+        self.case = case
+        self.mode = mode
+        self.requests = requests
+        self.rate = rate
+        self.shared = shared
+        self.params = dict(BASE_PARAMS, **(params or {}))
+
+    def run_point(self, workers: int) -> dict:
+        """
+        Run the load with a fixed number of workers.
+
+        Returns:
+            Dictionary with throughput, latency statistics and histogram
+        """
+        interval = workers / self.rate if self.rate else None
+
+        if self.mode == "process":
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _process_worker, self.case, self.params, self.requests, interval
+                    )
+                    for _ in range(workers)
+                ]
+                runs = [future.result() for future in futures]
+        else:
+            build = CASES[self.case]
+            if self.shared:
+                operation = build(self.params)
+                operations = [operation] * workers
+            else:
+                operations = [build(self.params) for _ in range(workers)]
+            barrier = threading.Barrier(workers)
+
+            def worker(operation):
+                barrier.wait()
+                return _drive(operation, self.requests, interval)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                runs = list(executor.map(worker, operations))
+
+        latencies = [latency for run in runs for latency in run["latencies"]]
+        elapsed = max(run["end"] for run in runs) - min(run["start"] for run in runs)
+        completed = len(latencies)
+
+        result = {
+            "workers": workers,
+            "requests": completed,
+            "errors": sum(run["errors"] for run in runs),
+            "elapsed_s": elapsed,
+            "throughput_rps": completed / elapsed if elapsed else float("inf"),
+            "histogram": latency_histogram(latencies),
+        }
+        result.update(CryptoBenchmark.summarize(latencies))
+        return result
+
+    def run(self, worker_counts: Sequence[int] = (1, 2, 4)) -> dict:
+        """
+        Run the load for each worker count.
+
+        Scaling efficiency is throughput per worker relative to the first
+        (smallest) worker count: 1.0 means perfectly linear scaling.
+
+        Returns:
+            Report with metadata, the global-RNG check and per-count results
+        """
+        points = [self.run_point(workers) for workers in worker_counts]
+        base = points[0]["throughput_rps"] / points[0]["workers"]
+        for point in points:
+            point["scaling_efficiency"] = point["throughput_rps"] / point["workers"] / base
+
+        return {
+            "metadata": {
+                "case": self.case,
+                "mode": self.mode,
+                "requests_per_worker": self.requests,
+                "rate": self.rate,
+                "shared": self.shared,
+                "cpu_count": os.cpu_count(),
+                "blas_threads": {
+                    var: os.environ.get(var)
+                    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+                },
+            },
+            "global_rng": detect_global_rng(CASES[self.case](self.params)),
+            "results": points,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Concurrent load against a primitive")
+    parser.add_argument("--case", default="lattice.encrypt_bytes", choices=sorted(CASES))
+    parser.add_argument("--mode", default="thread", choices=["thread", "process"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per worker")
+    parser.add_argument("--rate", type=float, help="Open-loop total requests per second")
+    parser.add_argument("--private", action="store_true", help="One primitive instance per thread")
+    args = parser.parse_args(argv)
+
+    generator = LoadGenerator(
+        args.case, args.mode, args.requests, args.rate, shared=not args.private
+    )
+    report = generator.run(args.workers)
+
+    rng = report["global_rng"]
+    if rng["random"] or rng["numpy"]:
+        print(f"WARNING: {args.case} uses global RNG state: {rng}")
+
+    for point in report["results"]:
+        print(
+            f"workers {point['workers']:3d}  {point['throughput_rps']:10.1f} req/s  "
+            f"p50 {point['median_time_ms']:9.3f} ms  p99 {point['p99_time_ms']:9.3f} ms  "
+            f"efficiency {point['scaling_efficiency']:.2f}  errors {point['errors']}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
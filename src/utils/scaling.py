@@ -0,0 +1,275 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..entropy import DeterministicEntropy
+from ..hash_signatures import HashBasedSignature
+from ..lattice_crypto import LatticeEncryption
+from ..quantum_keygen import QuantumKeyDistribution
+from .benchmark import CryptoBenchmark
+
+# Fixed parameters for the dimensions that are not being swept
+BASE_PARAMS = {
+    "n": 128,
+    "q": 4093,
+    "payload": 64,
+    "key_length": 256,
+    "security_level": 256,
+}
+
+# (case, parameter) -> values swept by default
+DEFAULT_GRID = {
+    ("lattice.keygen", "n"): [32, 64, 128, 256, 512],
+    ("lattice.keygen", "q"): [521, 4093, 32749, 65521],
+    ("lattice.encrypt_bytes", "n"): [32, 64, 128, 256],
+    ("lattice.encrypt_bytes", "payload"): [16, 64, 256, 1024],
+    ("qkd.generate_shared_key", "key_length"): [64, 128, 256, 512, 1024],
+    ("signature.sign", "security_level"): [128, 192, 256],
+}
+
+
+def _lattice(params: dict) -> LatticeEncryption:
+    return LatticeEncryption(n=params["n"], q=params["q"], entropy=DeterministicEntropy(0))
+
+
+def _lattice_keygen(params: dict) -> Callable:
+    return _lattice(params).generate_keypair
+
+
+def _lattice_encrypt_bytes(params: dict) -> Callable:
+    lattice = _lattice(params)
+    public_key, _ = lattice.generate_keypair()
+    payload = bytes(params["payload"])
+    return lambda: lattice.encrypt_bytes(payload, public_key)
+
+
+def _qkd_generate(params: dict) -> Callable:
+    return QuantumKeyDistribution(key_length=params["key_length"]).generate_shared_key
+
+
+def _signature_sign(params: dict) -> Callable:
+    signer = HashBasedSignature(security_level=params["security_level"])
+    _, private_key = signer.generate_keypair()
+    payload = bytes(params["payload"])
+    return lambda: signer.sign(payload, private_key)
+
+
+# Case name -> builder returning the operation for a parameter set
+CASES: Dict[str, Callable[[dict], Callable]] = {
+    "lattice.keygen": _lattice_keygen,
+    "lattice.encrypt_bytes": _lattice_encrypt_bytes,
+    "qkd.generate_shared_key": _qkd_generate,
+    "signature.sign": _signature_sign,
+}
+
+
+def fit_exponent(values: Sequence[float], costs: Sequence[float]) -> dict:
+    """
+    Fit cost ~ c * value^k by least squares in log-log space.
+
+    Args:
+        values: Swept parameter values
+        costs: Measured cost at each value (time or bytes)
+
+    Returns:
+        Dictionary with exponent k, coefficient c and r_squared of the fit
+    """
+    x = np.log(np.asarray(values, dtype=float))
+    y = np.log(np.maximum(np.asarray(costs, dtype=float), 1e-12))
+    if x.size < 2 or np.ptp(x) == 0:
+        raise ValueError("Fitting an exponent needs at least two distinct parameter values")
+
+    slope, intercept = np.polyfit(x, y, 1)
+    residual = y - (slope * x + intercept)
+    total = np.sum((y - y.mean()) ** 2)
+    r_squared = 1 - np.sum(residual**2) / total if total else 1.0
+
+    return {
+        "exponent": float(slope),
+        "coefficient": float(np.exp(intercept)),
+        "r_squared": float(r_squared),
+    }
+
+
+class ScalingSweep:
+    """
+    Time primitives over parameter grids and fit empirical scaling exponents.
+    """
+
+    def __init__(
+        self,
+        iterations: int = 3,
+        warmup: int = 1,
+        memory: bool = False,
+        base_params: Optional[dict] = None,
+    ):
+        """
+        Initialize sweep runner.
+
+        Args:
+            iterations: Timed calls per grid point
+            warmup: Untimed calls per grid point
+            memory: Also record peak traced memory per grid point
+            base_params: Values of the parameters that are not swept
+        """
+        self.iterations = iterations
+        self.warmup = warmup
+        self.memory = memory
+        self.base_params = dict(BASE_PARAMS, **(base_params or {}))
+
+    def sweep(self, case: str, parameter: str, values: Sequence[int]) -> dict:
+        """
+        Run one case over the values of one parameter.
+
+        Returns:
+            Dictionary with the per-point rows and the fitted time (and memory) scaling
+        """
+        if case not in CASES:
+            raise ValueError(f"Unknown case: {case}")
+        if parameter not in self.base_params:
+            raise ValueError(f"Unknown parameter: {parameter}")
+
+        rows = []
+        for value in values:
+            params = dict(self.base_params, **{parameter: value})
+            func = CASES[case](params)
+            times = CryptoBenchmark.repeat(func, iterations=self.iterations, warmup=self.warmup)
+            stats = CryptoBenchmark.summarize(times)
+            row = {
+                "case": case,
+                "parameter": parameter,
+                "value": value,
+                "median_time_ms": stats["median_time_ms"],
+                "p95_time_ms": stats["p95_time_ms"],
+            }
+            if self.memory:
+                row["peak_bytes"] = CryptoBenchmark.measure_memory(func)[0]["peak_bytes"]
+            rows.append(row)
+
+        result = {
+            "case": case,
+            "parameter": parameter,
+            "rows": rows,
+            "time_fit": fit_exponent(values, [row["median_time_ms"] for row in rows]),
+        }
+        if self.memory:
+            result["memory_fit"] = fit_exponent(values, [row["peak_bytes"] for row in rows])
+
+        return result
+
+    def run(self, grid: Optional[Dict[tuple, Sequence[int]]] = None) -> List[dict]:
+        """
+        Run every (case, parameter) sweep of a grid.
+
+        Args:
+            grid: Mapping of (case, parameter) to values (DEFAULT_GRID if None)
+
+        Returns:
+            List of sweep results
+        """
+        grid = DEFAULT_GRID if grid is None else grid
+        return [self.sweep(case, parameter, values) for (case, parameter), values in grid.items()]
+
+
+def write_csv(results: List[dict], path: str):
+    """Write every grid point of a sweep report as one CSV row."""
+    rows = [row for result in results for row in result["rows"]]
+    fields = ["case", "parameter", "value", "median_time_ms", "p95_time_ms"]
+    if any("peak_bytes" in row for row in rows):
+        fields.append("peak_bytes")
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(results: List[dict], path: str):
+    """Write a sweep report, including the fits, as JSON."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def plot(results: List[dict], directory: str) -> List[str]:
+    """
+    Save one log-log plot per sweep (requires matplotlib).
+
+    Returns:
+        Paths of the written PNG files
+    """
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError as exc:
+        raise ImportError("Plotting requires matplotlib (pip install matplotlib)") from exc
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for result in results:
+        values = [row["value"] for row in result["rows"]]
+        times = [row["median_time_ms"] for row in result["rows"]]
+        fit = result["time_fit"]
+
+        fig, ax = plt.subplots()
+        ax.loglog(values, times, "o", label="median")
+        ax.loglog(
+            values,
+            [fit["coefficient"] * v ** fit["exponent"] for v in values],
+            "--",
+            label=f"fit ~ {result['parameter']}^{fit['exponent']:.2f}",
+        )
+        ax.set_xlabel(result["parameter"])
+        ax.set_ylabel("time (ms)")
+        ax.set_title(result["case"])
+        ax.legend()
+
+        path = os.path.join(directory, f"{result['case']}_{result['parameter']}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Scaling sweeps over primitive parameters")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed calls per point")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed calls per point")
+    parser.add_argument("--memory", action="store_true", help="Also fit peak traced memory")
+    parser.add_argument("--csv", help="Write grid points to this CSV file")
+    parser.add_argument("--json", help="Write the full report to this JSON file")
+    parser.add_argument("--plot-dir", help="Save log-log plots here (needs matplotlib)")
+    args = parser.parse_args(argv)
+
+    results = ScalingSweep(args.iterations, args.warmup, args.memory).run()
+
+    for result in results:
+        fit = result["time_fit"]
+        line = (
+            f"{result['case']:26s} vs {result['parameter']:15s} "
+            f"time ~ x^{fit['exponent']:.2f} (r2={fit['r_squared']:.3f})"
+        )
+        if "memory_fit" in result:
+            line += f"  memory ~ x^{result['memory_fit']['exponent']:.2f}"
+        print(line)
+
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
+    if args.plot_dir:
+        plot(results, args.plot_dir)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.bench_suite import BenchmarkSuite, compare, load_config, main
+from src.utils.benchmark import CryptoBenchmark
+
+SMALL_CONFIG = {
+    "qkd": {"key_length": 64},
+    "lattice": {"dimension": 16, "modulus": 4093, "error_stddev": 1.0},
+    "signature": {"security_level": 256},
+    "benchmark": {"iterations": 3, "warmup_runs": 1},
+}
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "qkd:\n  key_length: 64\n"
+        "lattice:\n  dimension: 16\n  modulus: 4093\n  error_stddev: 1.0\n"
+        "benchmark:\n  iterations: 2\n  warmup_runs: 0\n"
+    )
+    return str(path)
+
+
+class TestSummaryStatistics:
+    def test_summarize(self):
+        stats = CryptoBenchmark.summarize([1.0, 2.0, 3.0, 4.0, 100.0], bytes_per_op=1_000_000)
+        assert stats["iterations"] == 5
+        assert stats["median_time_ms"] == 3.0
+        assert stats["p95_time_ms"] > stats["median_time_ms"]
+        assert stats["p99_time_ms"] >= stats["p95_time_ms"]
+        assert stats["ci95_low_ms"] < stats["mean_time_ms"] < stats["ci95_high_ms"]
+        assert stats["ops_per_s"] == pytest.approx(1000 / 3)
+        assert stats["mb_per_s"] == pytest.approx(1 / 0.003)
+
+    def test_repeat_honors_warmup(self):
+        calls = []
+        times = CryptoBenchmark.repeat(lambda: calls.append(1), iterations=4, warmup=2)
+        assert len(times) == 4
+        assert len(calls) == 6
+
+
+class TestBenchmarkSuite:
+    def test_load_config_merges_defaults(self, config_file):
+        config = load_config(config_file)
+        assert config["benchmark"]["iterations"] == 2
+        assert config["signature"]["security_level"] == 256
+
+    def test_qkd_settings_from_config(self):
+        config = dict(SMALL_CONFIG, qkd={"key_length": 64, "adaptive": True, "max_rounds": 3})
+        qkd = BenchmarkSuite(config).cases()["qkd.generate_shared_key"][0].__self__
+        assert qkd.adaptive is True
+        assert qkd.max_rounds == 3
+
+    def test_run_all_cases(self):
+        report = BenchmarkSuite(SMALL_CONFIG, payload_size=8).run()
+        assert set(report["results"]) == {
+            "lattice.keygen",
+            "lattice.encrypt",
+            "lattice.decrypt",
+            "signature.keygen",
+            "signature.sign",
+            "signature.verify",
+            "qkd.generate_shared_key",
+        }
+        assert report["metadata"]["iterations"] == 3
+        assert report["results"]["lattice.encrypt"]["iterations"] == 3
+        assert "mb_per_s" in report["results"]["lattice.encrypt"]
+
+    def test_memory_profile(self):
+        suite = BenchmarkSuite(SMALL_CONFIG, payload_size=8, memory=True)
+        report = suite.run(["lattice.encrypt", "qkd.generate_shared_key"])
+        assert report["results"]["lattice.encrypt"]["peak_bytes_per_byte"] > 0
+        assert report["results"]["qkd.generate_shared_key"]["peak_bytes_per_key_bit"] > 0
+
+    def test_unknown_case(self):
+        with pytest.raises(ValueError):
+            BenchmarkSuite(SMALL_CONFIG).run(["lattice.nope"])
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"median_time_ms": 1.0}, "b": {"median_time_ms": 1.0}}}
+        report = {"results": {"a": {"median_time_ms": 1.05}, "b": {"median_time_ms": 2.0}}}
+        regressions = compare(report, baseline, threshold=0.1)
+        assert [r["case"] for r in regressions] == ["b"]
+        assert regressions[0]["change"] == pytest.approx(1.0)
+
+
+class TestBenchmarkCLI:
+    def test_writes_json(self, config_file, tmp_path, capsys):
+        output = tmp_path / "report.json"
+        args = ["--config", config_file, "--case", "lattice.keygen", "--output", str(output)]
+        assert main(args) == 0
+        report = json.loads(output.read_text())
+        assert report["metadata"]["iterations"] == 2
+        assert "lattice.keygen" in capsys.readouterr().out
+
+    def test_fails_on_regression(self, config_file, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": {"lattice.keygen": {"median_time_ms": 1e-9}}}))
+        args = ["--config", config_file, "--case", "lattice.keygen", "--baseline", str(baseline)]
+        assert main(args) == 1
+
+    def test_passes_against_slow_baseline(self, config_file, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": {"lattice.keygen": {"median_time_ms": 1e9}}}))
+        args = ["--config", config_file, "--case", "lattice.keygen", "--baseline", str(baseline)]
+        assert main(args) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
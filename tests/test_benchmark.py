@@ -7,7 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from src.hash_signatures import HashBasedSignature
 from src.lattice_crypto import LatticeEncryption
-from src.utils.benchmark import CryptoBenchmark
+from src.utils.benchmark import CryptoBenchmark, RSSSampler, read_rss
 
 
 class TestCryptoBenchmark:
@@ -42,5 +42,55 @@ class TestCryptoBenchmark:
         assert "throughput_kb_s" in stats
 
 
+class TestMemoryProfiling:
+    def test_measure_memory_counts_retained_result(self):
+        stats, result = CryptoBenchmark.measure_memory(lambda: bytearray(1 << 20))
+        assert len(result) == 1 << 20
+        assert stats["peak_bytes"] >= 1 << 20
+        assert stats["retained_bytes"] >= 1 << 20
+        assert stats["allocated_blocks"] >= 1
+
+    def test_measure_memory_transient_peak(self):
+        def transient():
+            buffer = bytearray(1 << 20)
+            return len(buffer)
+
+        stats, result = CryptoBenchmark.measure_memory(transient)
+        assert result == 1 << 20
+        assert stats["peak_bytes"] >= 1 << 20
+        assert stats["retained_bytes"] < 1 << 16
+
+    def test_profile_memory_per_unit(self):
+        stats = CryptoBenchmark.profile_memory(
+            lambda: bytearray(4096), iterations=2, bytes_per_op=1024, key_bits_per_op=256
+        )
+        assert stats["peak_bytes_per_byte"] == pytest.approx(stats["peak_bytes"] / 1024)
+        assert stats["peak_bytes_per_key_bit"] == pytest.approx(stats["peak_bytes"] / 256)
+        if read_rss() is not None:
+            assert stats["rss_peak_bytes"] > 0
+
+    def test_rss_sampler(self):
+        if read_rss() is None:
+            pytest.skip("RSS not available on this platform")
+        with RSSSampler(interval=0.0005) as sampler:
+            sum(range(10000))
+        assert sampler.samples >= 1
+        assert sampler.peak_bytes >= sampler.baseline_bytes
+
+    def test_encryption_with_memory(self):
+        lattice = LatticeEncryption(n=32, q=521)
+        pub, priv = lattice.generate_keypair()
+        stats = CryptoBenchmark.benchmark_encryption(
+            lattice, pub, b"abcd", iterations=2, memory=True
+        )
+        assert "mean_time_ms" in stats
+        assert stats["peak_bytes"] > 0
+        assert stats["peak_bytes_per_byte"] == pytest.approx(stats["peak_bytes"] / 4)
+
+    def test_keygen_with_memory(self):
+        stats = CryptoBenchmark.benchmark_keygen(LatticeEncryption(n=32, q=521), memory=True)
+        assert stats["peak_bytes"] > 32 * 32 * 8
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
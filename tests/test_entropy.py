@@ -0,0 +1,124 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.entropy import DeterministicEntropy, EntropySource, SystemEntropy, default_entropy
+from src.hash_signatures import HashBasedSignature
+from src.lattice_crypto import LatticeEncryption
+from src.quantum_keygen import QuantumKeyDistribution
+
+
+class TestEntropySource:
+    @pytest.fixture
+    def source(self):
+        return SystemEntropy(buffer_size=1024)
+
+    def test_random_bytes_lengths(self, source):
+        assert len(source.random_bytes(0)) == 0
+        assert len(source.random_bytes(10)) == 10
+        assert len(source.random_bytes(5000)) == 5000
+        assert source.bytes_served == 5010
+
+    def test_buffer_refills_in_blocks(self, source):
+        for _ in range(100):
+            source.random_bytes(100)
+        assert source.refills == 10
+
+    def test_bits(self, source):
+        bits = source.bits(10001)
+        assert bits.shape == (10001,)
+        assert set(np.unique(bits)) <= {0, 1}
+        assert 0.45 < bits.mean() < 0.55
+
+    @pytest.mark.parametrize("q", [2, 251, 4093, 65537, 2**40 + 15])
+    def test_uniform_mod(self, source, q):
+        values = source.uniform_mod(q, (50, 40))
+        assert values.shape == (50, 40)
+        assert values.dtype == np.int64
+        assert values.min() >= 0 and values.max() < q
+
+    def test_uniform_mod_is_uniform(self, source):
+        counts = np.bincount(source.uniform_mod(5, 50000), minlength=5)
+        assert np.all(np.abs(counts - 10000) < 500)
+
+    def test_gaussian(self, source):
+        samples = source.gaussian(3.2, 20001)
+        assert samples.shape == (20001,)
+        assert abs(samples.mean()) < 0.1
+        assert abs(samples.std() - 3.2) < 0.1
+
+    def test_randbelow(self, source):
+        assert all(0 <= source.randbelow(7) < 7 for _ in range(100))
+
+    def test_default_entropy_shared(self):
+        assert default_entropy() is default_entropy()
+        assert isinstance(default_entropy(), SystemEntropy)
+
+    def test_abstract_base(self):
+        with pytest.raises(TypeError):
+            EntropySource()
+
+
+class TestDeterministicEntropy:
+    def test_reproducible(self):
+        assert DeterministicEntropy(7).random_bytes(3000) == DeterministicEntropy(7).random_bytes(
+            3000
+        )
+
+    def test_independent_of_request_pattern(self):
+        whole = DeterministicEntropy(b"seed", buffer_size=64).random_bytes(200)
+        source = DeterministicEntropy(b"seed", buffer_size=64)
+        parts = b"".join(source.random_bytes(n) for n in (10, 50, 4, 36))
+        assert whole[:100] == parts
+        assert source.random_bytes(100) == whole[100:]
+
+    def test_different_seeds(self):
+        assert DeterministicEntropy(1).random_bytes(32) != DeterministicEntropy(2).random_bytes(32)
+
+    def test_negative_seed_rejected(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            DeterministicEntropy(-1)
+
+
+class TestInjectedEntropy:
+    def test_lattice_deterministic(self):
+        pk1, sk1 = LatticeEncryption(n=16, entropy=DeterministicEntropy(3)).generate_keypair()
+        pk2, sk2 = LatticeEncryption(n=16, entropy=DeterministicEntropy(3)).generate_keypair()
+        assert np.array_equal(pk1[0], pk2[0])
+        assert np.array_equal(sk1, sk2)
+
+    def test_lattice_bulk_encrypt_roundtrip(self):
+        lattice = LatticeEncryption(n=32, q=4093, sigma=1.0, entropy=DeterministicEntropy(4))
+        public_key, private_key = lattice.generate_keypair()
+        message = bytes(range(256)) * 3
+        assert lattice.decrypt_bytes(lattice.encrypt_bytes(message, public_key), private_key) == (
+            message
+        )
+
+    def test_lattice_leaves_numpy_global_state(self):
+        state = np.random.get_state()[1].copy()
+        lattice = LatticeEncryption(n=16)
+        lattice.encrypt_bytes(b"abc", lattice.generate_keypair()[0])
+        assert np.array_equal(np.random.get_state()[1], state)
+
+    def test_signature_keys_deterministic(self):
+        key1 = HashBasedSignature(entropy=DeterministicEntropy(5)).generate_keypair()
+        key2 = HashBasedSignature(entropy=DeterministicEntropy(5)).generate_keypair()
+        assert key1 == key2
+
+    def test_qkd_bits_from_entropy(self):
+        qkd = QuantumKeyDistribution(entropy=DeterministicEntropy(6))
+        assert qkd.generate_random_bits(64) == DeterministicEntropy(6).bits(64).tolist()
+
+    def test_qkd_defaults(self):
+        assert QuantumKeyDistribution().entropy is default_entropy()
+        assert QuantumKeyDistribution(rng=random.Random(1)).entropy is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
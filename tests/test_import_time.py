@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src
+import src.utils
+from src.utils.import_time import measure_import, parse_importtime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        200 | io
+import time:      1500 |       4000 | src
+import time:      2500 |       2500 |   src.instrumentation
+"""
+
+
+def loaded_modules(statement):
+    code = f"{statement}\nimport sys\nprint(' '.join(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import src",
+            "from src import QuantumKeyDistribution",
+            "from src import HashBasedSignature",
+            "from src import CryptoBenchmark",
+        ],
+    )
+    def test_numpy_not_loaded(self, statement):
+        assert "numpy" not in loaded_modules(statement)
+
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "from src import QuantumKeyDistribution; QuantumKeyDistribution()",
+            "from src import HashBasedSignature; HashBasedSignature()",
+        ],
+    )
+    def test_construction_does_not_load_numpy(self, statement):
+        assert "numpy" not in loaded_modules(statement)
+
+    def test_lazy_module(self):
+        from src.utils.lazy import LazyModule
+
+        proxy = LazyModule("json")
+        assert "not loaded" in repr(proxy)
+        assert proxy.dumps([1]) == "[1]"
+        assert "(loaded)" in repr(proxy)
+
+    def test_lattice_loads_numpy_on_access(self):
+        modules = loaded_modules("import src")
+        assert "src.lattice_crypto" not in modules
+        assert "numpy" in loaded_modules("from src import LatticeEncryption")
+
+    def test_attributes_resolve(self):
+        from src.lattice_crypto import LatticeEncryption
+
+        assert src.LatticeEncryption is LatticeEncryption
+        assert set(src.__all__) <= set(dir(src))
+        assert src.utils.BenchmarkSuite.__name__ == "BenchmarkSuite"
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            src.NoSuchThing
+        with pytest.raises(AttributeError):
+            src.utils.NoSuchThing
+
+    def test_lazy_qkd_still_works(self):
+        code = (
+            "import sys\n"
+            "from src import QuantumKeyDistribution\n"
+            "key, stats = QuantumKeyDistribution(key_length=32).generate_shared_key()\n"
+            "print(len(key))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        assert output.strip() == "32"
+
+
+class TestImportTime:
+    def test_parse(self):
+        entries = parse_importtime(SAMPLE)
+        assert [e["module"] for e in entries] == ["_io", "io", "src", "src.instrumentation"]
+        assert [e["depth"] for e in entries] == [1, 0, 0, 1]
+        assert entries[2]["cumulative_us"] == 4000
+        assert entries[3]["self_us"] == 2500
+
+    def test_measure(self):
+        report = measure_import("import json", runs=1, top=3)
+        assert report["import_ms"] > 0
+        assert report["wall_ms"] >= report["import_ms"]
+        assert not report["numpy_loaded"]
+        assert len(report["heaviest"]) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
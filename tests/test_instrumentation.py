@@ -0,0 +1,138 @@
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import instrumentation
+from src.entropy import DeterministicEntropy
+from src.hash_signatures import HashBasedSignature
+from src.instrumentation import LoggingSink, PrometheusSink, count, instrumented, span
+from src.lattice_crypto import LatticeEncryption
+from src.quantum_keygen import QuantumKeyDistribution
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+class TestInstrumentation:
+    def test_disabled_is_noop(self):
+        assert not instrumentation.enabled()
+        with span("anything") as s:
+            pass
+        count("anything", 5)
+        assert span("a") is s
+
+    def test_in_memory_sink(self):
+        with instrumented() as sink:
+            for _ in range(3):
+                with span("stage"):
+                    pass
+            count("ops", 2)
+            count("ops")
+        assert not instrumentation.enabled()
+
+        snapshot = sink.snapshot()
+        stats = snapshot["spans"]["stage"]
+        assert stats["count"] == 3
+        assert stats["min_s"] <= stats["mean_s"] <= stats["max_s"]
+        assert snapshot["counters"] == {"ops": 3}
+
+        sink.reset()
+        assert sink.snapshot() == {"spans": {}, "counters": {}}
+
+    def test_span_records_on_exception(self):
+        with instrumented() as sink:
+            with pytest.raises(RuntimeError):
+                with span("failing"):
+                    raise RuntimeError("boom")
+        assert sink.snapshot()["spans"]["failing"]["count"] == 1
+
+    def test_logging_sink(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger="src.instrumentation"):
+            with instrumented(LoggingSink()):
+                with span("qkd.sift"):
+                    pass
+                count("qkd.qubits", 10)
+        assert "span qkd.sift" in caplog.text
+        assert "counter qkd.qubits +10" in caplog.text
+
+    def test_prometheus_render(self):
+        sink = PrometheusSink()
+        sink.record_span("lattice.matmul", 0.5)
+        sink.increment("signature.hash_calls", 42)
+        text = sink.render()
+        assert 'qct_span_seconds_sum{span="lattice.matmul"} 0.500000000' in text
+        assert 'qct_span_seconds_count{span="lattice.matmul"} 1' in text
+        assert "qct_signature_hash_calls_total 42" in text
+
+
+class TestInstrumentedPrimitives:
+    def test_qkd_stages(self):
+        qkd = QuantumKeyDistribution(key_length=64, entropy=DeterministicEntropy(1))
+        with instrumented() as sink:
+            key, stats = qkd.generate_shared_key()
+        snapshot = sink.snapshot()
+        for stage in ["generate", "encode", "measure", "sift", "detect", "amplify"]:
+            assert snapshot["spans"][f"qkd.{stage}"]["count"] == 1
+        assert snapshot["counters"]["qkd.qubits"] == stats["initial_bits"]
+        assert snapshot["counters"]["qkd.sifted_bits"] == stats["sifted_bits"]
+        assert snapshot["counters"]["qkd.key_bits"] == len(key)
+
+    def test_lattice_stages(self):
+        lattice = LatticeEncryption(n=16, entropy=DeterministicEntropy(2))
+        with instrumented() as sink:
+            public_key, _ = lattice.generate_keypair()
+            lattice.encrypt_bytes(b"hi", public_key)
+        snapshot = sink.snapshot()
+        assert snapshot["spans"]["lattice.keygen"]["count"] == 1
+        # Keygen samples s and e separately from the uniform matrix A
+        assert snapshot["spans"]["lattice.noise"]["count"] == 3
+        assert snapshot["spans"]["lattice.matrix"]["count"] == 1
+        assert "lattice.pack" in snapshot["spans"]
+        assert snapshot["counters"]["lattice.matmuls"] == 3
+        assert snapshot["counters"]["lattice.bits_encrypted"] == 16
+
+    def test_signature_hash_counts(self):
+        signer = HashBasedSignature(entropy=DeterministicEntropy(3))
+        public_key, private_key = signer.generate_keypair()
+
+        with instrumented() as sink:
+            signature = signer.sign(b"message", private_key)
+        msg_hash = signature["message_hash"]
+        # Message hash, one-time keypair (16 x 257) and the revealed chain prefixes
+        assert sink.snapshot()["counters"]["signature.hash_calls"] == 1 + 16 * 257 + sum(
+            msg_hash[:16]
+        )
+
+        with instrumented() as sink:
+            assert signer.verify(b"message", signature, public_key)
+        assert sink.snapshot()["counters"]["signature.hash_calls"] == 1 + sum(
+            256 - b for b in msg_hash[:16]
+        )
+        assert sink.snapshot()["spans"]["signature.chain_walk"]["count"] == 1
+
+        with instrumented() as sink:
+            assert not signer.verify(b"other message", signature, public_key)
+        assert sink.snapshot()["counters"]["signature.hash_calls"] == 1
+
+    def test_sink_is_abstract(self):
+        with pytest.raises(TypeError):
+            instrumentation.MetricsSink()
+
+        class PartialSink(instrumentation.MetricsSink):
+            def increment(self, name, value=1):
+                pass
+
+        with pytest.raises(TypeError):
+            PartialSink()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
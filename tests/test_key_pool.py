@@ -0,0 +1,127 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.key_pool import QKDKeyPool
+from src.packed_key import PackedKey
+from src.quantum_keygen import QuantumKeyDistribution
+
+
+class TestQKDKeyPool:
+    @pytest.fixture
+    def pool(self):
+        pool = QKDKeyPool(QuantumKeyDistribution(key_length=64), capacity_bits=1024)
+        yield pool
+        pool.stop()
+
+    def test_invalid_watermarks(self):
+        with pytest.raises(ValueError):
+            QKDKeyPool(low_watermark=0.9, high_watermark=0.5)
+
+    def test_capacity_smaller_than_block(self):
+        with pytest.raises(ValueError):
+            QKDKeyPool(QuantumKeyDistribution(key_length=256), capacity_bits=128)
+
+    def test_try_take_empty(self, pool):
+        assert pool.try_take(64) is None
+
+    def test_take_requires_running_pool(self, pool):
+        with pytest.raises(RuntimeError):
+            pool.take(64, timeout=0.1)
+
+    def test_take_out_of_range(self, pool):
+        with pytest.raises(ValueError):
+            pool.take(2048)
+
+    def test_blocking_take(self, pool):
+        pool.start()
+        key = pool.take(100, timeout=10)
+        assert isinstance(key, PackedKey)
+        assert len(key) == 100
+
+    def test_fills_to_high_watermark(self, pool):
+        pool.start()
+        pool.take(1, timeout=10)
+        with pool._cond:
+            pool._cond.wait_for(lambda: pool.fill >= pool.high_bits, timeout=10)
+        assert pool.high_bits <= pool.fill <= pool.capacity_bits
+
+    def test_bits_are_not_reused(self, pool):
+        pool.start()
+        first = pool.take(256, timeout=10)
+        second = pool.take(256, timeout=10)
+        assert first != second
+
+    def test_take_async(self, pool):
+        pool.start()
+        key = asyncio.run(pool.take_async(200, timeout=10))
+        assert len(key) == 200
+
+    def test_take_async_timeout_keeps_bits(self, pool):
+        pool.start()
+        with pytest.raises(TimeoutError):
+            asyncio.run(pool.take_async(pool.capacity_bits, timeout=0.001))
+
+        # A timed-out caller must not remove bits later
+        with pool._cond:
+            pool._cond.wait_for(lambda: pool.fill >= pool.high_bits, timeout=10)
+        stats = pool.stats()
+        assert stats["takes"] == 0
+        assert stats["bits_taken"] == 0
+
+    def test_take_async_cancel(self, pool):
+        pool.start()
+
+        async def cancel_waiter():
+            task = asyncio.create_task(pool.take_async(pool.capacity_bits))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_waiter())
+        assert pool._async_waiters == []
+        assert pool.stats()["bits_taken"] == 0
+
+    def test_take_async_stopped(self, pool):
+        pool.start()
+
+        async def stop_while_waiting():
+            task = asyncio.create_task(pool.take_async(pool.capacity_bits))
+            await asyncio.sleep(0)
+            pool.stop()
+            with pytest.raises(RuntimeError, match="stopped"):
+                await task
+
+        asyncio.run(stop_while_waiting())
+
+    def test_mean_wait_counts_waits_only(self, pool):
+        with pool:
+            pool.take(64, timeout=10)
+            with pool._cond:
+                pool._cond.wait_for(lambda: pool.fill >= pool.high_bits, timeout=10)
+            pool.take(64, timeout=10)
+            pool.take(64, timeout=10)
+            stats = pool.stats()
+        assert stats["takes"] == 3
+        assert stats["waits"] <= 1
+        expected = stats["total_wait_s"] / stats["waits"] * 1000 if stats["waits"] else 0.0
+        assert stats["mean_wait_ms"] == pytest.approx(expected)
+
+    def test_stats(self, pool):
+        with pool:
+            pool.take(128, timeout=10)
+            stats = pool.stats()
+        assert stats["takes"] == 1
+        assert stats["bits_taken"] == 128
+        assert stats["bits_generated"] >= 128
+        assert 0 <= stats["fill_ratio"] <= 1
+        assert stats["generation_rate_bps"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
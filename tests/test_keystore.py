@@ -0,0 +1,232 @@
+import os
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.entropy import DeterministicEntropy
+from src.hash_signatures import HashBasedSignature
+from src.keystore import HEADER_SIZE, KeyStore
+from src.lattice_crypto import LatticeEncryption, SeededMatrix
+
+
+@pytest.fixture
+def lattice():
+    return LatticeEncryption(n=32, q=4093, entropy=DeterministicEntropy(1))
+
+
+@pytest.fixture
+def keypair(lattice):
+    return lattice.generate_keypair()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KeyStore(str(tmp_path / "keys"))
+
+
+def _decrypt_in_worker(root, key_id, ciphertexts):
+    store = KeyStore(root)
+    lattice = store.load_lattice(key_id)
+    return lattice.decrypt_bytes(ciphertexts, store.load_lattice_private(key_id))
+
+
+class TestLatticeKeys:
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_roundtrip(self, tmp_path, lattice, keypair, mmap):
+        store = KeyStore(str(tmp_path), mmap=mmap)
+        public_key, private_key = keypair
+        store.save_lattice_keys("alice", lattice, public_key, private_key)
+
+        A, b = store.load_lattice_public("alice")
+        s = store.load_lattice_private("alice")
+        assert isinstance(A, np.memmap) == mmap
+        assert np.array_equal(A, public_key[0])
+        assert np.array_equal(b, public_key[1])
+        assert np.array_equal(s, private_key)
+
+    def test_narrow_dtype(self, store, lattice, keypair):
+        store.save_lattice_keys("alice", lattice, *keypair)
+        A, b = store.load_lattice_public("alice")
+        assert A.dtype == np.uint16
+        size = os.path.getsize(os.path.join(store.root, "alice.lattice-public.qks"))
+        assert size == HEADER_SIZE + 2 * (32 * 32 + 32)
+
+    def test_wide_modulus(self, store):
+        lattice = LatticeEncryption(n=8, q=(1 << 31) - 1, entropy=DeterministicEntropy(2))
+        public_key, private_key = lattice.generate_keypair()
+        store.save_lattice_keys("wide", lattice, public_key, private_key)
+        assert store.load_lattice_public("wide")[0].dtype == np.uint32
+        assert np.array_equal(store.load_lattice_private("wide"), private_key)
+
+    def test_narrow_keys_encrypt_identically(self, store, lattice, keypair):
+        public_key, private_key = keypair
+        store.save_lattice_keys("alice", lattice, public_key, private_key)
+        loaded = store.load_lattice_public("alice")
+
+        message = b"stored keys"
+        expected = LatticeEncryption(n=32, entropy=DeterministicEntropy(9)).encrypt_bytes(
+            message, public_key
+        )
+        actual = LatticeEncryption(n=32, entropy=DeterministicEntropy(9)).encrypt_bytes(
+            message, loaded
+        )
+        assert all(np.array_equal(x[0], y[0]) and x[1] == y[1] for x, y in zip(expected, actual))
+        assert lattice.decrypt_bytes(actual, store.load_lattice_private("alice")) == message
+
+    def test_rejects_unreduced_values(self, store, lattice, keypair):
+        (A, b), s = keypair
+        with pytest.raises(ValueError, match="reduced mod q"):
+            store.save_lattice_keys("bad", lattice, (A, b), s - lattice.q)
+        wide = A.copy()
+        wide[0, 0] = 1 << 16
+        with pytest.raises(ValueError, match="reduced mod q"):
+            store.save_lattice_keys("bad", lattice, (wide, b))
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_seeded_public_key(self, tmp_path, monkeypatch, mmap):
+        store = KeyStore(str(tmp_path), mmap=mmap)
+        lattice = LatticeEncryption(n=64, memory_budget=1 << 20, entropy=DeterministicEntropy(4))
+        public_key, private_key = lattice.generate_keypair()
+        dense = np.asarray(public_key[0])
+
+        # Saving and loading must never expand the matrix
+        monkeypatch.setattr(SeededMatrix, "__array__", None)
+        store.save_lattice_keys("seeded", lattice, public_key, private_key)
+        A, b = store.load_lattice_public("seeded")
+        monkeypatch.undo()
+
+        size = os.path.getsize(os.path.join(store.root, "seeded.lattice-public.qks"))
+        assert size == HEADER_SIZE + 32 + 2 * 64
+        assert isinstance(A, SeededMatrix) and A.seed == public_key[0].seed
+        assert np.array_equal(np.asarray(A), dense)
+        assert np.array_equal(b, public_key[1])
+
+        ciphertexts = store.load_lattice("seeded").encrypt_bytes(b"seeded", (A, b))
+        assert lattice.decrypt_bytes(ciphertexts, store.load_lattice_private("seeded")) == b"seeded"
+
+    def test_seeded_then_dense_overwrite(self, store, lattice, keypair):
+        seeded = LatticeEncryption(n=32, memory_budget=1 << 20, entropy=DeterministicEntropy(5))
+        store.save_lattice_keys("k", seeded, seeded.generate_keypair()[0])
+        store.save_lattice_keys("k", lattice, keypair[0])
+        A, _ = store.load_lattice_public("k")
+        assert np.array_equal(A, keypair[0][0])
+
+    def test_load_lattice_parameters(self, store, lattice, keypair):
+        store.save_lattice_keys("alice", lattice, *keypair)
+        restored = store.load_lattice("alice")
+        assert (restored.n, restored.q, restored.sigma) == (lattice.n, lattice.q, lattice.sigma)
+
+    def test_shared_across_processes(self, store, lattice, keypair):
+        public_key, private_key = keypair
+        store.save_lattice_keys("alice", lattice, public_key, private_key)
+        ciphertexts = lattice.encrypt_bytes(b"worker", store.load_lattice_public("alice"))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(_decrypt_in_worker, [store.root] * 2, ["alice"] * 2, [ciphertexts] * 2)
+            )
+        assert results == [b"worker", b"worker"]
+
+
+class TestSignatureKeys:
+    def test_roundtrip(self, store):
+        signer = HashBasedSignature(entropy=DeterministicEntropy(3))
+        public_key, private_key = signer.generate_keypair()
+        store.save_signature_keys("signer", public_key, private_key)
+
+        loaded_private = store.load_signature_private("signer")
+        assert store.load_signature_public("signer") == public_key
+        assert loaded_private == private_key
+        signature = signer.sign(b"msg", loaded_private)
+        assert signer.verify(b"msg", signature, store.load_signature_public("signer"))
+
+    def test_private_file_permissions(self, store):
+        store.save_signature_keys("signer", b"pub", b"secret")
+        mode = os.stat(os.path.join(store.root, "signer.signature-private.qks")).st_mode
+        assert stat.S_IMODE(mode) == 0o600
+
+    def test_public_only(self, store):
+        store.save_signature_keys("signer", b"pub")
+        with pytest.raises(KeyError):
+            store.load_signature_private("signer")
+
+
+class TestKeyStore:
+    def test_lru_cache(self, tmp_path):
+        store = KeyStore(str(tmp_path), cache_size=2)
+        for key_id in ["a", "b", "c"]:
+            store.save_signature_keys(key_id, key_id.encode())
+
+        store.load_signature_public("a")
+        store.load_signature_public("b")
+        store.load_signature_public("a")
+        store.load_signature_public("c")  # evicts b
+        store.load_signature_public("a")
+        store.load_signature_public("b")
+
+        info = store.cache_info()
+        assert (info["hits"], info["misses"]) == (2, 4)
+        assert info["size"] == info["capacity"] == 2
+
+    def test_overwrite_invalidates_cache(self, store):
+        store.save_signature_keys("k", b"old")
+        assert store.load_signature_public("k") == b"old"
+        store.save_signature_keys("k", b"new")
+        assert store.load_signature_public("k") == b"new"
+
+    def test_concurrent_saves_of_one_key(self, store):
+        values = [bytes([i]) * 32 for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda value: store.save_signature_keys("k", value, value), values))
+
+        assert store.load_signature_public("k") in values
+        assert sorted(os.listdir(store.root)) == [
+            "k.signature-private.qks",
+            "k.signature-public.qks",
+        ]
+
+    def test_list_contains_delete(self, store, lattice, keypair):
+        store.save_lattice_keys("alice", lattice, *keypair)
+        store.save_signature_keys("bob", b"pub", b"secret")
+        assert store.list_keys() == ["alice", "bob"]
+        assert "alice" in store
+        store.delete("alice")
+        assert "alice" not in store
+        assert store.list_keys() == ["bob"]
+
+    def test_missing_key(self, store):
+        with pytest.raises(KeyError):
+            store.load_lattice_public("nobody")
+
+    @pytest.mark.parametrize("key_id", ["../escape", "a/b", "", ".hidden"])
+    def test_invalid_key_id(self, store, key_id):
+        with pytest.raises(ValueError):
+            store.save_signature_keys(key_id, b"pub")
+
+    def test_corrupt_files(self, store):
+        store.save_signature_keys("k", b"pub")
+        path = os.path.join(store.root, "k.signature-public.qks")
+        raw = bytearray(open(path, "rb").read())
+
+        with open(path, "wb") as f:
+            f.write(b"XXXX" + raw[4:])
+        with pytest.raises(ValueError, match="Not a keystore file"):
+            store.load_signature_public("k")
+
+        raw[4] = 99  # format version
+        with open(path, "wb") as f:
+            f.write(raw)
+        with pytest.raises(ValueError, match="version"):
+            store.load_signature_public("k")
+
+    def test_invalid_cache_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            KeyStore(str(tmp_path), cache_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
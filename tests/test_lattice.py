@@ -1,12 +1,15 @@
 import os
 import sys
+import tracemalloc
 
 import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.lattice_crypto import LatticeEncryption
+from src.entropy import DeterministicEntropy
+from src.keystore import KeyStore
+from src.lattice_crypto import LatticeEncryption, SeededMatrix
 
 
 class TestLatticeEncryption:
@@ -89,5 +92,156 @@ class TestLatticeEncryption:
         assert lattice.sigma == 2.0
 
 
+def same_ciphertexts(first, second):
+    return len(first) == len(second) and all(
+        np.array_equal(u1, u2) and v1 == v2 for (u1, v1), (u2, v2) in zip(first, second)
+    )
+
+
+class TestTiledLattice:
+    MESSAGE = bytes(range(64))
+
+    @pytest.fixture
+    def dense_keys(self):
+        return LatticeEncryption(n=96, entropy=DeterministicEntropy(1)).generate_keypair()
+
+    def test_seeded_matrix_rows_are_independent(self):
+        A = SeededMatrix(b"seed", 40, 4093)
+        full = np.asarray(A)
+        assert full.shape == (40, 40)
+        assert np.all(full >= 0) and np.all(full < 4093)
+        assert np.array_equal(A.rows(13, 29), full[13:29])
+        assert not np.array_equal(full, np.asarray(SeededMatrix(b"other", 40, 4093)))
+
+    @pytest.mark.parametrize("q", [3, 4093, 4097, 2**28 - 57])
+    def test_seeded_matrix_short_rows(self, q):
+        # Too few candidate words forces the per-row continuation of the XOF stream
+        expected = np.asarray(SeededMatrix(b"seed", 48, q))
+        sparse = SeededMatrix(b"seed", 48, q)
+        sparse._candidates = 40
+        assert np.array_equal(sparse.rows(5, 30), expected[5:30])
+
+    def test_seeded_matrix_expanded_once_when_it_fits(self, monkeypatch):
+        lattice = LatticeEncryption(n=32, memory_budget=1 << 30, batch_bits=16)
+        public_key, private_key = lattice.generate_keypair()
+        calls = []
+        original = SeededMatrix.rows
+        monkeypatch.setattr(
+            SeededMatrix, "rows", lambda self, *span: calls.append(span) or original(self, *span)
+        )
+
+        ciphertexts = lattice.encrypt_bytes(self.MESSAGE, public_key)
+        assert calls == [(0, 32)]
+        assert lattice.decrypt_bytes(ciphertexts, private_key) == self.MESSAGE
+
+    @pytest.mark.parametrize("budget", [1 << 30, 1 << 20, 400_000])
+    def test_encrypt_bytes_matches_dense(self, dense_keys, budget):
+        public_key, private_key = dense_keys
+        tiled = LatticeEncryption(n=96, entropy=DeterministicEntropy(2), memory_budget=budget)
+        plan = tiled.plan()
+        dense = LatticeEncryption(
+            n=96, entropy=DeterministicEntropy(2), batch_bits=plan["batch_bits"]
+        )
+
+        ciphertexts = tiled.encrypt_bytes(self.MESSAGE, public_key)
+        assert same_ciphertexts(ciphertexts, dense.encrypt_bytes(self.MESSAGE, public_key))
+        assert tiled.decrypt_bytes(ciphertexts, private_key) == self.MESSAGE
+
+    def test_encrypt_matches_dense(self, dense_keys):
+        public_key, private_key = dense_keys
+        tiled = LatticeEncryption(n=96, entropy=DeterministicEntropy(3), memory_budget=300_000)
+        dense = LatticeEncryption(n=96, entropy=DeterministicEntropy(3))
+        assert tiled.plan()["tile_rows"] < 96
+
+        for bit in (0, 1):
+            u, v = tiled.encrypt(bit, public_key)
+            expected_u, expected_v = dense.encrypt(bit, public_key)
+            assert np.array_equal(u, expected_u) and v == expected_v
+            assert tiled.decrypt((u, v), private_key) == bit
+
+    def test_lazy_reduction_with_large_modulus(self):
+        # The uint32 accumulator has to be reduced mod q between tiles
+        q = 2**28 - 57
+        public_key, private_key = LatticeEncryption(
+            n=64, q=q, entropy=DeterministicEntropy(4)
+        ).generate_keypair()
+        tiled = LatticeEncryption(n=64, q=q, entropy=DeterministicEntropy(5), memory_budget=100_000)
+        plan = tiled.plan()
+        assert plan["tile_rows"] * (q - 1) < 2**32 < 64 * (q - 1)
+        dense = LatticeEncryption(
+            n=64, q=q, entropy=DeterministicEntropy(5), batch_bits=plan["batch_bits"]
+        )
+
+        ciphertexts = tiled.encrypt_bytes(self.MESSAGE, public_key)
+        assert same_ciphertexts(ciphertexts, dense.encrypt_bytes(self.MESSAGE, public_key))
+        assert tiled.decrypt_bytes(ciphertexts, private_key) == self.MESSAGE
+
+    def test_seeded_keygen_matches_dense_product(self):
+        lattice = LatticeEncryption(n=80, entropy=DeterministicEntropy(6), memory_budget=200_000)
+        (A, b), s = lattice.generate_keypair()
+        assert isinstance(A, SeededMatrix)
+
+        # Replay the entropy stream: s, the 32-byte seed, then e
+        replay = DeterministicEntropy(6)
+        replay.gaussian(lattice.sigma, 80)
+        replay.random_bytes(32)
+        e = replay.gaussian(lattice.sigma, 80).astype(np.int64)
+        assert np.array_equal(b, (np.asarray(A).dot(s) + e) % lattice.q)
+
+    def test_seeded_key_roundtrip(self):
+        lattice = LatticeEncryption(n=64, memory_budget=1 << 20)
+        public_key, private_key = lattice.generate_keypair()
+        ciphertexts = lattice.encrypt_bytes(self.MESSAGE, public_key)
+        assert lattice.decrypt_bytes(ciphertexts, private_key) == self.MESSAGE
+
+        # A seeded key also works with an instance that has no budget
+        other = LatticeEncryption(n=64)
+        assert other.decrypt_bytes(other.encrypt_bytes(b"hi", public_key), private_key) == b"hi"
+
+    def test_stored_key_consumed_in_tiles(self, tmp_path, dense_keys):
+        public_key, private_key = dense_keys
+        store = KeyStore(str(tmp_path))
+        store.save_lattice_keys("k", LatticeEncryption(n=96), public_key, private_key)
+
+        tiled = LatticeEncryption(n=96, entropy=DeterministicEntropy(7), memory_budget=300_000)
+        dense = LatticeEncryption(
+            n=96, entropy=DeterministicEntropy(7), batch_bits=tiled.plan()["batch_bits"]
+        )
+        mapped = store.load_lattice_public("k")
+        assert same_ciphertexts(
+            tiled.encrypt_bytes(self.MESSAGE, mapped), dense.encrypt_bytes(self.MESSAGE, public_key)
+        )
+
+    def test_peak_memory_within_budget(self):
+        budget = 2 << 20
+        lattice = LatticeEncryption(n=256, entropy=DeterministicEntropy(8), memory_budget=budget)
+        public_key, _ = lattice.generate_keypair()
+
+        tracemalloc.start()
+        try:
+            lattice.generate_keypair()
+            _, keygen_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            ciphertexts = lattice.encrypt_bytes(b"x" * 64, public_key)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(ciphertexts) == 512
+        assert keygen_peak <= budget
+        # The returned ciphertexts are not part of the working budget
+        assert peak - retained <= budget
+        assert peak - baseline <= budget + (retained - baseline)
+
+    def test_plan(self):
+        assert LatticeEncryption(n=64).plan()["tile_rows"] == 64
+        plan = LatticeEncryption(n=1024, memory_budget=16 << 20).plan()
+        assert plan["tile_rows"] < 1024
+        assert plan["estimated_bytes"] <= 16 << 20
+        with pytest.raises(ValueError, match="too small"):
+            LatticeEncryption(n=1024, memory_budget=1 << 16).plan()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.load_generator import (
+    LoadGenerator,
+    _drive,
+    detect_global_rng,
+    latency_histogram,
+    main,
+)
+from src.utils.scaling import BASE_PARAMS, CASES
+
+SMALL = {"n": 16, "payload": 4, "key_length": 32}
+
+
+class TestGlobalRNGDetection:
+    def test_detects_random_module(self):
+        assert detect_global_rng(random.random) == {"random": True, "numpy": False}
+
+    def test_detects_numpy_legacy(self):
+        assert detect_global_rng(np.random.rand, 3) == {"random": False, "numpy": True}
+
+    @pytest.mark.parametrize("case", sorted(CASES))
+    def test_primitives_use_private_state(self, case):
+        operation = CASES[case](dict(BASE_PARAMS, **SMALL))
+        assert detect_global_rng(operation) == {"random": False, "numpy": False}
+
+
+class TestLoadGenerator:
+    def test_histogram(self):
+        histogram = latency_histogram([1.0, 2.0, 4.0, 8.0], bins=3)
+        assert len(histogram["edges_ms"]) == 4
+        assert sum(histogram["counts"]) == 4
+
+    def test_histogram_constant(self):
+        assert sum(latency_histogram([5.0, 5.0])["counts"]) == 2
+
+    def test_histogram_empty(self):
+        assert latency_histogram([]) == {"edges_ms": [], "counts": []}
+
+    def test_open_loop_latency_includes_queueing(self):
+        # Requests every 10 ms against a 20 ms operation fall further behind each time
+        run = _drive(lambda: time.sleep(0.02), requests=5, interval=0.01)
+        latencies = run["latencies"]
+        assert latencies[-1] >= 20 + 4 * 10 - 1
+        assert latencies == sorted(latencies)
+        assert run["end"] - run["start"] >= 0.1
+
+    def test_requires_requests(self):
+        with pytest.raises(ValueError):
+            LoadGenerator("lattice.encrypt_bytes", requests=0)
+
+    def test_threads_closed_loop(self):
+        report = LoadGenerator("lattice.encrypt_bytes", requests=5, params=SMALL).run([1, 2])
+        first, second = report["results"]
+        assert first["requests"] == 5 and second["requests"] == 10
+        assert first["errors"] == 0
+        assert first["scaling_efficiency"] == pytest.approx(1.0)
+        assert second["scaling_efficiency"] > 0
+        assert sum(second["histogram"]["counts"]) == 10
+        assert report["global_rng"] == {"random": False, "numpy": False}
+
+    def test_private_instances(self):
+        generator = LoadGenerator("signature.sign", requests=3, shared=False, params=SMALL)
+        assert generator.run_point(2)["requests"] == 6
+
+    def test_open_loop_rate(self):
+        generator = LoadGenerator("lattice.keygen", requests=5, rate=100, params=SMALL)
+        point = generator.run_point(1)
+        # Five requests scheduled 10 ms apart take at least 40 ms
+        assert point["elapsed_s"] >= 0.04
+        assert point["throughput_rps"] <= 5 / 0.04
+
+    def test_processes(self):
+        point = LoadGenerator("lattice.keygen", mode="process", requests=3, params=SMALL).run_point(
+            2
+        )
+        assert point["requests"] == 6
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            LoadGenerator("lattice.nope")
+        with pytest.raises(ValueError):
+            LoadGenerator("lattice.keygen", mode="fiber")
+
+    def test_main(self, capsys):
+        assert main(["--case", "lattice.keygen", "--workers", "1", "--requests", "2"]) == 0
+        assert "workers   1" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.packed_key import PackedKey
+from src.quantum_keygen import QuantumKeyDistribution
+
+
+class TestPackedKey:
+    @pytest.fixture
+    def bits(self):
+        return [1, 0, 1, 1, 0, 0, 1, 0, 1, 1, 1, 0, 0]
+
+    def test_roundtrip_bits(self, bits):
+        key = PackedKey.from_bits(bits)
+        assert len(key) == 13
+        assert key.to_list() == bits
+        assert key.nbytes == 2
+
+    def test_to_bytes_matches_packbits(self, bits):
+        key = PackedKey.from_bits(bits)
+        assert key.to_bytes() == np.packbits(bits).tobytes()
+
+    def test_from_bytes_clears_padding(self):
+        key = PackedKey.from_bytes(b"\xff\xff", length=10)
+        assert key.to_bytes() == b"\xff\xc0"
+        assert key.count() == 10
+
+    def test_from_bytes_length_too_long(self):
+        with pytest.raises(ValueError):
+            PackedKey.from_bytes(b"\x00", length=9)
+
+    def test_indexing(self, bits):
+        key = PackedKey.from_bits(bits)
+        assert [key[i] for i in range(len(bits))] == bits
+        assert key[-1] == bits[-1]
+        with pytest.raises(IndexError):
+            key[len(bits)]
+
+    @pytest.mark.parametrize("start,stop", [(0, 13), (3, 11), (5, 13), (8, 13), (7, 7), (12, 40)])
+    def test_slicing(self, bits, start, stop):
+        key = PackedKey.from_bits(bits)
+        assert key[start:stop].to_list() == bits[start:stop]
+
+    def test_stepped_slicing(self, bits):
+        key = PackedKey.from_bits(bits)
+        assert key[1::3].to_list() == bits[1::3]
+
+    def test_xor_and_hamming(self):
+        rng = np.random.default_rng(0)
+        a = rng.integers(0, 2, 100)
+        b = rng.integers(0, 2, 100)
+        ka, kb = PackedKey.from_bits(a), PackedKey.from_bits(b)
+        assert (ka ^ kb).to_list() == (a ^ b).tolist()
+        assert ka.hamming_distance(kb) == int(np.sum(a != b))
+        assert ka.hamming_distance(ka) == 0
+
+    def test_xor_length_mismatch(self):
+        with pytest.raises(ValueError):
+            PackedKey.from_bits([0, 1]) ^ PackedKey.from_bits([0, 1, 1])
+
+    def test_concat(self, bits):
+        parts = [PackedKey.from_bits(bits[:8]), PackedKey.from_bits(bits[8:])]
+        assert PackedKey.concat(parts).to_list() == bits
+        parts = [PackedKey.from_bits(bits[:5]), PackedKey.from_bits(bits[5:])]
+        assert PackedKey.concat(parts).to_list() == bits
+
+    def test_equality(self, bits):
+        assert PackedKey.from_bits(bits) == PackedKey.from_bits(bits)
+        assert PackedKey.from_bits(bits) != PackedKey.from_bits(bits[:-1])
+
+
+class TestPackedQKD:
+    def test_sift_key_packed_matches_list(self):
+        qkd = QuantumKeyDistribution(key_length=16)
+        alice_bits = [0, 1, 0, 1, 1]
+        bob_bits = [0, 1, 1, 0, 1]
+        alice_bases = [0, 1, 0, 1, 0]
+        bob_bases = [0, 1, 1, 0, 0]
+        alice_sifted, bob_sifted = qkd.sift_key_packed(alice_bits, bob_bits, alice_bases, bob_bases)
+        expected = qkd.sift_key(alice_bits, bob_bits, alice_bases, bob_bases)
+        assert (alice_sifted.to_list(), bob_sifted.to_list()) == expected
+
+    def test_generate_shared_key_packed(self):
+        qkd = QuantumKeyDistribution(key_length=128)
+        key, stats = qkd.generate_shared_key(packed=True)
+        assert isinstance(key, PackedKey)
+        assert len(key) == 128
+        assert len(key.to_bytes()) == 16
+        assert stats["key_bytes"] == 16
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
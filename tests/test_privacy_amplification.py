@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.packed_key import PackedKey
+from src.privacy_amplification import PrivacyAmplifier, toeplitz_hash
+from src.quantum_keygen import QuantumKeyDistribution
+
+
+def dense_toeplitz_hash(bits, seed_bits, m):
+    n = len(bits)
+    matrix = np.array([[seed_bits[i - j + n - 1] for j in range(n)] for i in range(m)])
+    return (matrix.dot(bits) % 2).tolist()
+
+
+class TestToeplitzHash:
+    @pytest.mark.parametrize("n,m", [(1, 1), (8, 3), (100, 37), (257, 256), (600, 100)])
+    def test_matches_dense_product(self, n, m):
+        rng = np.random.default_rng(n)
+        bits = rng.integers(0, 2, n, dtype=np.uint8)
+        seed_bits = rng.integers(0, 2, n + m - 1, dtype=np.uint8)
+        result = toeplitz_hash(PackedKey.from_bits(bits), seed_bits, m)
+        assert result.to_list() == dense_toeplitz_hash(bits, seed_bits, m)
+
+    def test_wrong_seed_length(self):
+        with pytest.raises(ValueError):
+            toeplitz_hash(PackedKey.from_bits([0, 1, 1]), np.zeros(3, dtype=np.uint8), 2)
+
+    def test_zero_output(self):
+        assert len(toeplitz_hash(PackedKey.from_bits([1, 0]), np.zeros(1, dtype=np.uint8), 0)) == 0
+
+
+class TestPrivacyAmplifier:
+    @pytest.fixture
+    def amplifier(self):
+        return PrivacyAmplifier(epsilon=1e-10)
+
+    def test_security_bits(self, amplifier):
+        assert amplifier.security_bits == 67
+
+    def test_secure_length(self, amplifier):
+        assert amplifier.secure_length(1000, 0.0) == 933
+        assert amplifier.secure_length(1000, 0.0, leaked_bits=100) == 833
+        assert amplifier.secure_length(1000, 0.05) < 933
+        assert amplifier.secure_length(100, 0.11, leaked_bits=80) == 0
+
+    def test_amplify(self, amplifier):
+        key = PackedKey.from_bits(np.random.default_rng(0).integers(0, 2, 500))
+        first = amplifier.amplify(key, 200, seed=1)
+        assert len(first) == 200
+        assert first == amplifier.amplify(key, 200, seed=1)
+        assert first != amplifier.amplify(key, 200, seed=2)
+
+    def test_amplify_cannot_expand(self, amplifier):
+        with pytest.raises(ValueError):
+            amplifier.amplify(PackedKey.from_bits([0, 1]), 3)
+
+
+class TestAmplifiedQKD:
+    def test_sample_bits_discarded(self):
+        qkd = QuantumKeyDistribution(key_length=128)
+        key, stats = qkd.generate_shared_key()
+        assert len(key) == 128
+        assert stats["sample_bits"] == 50
+        assert stats["secure_length"] == stats["sifted_bits"] - 50 - qkd.amplifier.security_bits
+
+    def test_detect_eavesdropping_indices(self):
+        qkd = QuantumKeyDistribution()
+        key = [0, 1] * 50
+        is_secure, error_rate, indices = qkd.detect_eavesdropping(
+            key, key, sample_size=20, return_indices=True
+        )
+        assert is_secure
+        assert len(set(indices)) == 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
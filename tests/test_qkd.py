@@ -1,4 +1,5 @@
 import os
+import random
 import sys
 
 import pytest
@@ -6,6 +7,7 @@ import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.quantum_keygen import QuantumKeyDistribution, SecurityError
+from src.reconciliation import CascadeReconciler
 
 
 class TestQuantumKeyDistribution:
@@ -91,6 +93,16 @@ class TestQuantumKeyDistribution:
         assert is_secure is False
         assert error_rate > 0.11
 
+    @pytest.mark.parametrize("key", [[], [1]])
+    def test_eavesdropping_detection_short_key(self, qkd, key):
+        with pytest.raises(SecurityError, match="too short"):
+            qkd.detect_eavesdropping(key, key)
+
+    @pytest.mark.parametrize("sample_size", [0, -1])
+    def test_invalid_sample_size(self, sample_size):
+        with pytest.raises(ValueError, match="Sample size"):
+            QuantumKeyDistribution(sample_size=sample_size)
+
     def test_full_key_generation(self, qkd):
         shared_key, stats = qkd.generate_shared_key()
         assert len(shared_key) == 128
@@ -110,5 +122,106 @@ class TestQuantumKeyDistribution:
             raise SecurityError("test")
 
 
+class LuckySampleQKD(QuantumKeyDistribution):
+    """Reports an error-free eavesdropping sample whatever the channel does."""
+
+    def detect_eavesdropping(self, alice_key, bob_key, sample_size=50, return_indices=False):
+        _, _, indices = super().detect_eavesdropping(alice_key, bob_key, sample_size, True)
+        return (True, 0.0, indices) if return_indices else (True, 0.0)
+
+
+class TestAdaptiveKeyGeneration:
+    def test_adaptive_reaches_target_length(self):
+        qkd = QuantumKeyDistribution(key_length=256, adaptive=True)
+        shared_key, stats = qkd.generate_shared_key()
+        assert len(shared_key) == 256
+        assert stats["final_key_length"] == 256
+        assert stats["secure_length"] >= 256
+
+    def test_adaptive_uses_fewer_qubits(self):
+        fixed = QuantumKeyDistribution(key_length=256).generate_shared_key()[1]
+        adaptive = QuantumKeyDistribution(key_length=256, adaptive=True).generate_shared_key()[1]
+        assert adaptive["initial_bits"] < fixed["initial_bits"]
+
+    def test_round_breakdown(self):
+        qkd = QuantumKeyDistribution(
+            key_length=128,
+            channel_error_rate=0.02,
+            reconciler=CascadeReconciler(passes=10),
+            adaptive=True,
+        )
+        shared_key, stats = qkd.generate_shared_key()
+        assert len(shared_key) == 128
+        rounds = stats["rounds"]
+        assert sum(r["qubits"] for r in rounds) == stats["initial_bits"]
+        assert sum(r["sifted_bits"] for r in rounds) == stats["sifted_bits"]
+        assert rounds[-1]["secure_length"] >= 128
+        assert all(0 < r["sifting_efficiency"] < 1 for r in rounds)
+
+    def test_round_limit(self):
+        # The first round is sized for an error-free channel, so 5% noise needs more rounds
+        qkd = QuantumKeyDistribution(
+            key_length=512,
+            channel_error_rate=0.05,
+            reconciler=CascadeReconciler(passes=10),
+            sample_size=20,
+            rng=random.Random(0),
+            adaptive=True,
+            max_rounds=1,
+        )
+        with pytest.raises(SecurityError, match="after 1 rounds"):
+            qkd.generate_shared_key()
+
+    def test_error_estimate_tracks_corrections(self):
+        # A sample that happens to show no errors must not set the secure length
+        qkd = LuckySampleQKD(
+            key_length=256,
+            channel_error_rate=0.03,
+            reconciler=CascadeReconciler(passes=10),
+            rng=random.Random(1),
+            adaptive=True,
+        )
+        shared_key, stats = qkd.generate_shared_key()
+        observed = [r["observed_error_rate"] for r in stats["rounds"] if "observed_error_rate" in r]
+        assert len(shared_key) == 256
+        assert stats["error_rate"] == max(observed) > 0
+
+    def test_rising_errors_abort(self):
+        qkd = LuckySampleQKD(
+            key_length=256,
+            channel_error_rate=0.13,
+            reconciler=CascadeReconciler(passes=10),
+            rng=random.Random(0),
+            adaptive=True,
+        )
+        with pytest.raises(SecurityError, match="Eavesdropping"):
+            qkd.generate_shared_key()
+
+    def test_fixed_mode_error_estimate_tracks_corrections(self):
+        qkd = LuckySampleQKD(
+            channel_error_rate=0.05,
+            reconciler=CascadeReconciler(passes=10),
+            rng=random.Random(2),
+        )
+        shared_key, stats = qkd.generate_shared_key()
+        corrected = stats["corrected_bits"] / (stats["sifted_bits"] - stats["sample_bits"])
+        assert stats["error_rate"] == stats["rounds"][0]["observed_error_rate"] == corrected > 0
+        assert len(shared_key) == stats["secure_length"] < 256
+
+    def test_fixed_mode_rising_errors_abort(self):
+        qkd = LuckySampleQKD(
+            channel_error_rate=0.13,
+            reconciler=CascadeReconciler(passes=10),
+            rng=random.Random(0),
+        )
+        with pytest.raises(SecurityError, match="Eavesdropping"):
+            qkd.generate_shared_key()
+
+    def test_fixed_mode_reports_single_round(self):
+        _, stats = QuantumKeyDistribution(key_length=64).generate_shared_key()
+        assert len(stats["rounds"]) == 1
+        assert stats["rounds"][0]["qubits"] == stats["initial_bits"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
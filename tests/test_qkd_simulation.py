@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.qkd_simulation import BB84Simulator
+
+
+class TestBB84Simulator:
+    def test_invalid_noise_model(self):
+        with pytest.raises(ValueError):
+            BB84Simulator(noise_model="amplitude_damping")
+
+    def test_invalid_probability(self):
+        with pytest.raises(ValueError):
+            BB84Simulator(eve_prob=1.5)
+
+    def test_perfect_channel(self):
+        result = BB84Simulator(n_qubits=512).run(200, seed=1)
+        assert result["runs"] == 200
+        assert result["sifted_length"].shape == (200,)
+        assert np.all(result["error_rate"] == 0)
+        assert result["abort_probability"] == 0.0
+        assert abs(result["mean_sifted_length"] - 256) < 10
+
+    def test_bit_flip_noise(self):
+        result = BB84Simulator(n_qubits=2000, noise_prob=0.05).run(200, seed=2)
+        assert abs(result["mean_error_rate"] - 0.05) < 0.01
+
+    def test_depolarizing_noise(self):
+        sim = BB84Simulator(n_qubits=2000, noise_model="depolarizing", noise_prob=0.1)
+        result = sim.run(200, seed=3)
+        assert abs(result["mean_error_rate"] - 0.05) < 0.01
+
+    def test_photon_loss(self):
+        result = BB84Simulator(n_qubits=2000, loss_prob=0.5).run(100, seed=4)
+        assert abs(result["mean_sifted_length"] - 500) < 20
+
+    def test_intercept_resend_aborts(self):
+        result = BB84Simulator(n_qubits=1024, eve_prob=1.0).run(200, seed=5)
+        assert abs(result["mean_error_rate"] - 0.25) < 0.02
+        assert result["abort_probability"] > 0.95
+
+    def test_insufficient_key(self):
+        result = BB84Simulator(n_qubits=256, key_length=200).run(50, seed=6)
+        assert result["insufficient_probability"] == 1.0
+
+    def test_reproducible_seed(self):
+        sim = BB84Simulator(n_qubits=256, noise_prob=0.05)
+        first = sim.run(300, seed=7, chunk_size=100)
+        second = sim.run(300, seed=7, chunk_size=100)
+        assert np.array_equal(first["errors"], second["errors"])
+
+    def test_process_pool_matches_serial(self):
+        sim = BB84Simulator(n_qubits=256, noise_prob=0.05)
+        serial = sim.run(300, seed=8, chunk_size=100)
+        pooled = sim.run(300, seed=8, chunk_size=100, workers=2)
+        assert np.array_equal(serial["errors"], pooled["errors"])
+
+    def test_sweep(self):
+        sim = BB84Simulator(n_qubits=1024)
+        summaries = sim.sweep("eve_prob", [0.0, 1.0], runs=100, seed=9)
+        assert [s["eve_prob"] for s in summaries] == [0.0, 1.0]
+        assert summaries[0]["abort_probability"] < summaries[1]["abort_probability"]
+        assert sim.eve_prob == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
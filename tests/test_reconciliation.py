@@ -0,0 +1,99 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.packed_key import PackedKey
+from src.quantum_keygen import QuantumKeyDistribution, SecurityError
+from src.reconciliation import CascadeReconciler, binary_entropy
+
+
+def noisy_pair(n, error_rate, seed):
+    rng = np.random.default_rng(seed)
+    alice = rng.integers(0, 2, n, dtype=np.uint8)
+    bob = alice ^ (rng.random(n) < error_rate).astype(np.uint8)
+    return PackedKey.from_bits(alice), PackedKey.from_bits(bob)
+
+
+class TestCascadeReconciler:
+    def test_binary_entropy(self):
+        assert binary_entropy(0.0) == 0.0
+        assert binary_entropy(0.5) == pytest.approx(1.0)
+        assert binary_entropy(0.11) == pytest.approx(0.4999, abs=1e-3)
+
+    def test_block_size(self):
+        reconciler = CascadeReconciler()
+        assert reconciler.block_size(0.01, 10000) == 73
+        assert reconciler.block_size(0.0, 10000) == 73
+        assert reconciler.block_size(0.01, 50) == 50
+        assert CascadeReconciler(initial_block_size=16).block_size(0.05, 1000) == 16
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            CascadeReconciler().reconcile(
+                PackedKey.from_bits([0]), PackedKey.from_bits([0, 1]), 0.0
+            )
+
+    @pytest.mark.parametrize("error_rate", [0.01, 0.03, 0.08])
+    def test_cascade_corrects_errors(self, error_rate):
+        alice, bob = noisy_pair(4000, error_rate, seed=1)
+        corrected, stats = CascadeReconciler().reconcile(alice, bob, error_rate, seed=2)
+        assert corrected == alice
+        assert stats["corrected_bits"] == alice.hamming_distance(bob)
+        assert stats["leaked_bits"] > 4000 * binary_entropy(error_rate)
+        assert stats["leaked_bits"] < 2 * 4000 * binary_entropy(error_rate)
+
+    def test_rounds_logarithmic(self):
+        alice, bob = noisy_pair(20000, 0.03, seed=3)
+        _, stats = CascadeReconciler().reconcile(alice, bob, 0.03, seed=4)
+        assert stats["rounds"] < 200
+
+    def test_identical_keys(self):
+        alice, _ = noisy_pair(1000, 0.0, seed=5)
+        corrected, stats = CascadeReconciler().reconcile(alice, alice, 0.0)
+        assert corrected == alice
+        assert stats["corrected_bits"] == 0
+        assert stats["rounds"] == 4
+
+    def test_later_passes_keep_multiple_blocks(self):
+        alice, _ = noisy_pair(256, 0.03, seed=10)
+        _, stats = CascadeReconciler(passes=6).reconcile(alice, alice, 0.03)
+        # Blocks stop growing at half the key, so each pass reveals at least two parities
+        assert stats["leaked_bits"] >= 6 * 2
+
+    def test_ldpc_syndrome_decoding(self):
+        alice, bob = noisy_pair(5000, 0.03, seed=6)
+        corrected, stats = CascadeReconciler(use_ldpc=True).reconcile(alice, bob, 0.03, seed=7)
+        assert corrected == alice
+        assert stats["ldpc_converged"]
+        assert stats["ldpc_syndrome_bits"] > 0
+
+    def test_ldpc_failure_falls_back_to_cascade(self):
+        alice, bob = noisy_pair(2000, 0.05, seed=8)
+        reconciler = CascadeReconciler(use_ldpc=True, ldpc_redundancy=0.5)
+        corrected, stats = reconciler.reconcile(alice, bob, 0.05, seed=9)
+        assert not stats["ldpc_converged"]
+        assert corrected == alice
+
+
+class TestReconciledQKD:
+    def test_noisy_channel_without_reconciliation(self):
+        qkd = QuantumKeyDistribution(key_length=256, channel_error_rate=0.05)
+        with pytest.raises(SecurityError):
+            qkd.generate_shared_key()
+
+    def test_noisy_channel_with_reconciliation(self):
+        qkd = QuantumKeyDistribution(
+            key_length=128, channel_error_rate=0.02, reconciler=CascadeReconciler(passes=10)
+        )
+        key, stats = qkd.generate_shared_key()
+        assert len(key) == stats["final_key_length"] <= 128
+        assert stats["leaked_bits"] > 0
+        assert stats["reconciliation_rounds"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.scaling import ScalingSweep, fit_exponent, main, plot, write_csv, write_json
+
+SMALL_GRID = {
+    ("lattice.keygen", "n"): [32, 64, 128],
+    ("lattice.encrypt_bytes", "payload"): [4, 8, 16],
+}
+
+
+@pytest.fixture(scope="module")
+def results():
+    sweep = ScalingSweep(iterations=1, warmup=0, memory=True, base_params={"n": 16})
+    return sweep.run(SMALL_GRID)
+
+
+class TestFitExponent:
+    def test_quadratic(self):
+        values = [10, 20, 40, 80]
+        fit = fit_exponent(values, [3 * v**2 for v in values])
+        assert fit["exponent"] == pytest.approx(2.0)
+        assert fit["coefficient"] == pytest.approx(3.0)
+        assert fit["r_squared"] == pytest.approx(1.0)
+
+    def test_needs_distinct_values(self):
+        with pytest.raises(ValueError):
+            fit_exponent([8, 8], [1.0, 2.0])
+
+
+class TestScalingSweep:
+    def test_rows_and_fits(self, results):
+        assert [(r["case"], r["parameter"]) for r in results] == list(SMALL_GRID)
+        keygen = results[0]
+        assert [row["value"] for row in keygen["rows"]] == [32, 64, 128]
+        assert all(row["median_time_ms"] > 0 for row in keygen["rows"])
+        # The public matrix A is n x n
+        assert keygen["memory_fit"]["exponent"] > 1.2
+        assert "exponent" in results[1]["time_fit"]
+
+    def test_unknown_case(self):
+        with pytest.raises(ValueError):
+            ScalingSweep().sweep("lattice.nope", "n", [16, 32])
+
+    def test_unknown_parameter(self):
+        with pytest.raises(ValueError):
+            ScalingSweep().sweep("lattice.keygen", "depth", [16, 32])
+
+    def test_write_csv_and_json(self, results, tmp_path):
+        csv_path = tmp_path / "sweep.csv"
+        json_path = tmp_path / "sweep.json"
+        write_csv(results, str(csv_path))
+        write_json(results, str(json_path))
+
+        with open(csv_path) as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 6
+        assert "peak_bytes" in rows[0]
+        assert json.loads(json_path.read_text())[0]["time_fit"]["exponent"] == pytest.approx(
+            results[0]["time_fit"]["exponent"]
+        )
+
+    def test_plot(self, results, tmp_path):
+        try:
+            import matplotlib  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError):
+                plot(results, str(tmp_path))
+        else:
+            paths = plot(results, str(tmp_path))
+            assert len(paths) == 2
+            assert all(os.path.exists(path) for path in paths)
+
+    def test_main(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr("src.utils.scaling.DEFAULT_GRID", SMALL_GRID)
+        assert main(["--iterations", "1", "--warmup", "0", "--json", str(tmp_path / "r.json")]) == 0
+        assert "lattice.keygen" in capsys.readouterr().out
+        assert (tmp_path / "r.json").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,273 @@
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.entropy import DeterministicEntropy
+from src.hash_signatures import HashBasedSignature
+from src.lattice_crypto import LatticeEncryption
+from src.service import CryptoService, ServiceOverloaded, decode_signature, encode_signature
+
+
+@pytest.fixture(scope="module")
+def lattice_setup():
+    lattice = LatticeEncryption(n=32, entropy=DeterministicEntropy(1))
+    return lattice, lattice.generate_keypair()
+
+
+@pytest.fixture
+def make_service(lattice_setup):
+    lattice, keys = lattice_setup
+
+    def factory(**kwargs):
+        return CryptoService(lattice=lattice, lattice_keys=keys, **kwargs)
+
+    return factory
+
+
+async def _request(reader, writer, request):
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+class TestInProcess:
+    def test_encrypt_decrypt_batched(self, make_service):
+        async def scenario():
+            async with make_service(max_batch_size=16) as service:
+                messages = [os.urandom(i % 5 + 1) for i in range(40)]
+                ciphertexts = await asyncio.gather(
+                    *(service.submit("encrypt", m) for m in messages)
+                )
+                plaintexts = await asyncio.gather(
+                    *(service.submit("decrypt", c) for c in ciphertexts)
+                )
+                return messages, ciphertexts, plaintexts, service.stats()
+
+        messages, ciphertexts, plaintexts, stats = asyncio.run(scenario())
+        assert plaintexts == messages
+        assert [len(c) for c in ciphertexts] == [8 * len(m) for m in messages]
+        assert stats["requests"] == 80
+        assert 80 / 16 <= stats["batches"] < 80
+        assert stats["mean_batch_size"] > 1
+
+    def test_sign_verify(self, make_service):
+        async def scenario():
+            async with make_service() as service:
+                signatures = await asyncio.gather(
+                    *(service.submit("sign", b"msg %d" % i) for i in range(4))
+                )
+                valid = await service.submit("verify", (b"msg 2", signatures[2]))
+                forged = await service.submit("verify", (b"msg 3", signatures[2]))
+                return valid, forged
+
+        assert asyncio.run(scenario()) == (True, False)
+
+    def test_bad_request_fails_alone(self, make_service, lattice_setup):
+        lattice, (public_key, _) = lattice_setup
+
+        async def scenario():
+            async with make_service(max_batch_delay=0.05) as service:
+                good = lattice.encrypt_bytes(b"ok", public_key)
+                return await asyncio.gather(
+                    service.submit("decrypt", good),
+                    service.submit("decrypt", good[:5]),
+                    return_exceptions=True,
+                )
+
+        good, bad = asyncio.run(scenario())
+        assert good == b"ok"
+        assert isinstance(bad, ValueError)
+
+    def test_malformed_requests_do_not_fail_batch(self, make_service, lattice_setup):
+        lattice, (public_key, _) = lattice_setup
+        good = lattice.encrypt_bytes(b"ok", public_key)
+        short_u = [(u[:-1], v) for u, v in good]
+
+        async def scenario():
+            async with make_service(max_batch_delay=0.05) as service:
+                signature = await service.submit("sign", b"signed")
+                broken = dict(signature)
+                del broken["message_hash"]
+                return await asyncio.gather(
+                    service.submit("decrypt", good),
+                    service.submit("decrypt", short_u),
+                    service.submit("decrypt", [(u, "7") for u, _ in good]),
+                    service.submit("encrypt", b"hello"),
+                    service.submit("encrypt", "not bytes"),
+                    service.submit("encrypt", b"world"),
+                    service.submit("sign", 42),
+                    service.submit("sign", b"fine"),
+                    service.submit("verify", (b"signed", broken)),
+                    service.submit("verify", (b"signed", signature)),
+                    return_exceptions=True,
+                )
+
+        results = asyncio.run(scenario())
+        decrypted, short, bad_v, hello, not_bytes, world, bad_sign, signed, broken, valid = results
+        assert decrypted == b"ok"
+        assert isinstance(short, ValueError)
+        assert isinstance(bad_v, TypeError)
+        assert lattice.decrypt_bytes(hello, lattice_setup[1][1]) == b"hello"
+        assert isinstance(not_bytes, TypeError)
+        assert lattice.decrypt_bytes(world, lattice_setup[1][1]) == b"world"
+        assert isinstance(bad_sign, TypeError)
+        assert isinstance(signed, dict)
+        assert isinstance(broken, KeyError)
+        assert valid is True
+
+    def test_failed_batch_retried_per_request(self, make_service):
+        async def scenario():
+            async with make_service(max_batch_delay=0.05) as service:
+                original = service._encrypt_batch
+
+                def fragile(payloads):
+                    # Stands in for an error only detectable inside the batched call
+                    if any(payload == b"poison" for payload in payloads):
+                        raise RuntimeError("batch failed")
+                    return original(payloads)
+
+                service._encrypt_batch = fragile
+                return await asyncio.gather(
+                    service.submit("encrypt", b"a"),
+                    service.submit("encrypt", b"poison"),
+                    service.submit("encrypt", b"b"),
+                    return_exceptions=True,
+                )
+
+        first, poisoned, second = asyncio.run(scenario())
+        assert len(first) == 8 and len(second) == 8
+        assert isinstance(poisoned, RuntimeError)
+
+    def test_invalid_usage(self, make_service):
+        async def scenario():
+            service = make_service()
+            with pytest.raises(RuntimeError):
+                await service.submit("encrypt", b"x")
+            async with service:
+                with pytest.raises(ValueError):
+                    await service.submit("compress", b"x")
+
+        asyncio.run(scenario())
+
+    def test_backpressure(self, make_service):
+        release = threading.Event()
+
+        async def scenario():
+            service = make_service(max_queue=1, max_batch_size=1)
+            run_batch = service._run_batch
+
+            def blocking_batch(op, payloads):
+                release.wait(5)
+                return run_batch(op, payloads)
+
+            service._run_batch = blocking_batch
+            async with service:
+                first = asyncio.create_task(service.submit("encrypt", b"a"))
+                await asyncio.sleep(0.05)  # picked up by the batcher, now blocked
+                second = asyncio.create_task(service.submit("encrypt", b"b"))
+                await asyncio.sleep(0.01)  # fills the queue
+                with pytest.raises(ServiceOverloaded):
+                    await service.submit("encrypt", b"c", wait=False)
+                release.set()
+                results = await asyncio.gather(first, second)
+                return results, service.stats()
+
+        results, stats = asyncio.run(scenario())
+        assert [len(r) for r in results] == [8, 8]
+        assert stats["rejected"] == 1
+        # Rejected requests are never queued, so they do not dilute the batch size
+        assert stats["requests"] == stats["batches"] == 2
+        assert stats["mean_batch_size"] == 1.0
+
+    def test_stop_fails_queued(self, make_service):
+        release = threading.Event()
+
+        async def scenario():
+            service = make_service(max_batch_size=1)
+            run_batch = service._run_batch
+            service._run_batch = lambda op, payloads: (release.wait(5), run_batch(op, payloads))[1]
+            await service.start()
+            tasks = [asyncio.create_task(service.submit("sign", b"m")) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            await service.stop()
+            release.set()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestSocketProtocol:
+    def test_signature_encoding(self):
+        signer = HashBasedSignature(entropy=DeterministicEntropy(2))
+        _, private_key = signer.generate_keypair()
+        signature = signer.sign(b"m", private_key)
+        assert decode_signature(json.loads(json.dumps(encode_signature(signature)))) == signature
+
+    def test_tcp_roundtrip(self, make_service):
+        async def scenario():
+            service = make_service()
+            server = await service.serve()
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+
+            data = base64.b64encode(b"hello").decode()
+            encrypted = await _request(reader, writer, {"id": 1, "op": "encrypt", "data": data})
+            decrypted = await _request(
+                reader,
+                writer,
+                {"id": 2, "op": "decrypt", "ciphertexts": encrypted["ciphertexts"]},
+            )
+            signed = await _request(reader, writer, {"id": 3, "op": "sign", "data": data})
+            verified = await _request(
+                reader,
+                writer,
+                {"id": 4, "op": "verify", "data": data, "signature": signed["signature"]},
+            )
+            unknown = await _request(reader, writer, {"id": 5, "op": "compress"})
+            writer.write(b"not json\n")
+            await writer.drain()
+            malformed = json.loads(await reader.readline())
+
+            writer.close()
+            await service.stop()
+            return encrypted, decrypted, verified, unknown, malformed
+
+        encrypted, decrypted, verified, unknown, malformed = asyncio.run(scenario())
+        assert encrypted["id"] == 1 and len(encrypted["ciphertexts"]) == 40
+        assert base64.b64decode(decrypted["data"]) == b"hello"
+        assert verified == {"id": 4, "valid": True}
+        assert unknown["id"] == 5 and "Unknown operation" in unknown["error"]
+        assert malformed["id"] is None and "JSONDecodeError" in malformed["error"]
+
+    def test_unix_socket_pipelined(self, make_service, tmp_path):
+        path = str(tmp_path / "crypto.sock")
+
+        async def scenario():
+            service = make_service(max_batch_delay=0.01)
+            await service.serve(path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            for i in range(10):
+                request = {"id": i, "op": "encrypt", "data": base64.b64encode(b"x").decode()}
+                writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(10)]
+            writer.close()
+            stats = service.stats()
+            await service.stop()
+            return responses, stats
+
+        responses, stats = asyncio.run(scenario())
+        assert sorted(r["id"] for r in responses) == list(range(10))
+        assert stats["batches"] < 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
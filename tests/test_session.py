@@ -0,0 +1,194 @@
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.entropy import DeterministicEntropy
+from src.lattice_crypto import LatticeEncryption
+from src.quantum_keygen import QuantumKeyDistribution, SecurityError
+from src.session import SecureSession, SessionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_session(**kwargs):
+    kwargs.setdefault("lattice", LatticeEncryption(n=32, entropy=DeterministicEntropy(1)))
+    kwargs.setdefault("qkd", QuantumKeyDistribution(key_length=64, rng=random.Random(7)))
+    return SecureSession("bob", **kwargs)
+
+
+class TestSecureSession:
+    def test_roundtrip_reuses_keys(self):
+        session = make_session()
+        assert not session.established
+        for i in range(5):
+            message = f"message {i}".encode()
+            assert session.receive(session.send(message)) == message
+        stats = session.stats()
+        assert stats["rekeys"] == 1
+        assert stats["messages_sent"] == stats["messages_received"] == 5
+        assert stats["epoch"] == 1
+
+    def test_rekey_by_message_count(self):
+        session = make_session(max_messages=3, sign_messages=False)
+        epochs = [session.send(b"x")["epoch"] for _ in range(7)]
+        assert epochs == [1, 1, 1, 2, 2, 2, 3]
+        assert session.stats()["rekeys"] == 3
+
+    def test_rekey_by_bytes(self):
+        session = make_session(max_bytes=10, sign_messages=False)
+        epochs = [session.send(b"12345")["epoch"] for _ in range(3)]
+        assert epochs == [1, 1, 2]
+
+    def test_rekey_by_age(self):
+        clock = FakeClock()
+        session = make_session(max_age=60, clock=clock, sign_messages=False)
+        session.send(b"a")
+        clock.now = 59
+        assert not session.needs_rekey()
+        clock.now = 60
+        assert session.needs_rekey()
+        assert session.send(b"b")["epoch"] == 2
+
+    def test_replay_rejected(self):
+        session = make_session(sign_messages=False)
+        first = session.send(b"one")
+        second = session.send(b"two")
+        assert session.receive(first) == b"one"
+        assert session.receive(second) == b"two"
+        with pytest.raises(SecurityError, match="Replayed"):
+            session.receive(first)
+
+    def test_tampering_rejected(self):
+        session = make_session()
+        envelope = session.send(b"pay 10")
+        u, v = envelope["ciphertexts"][0]
+        envelope["ciphertexts"][0] = (u, (v + 1) % 4093)
+        with pytest.raises(SecurityError, match="authentication"):
+            session.receive(envelope)
+
+    def test_forged_signature_rejected(self):
+        session = make_session()
+        genuine = session.send(b"genuine")
+        other = session.send(b"other")
+        other["signature"] = genuine["signature"]
+        with pytest.raises(SecurityError, match="Signature"):
+            session.receive(other)
+
+    @pytest.mark.parametrize("signature", [None, "forged", {}, {"message_hash": b""}])
+    def test_stripped_signature_rejected(self, signature):
+        session = make_session()
+        envelope = session.send(b"genuine")
+        envelope["signature"] = signature
+        with pytest.raises(SecurityError, match="Signature"):
+            session.receive(envelope)
+
+    def test_stale_epoch_rejected(self):
+        session = make_session(max_messages=1, sign_messages=False)
+        old = session.send(b"a")
+        session.send(b"b")
+        with pytest.raises(SecurityError, match="epoch"):
+            session.receive(old)
+
+    def test_close_drops_keys(self):
+        session = make_session(sign_messages=False)
+        envelope = session.send(b"a")
+        session.close()
+        assert not session.established
+        with pytest.raises(SecurityError):
+            session.receive(envelope)
+
+    def test_stats_during_close(self):
+        session = make_session(sign_messages=False)
+        errors = []
+        stop = threading.Event()
+
+        def read_stats():
+            while not stop.is_set():
+                try:
+                    session.stats()
+                except Exception as exc:
+                    errors.append(exc)
+                    return
+
+        reader = threading.Thread(target=read_stats)
+        reader.start()
+        for _ in range(20):
+            session.send(b"x")
+            session.close()
+        stop.set()
+        reader.join()
+        assert errors == []
+
+
+class TestSessionCache:
+    def test_lru_eviction(self):
+        lattice = LatticeEncryption(n=16, entropy=DeterministicEntropy(2))
+        cache = SessionCache(max_sessions=2, lattice=lattice, sign_messages=False)
+        alice = cache.get("alice")
+        alice.send(b"hi")
+        cache.get("bob")
+        assert cache.get("alice") is alice
+        cache.get("carol")  # evicts bob
+
+        assert "bob" not in cache and "alice" in cache
+        assert len(cache) == 2
+        assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 1, "sessions": 2}
+
+    def test_eviction_closes_session(self):
+        cache = SessionCache(max_sessions=1, sign_messages=False)
+        first = cache.get("alice")
+        first.send(b"x")
+        cache.get("bob")
+        assert not first.established
+
+    def test_eviction_does_not_hold_cache_lock(self):
+        cache = SessionCache(max_sessions=2, sign_messages=False)
+        busy = cache.get("alice")
+        cache.get("bob")
+
+        # alice is mid-operation, so closing her blocks until the lock is released
+        busy._lock.acquire()
+        evictor = threading.Thread(target=cache.get, args=("carol",))
+        evictor.start()
+        try:
+            deadline = time.monotonic() + 5
+            while "alice" in cache and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert "alice" not in cache and evictor.is_alive()
+
+            lookup = threading.Thread(target=cache.get, args=("bob",))
+            lookup.start()
+            lookup.join(timeout=5)
+            assert not lookup.is_alive()
+        finally:
+            busy._lock.release()
+            evictor.join()
+        assert not busy.established
+        assert "alice" not in cache
+
+    def test_remove(self):
+        cache = SessionCache()
+        session = cache.get("alice")
+        cache.remove("alice")
+        assert "alice" not in cache
+        assert cache.get("alice") is not session
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            SessionCache(max_sessions=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.quantum_keygen import QuantumKeyDistribution
+from src.session_runner import MultiSessionRunner
+
+
+class TestSeededQKD:
+    def test_seeded_sessions_reproducible(self):
+        first, _ = QuantumKeyDistribution(key_length=64, rng=random.Random(5)).generate_shared_key()
+        second, _ = QuantumKeyDistribution(
+            key_length=64, rng=random.Random(5)
+        ).generate_shared_key()
+        assert first == second
+
+    def test_global_random_untouched(self):
+        state = random.getstate()
+        QuantumKeyDistribution(key_length=64).generate_shared_key()
+        assert random.getstate() == state
+
+
+class TestMultiSessionRunner:
+    def test_session_seeds_distinct_and_stable(self):
+        runner = MultiSessionRunner(master_seed=42)
+        seeds = [runner.session_seed(i) for i in range(50)]
+        assert len(set(seeds)) == 50
+        assert seeds == [MultiSessionRunner(master_seed=42).session_seed(i) for i in range(50)]
+
+    def test_random_master_seed_recorded(self):
+        runner = MultiSessionRunner()
+        assert MultiSessionRunner(master_seed=runner.master_seed).session_seed(3) == (
+            runner.session_seed(3)
+        )
+
+    def test_in_process_run(self):
+        runner = MultiSessionRunner(master_seed=1, workers=1, key_length=64)
+        results = list(runner.run(5))
+        assert [r["session_id"] for r in results] == list(range(5))
+        assert all(len(r["key"]) == 64 for r in results)
+        summary = runner.summary()
+        assert summary["sessions"] == 5
+        assert summary["succeeded"] == 5
+        assert summary["key_bits"] == 320
+
+    def test_process_pool_streams_results(self):
+        runner = MultiSessionRunner(master_seed=2, workers=2, key_length=64)
+        results = runner.run(6)
+        first = next(results)
+        assert runner.summary()["sessions"] == 1
+        rest = list(results)
+        assert sorted(r["session_id"] for r in [first] + rest) == list(range(6))
+
+    def test_pool_matches_replay(self):
+        runner = MultiSessionRunner(master_seed=3, workers=2, key_length=64)
+        results = {r["session_id"]: r for r in runner.run([4, 9])}
+        for session_id, result in results.items():
+            assert runner.replay(session_id)["key"] == result["key"]
+
+    def test_failed_sessions_reported(self):
+        runner = MultiSessionRunner(master_seed=4, workers=1, key_length=64, channel_error_rate=0.5)
+        results = list(runner.run(3))
+        assert all(r["key"] is None and r["error"] for r in results)
+        assert runner.summary()["failed"] == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])